@@ -1,18 +1,323 @@
 import argparse
+import sys
 
-from csvclean.cli import base_process
+from csvclean.cli import (
+    base_process,
+    fanout_process,
+    follow_process,
+    profile_process,
+    sample_process,
+    verify_process,
+    watch_process,
+)
+from csvclean.models import (
+    BranchOptions,
+    FollowOptions,
+    MemoryOptions,
+    ParallelOptions,
+    PartitionOptions,
+    ProcessOptions,
+    ProgressOptions,
+    QueryOptions,
+    S3Options,
+    SinkOptions,
+    SortOptions,
+)
 
 
-def main():
+def _add_cache_arguments(parser: argparse.ArgumentParser):
+    """Arguments of the caches of the compiled configs and of the reference indexes."""
+    parser.add_argument(
+        "--no-config-cache", action="store_true", help="Parse the config without the cache"
+    )
+    parser.add_argument("--config-cache-dir", help="Directory of the compiled config cache")
+    parser.add_argument(
+        "--reference-index-dir", help="Directory of the indexes of the reference lists"
+    )
+
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="CSV Cleaner")
 
-    parser.add_argument("--input", required=True, help="Csv path")
-    parser.add_argument("--output", required=True, help="Output path of clean csv")
+    parser.add_argument("--input", help="Input path (.csv, .txt/.dat/.fwf fixed-width, .jsonl)")
+    parser.add_argument(
+        "--output", help="Output path of clean data (.csv, .parquet, .arrow or .sqlite)"
+    )
+    parser.add_argument(
+        "--profile-data", help="Json path to save a profile of the input columns, without cleaning"
+    )
+    parser.add_argument(
+        "--sample", type=int, help="Estimate the error rates validating this many random rows"
+    )
+    parser.add_argument("--seed", type=int, help="Seed of the random sample")
+    parser.add_argument(
+        "--query", help="SQL query whose rows are cleaned, with a SQLite database as --input"
+    )
+    parser.add_argument(
+        "--fetch-size", type=int, default=10000, help="Rows fetched at once from the query"
+    )
+    parser.add_argument(
+        "--branch",
+        action="append",
+        nargs="+",
+        metavar="PATH",
+        help="CONFIG OUTPUT [REPORT] of a branch cleaned in the same pass over the input, "
+        "can be repeated; --profile-data is then written in the same pass",
+    )
     parser.add_argument("--report", action="store_true", help="Show report")
+    parser.add_argument("--config", default="tests/fixtures/config.txt", help="Config path")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows written per batch")
+    parser.add_argument(
+        "--row-group-size", type=int, default=65536, help="Rows per Parquet row group"
+    )
+    parser.add_argument(
+        "--compression", default="zstd", help="Codec of Parquet/Arrow outputs ('none' to disable)"
+    )
+    parser.add_argument("--no-dictionary", action="store_true", help="Disable dictionary encoding")
+    parser.add_argument("--manifest", help="Json path for the integrity manifest of the run")
+    parser.add_argument(
+        "--manifest-chunk", type=int, default=100000, help="Rows per chunk of the manifest"
+    )
+    parser.add_argument(
+        "--verify", help="Manifest to check the output against (--output overrides its path)"
+    )
+    parser.add_argument("--quarantine", help="Csv path for the rejected rows and their errors")
+    parser.add_argument("--sort-by", help="Comma separated key columns to sort the output")
+    parser.add_argument("--dedupe", action="store_true", help="Drop rows with repeated sort key")
+    parser.add_argument(
+        "--sort-memory", type=int, default=256, help="Memory budget of the sort in MB"
+    )
+    parser.add_argument("--temp-dir", help="Directory of the temporary sort runs")
+    parser.add_argument(
+        "--partition-by", help="Column that splits the output, then a directory of csv files"
+    )
+    parser.add_argument(
+        "--max-file-mb", type=int, help="Roll the partitioned output files over after this size"
+    )
+    parser.add_argument(
+        "--max-open-files", type=int, default=64, help="Files of the partitions open at once"
+    )
+    _add_cache_arguments(parser)
+    parser.add_argument("--encoding", help="Encoding of the input csv, detected if not given")
+    parser.add_argument("--output-encoding", default="utf-8", help="Encoding of the csv output")
+    parser.add_argument(
+        "--s3-part-mb",
+        type=int,
+        default=8,
+        help="MiB per range request or upload part of s3://, at least 5",
+    )
+    parser.add_argument(
+        "--s3-concurrency", type=int, default=8, help="Requests in flight per s3:// transfer"
+    )
+    parser.add_argument("--s3-endpoint", help="Endpoint of an S3-compatible store, like MinIO")
+    parser.add_argument("--table", default="clean_data", help="Table of the SQLite output")
+    parser.add_argument(
+        "--index-columns", help="Comma separated columns indexed after the SQLite load"
+    )
+    parser.add_argument(
+        "--passthrough",
+        action="store_true",
+        help="Keep the bytes of ascii compatible inputs, without transcoding them",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Clean the rows in this many workers (0 for one per cpu)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["auto", "thread", "process"],
+        default="auto",
+        help="Workers of --workers: threads on free-threaded builds and processes otherwise",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        help="Memory budget of the run in MB, batches and sort runs shrink to stay under it",
+    )
+    parser.add_argument("--progress", action="store_true", help="Write the progress to stderr")
+    parser.add_argument(
+        "--progress-every", type=int, default=10000, help="Rows between two progress samples"
+    )
+    parser.add_argument(
+        "--progress-interval", type=float, default=2.0, help="Seconds between progress updates"
+    )
+    parser.add_argument("--metrics-file", help="Prometheus text file updated with the progress")
+    parser.add_argument(
+        "--follow", action="store_true", help="Keep cleaning the rows appended to the --input"
+    )
+    parser.add_argument(
+        "--watch", help="Directory whose new files are cleaned into the --output directory"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=1.0, help="Seconds between two polls of the input"
+    )
+    parser.add_argument(
+        "--idle-timeout", type=float, help="Stop after this many seconds without new data"
+    )
+    parser.add_argument(
+        "--follow-state", help="Json path of the position, so a restart resumes where it stopped"
+    )
+    parser.add_argument("--watch-pattern", default="*.csv", help="Glob of the watched file names")
+    parser.add_argument(
+        "--watch-workers", type=int, default=1, help="Files of --watch cleaned at the same time"
+    )
+
+    return parser
+
+
+def _parse_branches(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> list[BranchOptions]:
+    """Branches of a fan-out run, from the --branch arguments."""
+    branches: list[BranchOptions] = []
+
+    for paths in args.branch or []:
+        if len(paths) not in (2, 3):
+            parser.error("--branch needs CONFIG OUTPUT and an optional REPORT")
+
+        branches.append(
+            BranchOptions(
+                config_path=paths[0],
+                output_path=paths[1],
+                report_path=paths[2] if len(paths) == 3 else None,
+            )
+        )
+
+    return branches
+
+
+def _check_arguments(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, branches: list[BranchOptions]
+):
+    """Reject the combinations of arguments that can't be run."""
+    if args.watch and not args.output:
+        parser.error("--watch needs --output as the directory of the clean files")
+
+    if args.follow and not args.output:
+        parser.error("--follow needs --output as the csv of the clean rows")
 
+    if args.follow and (args.sample or args.profile_data or branches):
+        parser.error("--follow can't be used with --sample, --profile-data or --branch")
+
+    if not args.input and not args.watch:
+        parser.error("--input is required")
+
+    if not args.output and not args.profile_data and not args.sample and not branches:
+        parser.error("one of --output, --profile-data or --sample is required")
+
+    if args.query and args.sample:
+        parser.error("--sample can't be used with --query")
+
+    # A fan-out run writes the outputs of its branches and has no progress reporting
+    branch_conflicts: list[str] = [
+        flag
+        for flag, value in [
+            ("--output", args.output),
+            ("--quarantine", args.quarantine),
+            ("--manifest", args.manifest),
+            ("--progress", args.progress),
+            ("--metrics-file", args.metrics_file),
+        ]
+        if value
+    ]
+    if branches and branch_conflicts:
+        parser.error(f"{', '.join(branch_conflicts)} can't be used with --branch")
+
+
+def _run(args: argparse.Namespace, branches: list[BranchOptions], options: ProcessOptions):
+    """Run the process chosen by the arguments."""
+    if args.watch:
+        watch_process(args.watch, args.output, options)
+    elif args.follow:
+        follow_process(args.input, args.output, args.report, options)
+    elif branches:
+        fanout_process(args.input, branches, args.profile_data, options)
+    elif args.sample:
+        estimate = sample_process(args.input, args.sample, options, args.seed)
+        sys.stdout.write(estimate.format() + "\n")
+    elif args.profile_data:
+        profile_process(args.input, args.profile_data, options)
+    else:
+        base_process(args.input, args.output, args.report, options)
+
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
 
-    base_process(args.input, args.output, args.report)
+    if args.verify:
+        problems = verify_process(args.verify, args.output)
+        sys.stdout.write("\n".join(problems or ["The output matches the manifest."]) + "\n")
+        sys.exit(1 if problems else 0)
+
+    branches: list[BranchOptions] = _parse_branches(parser, args)
+    _check_arguments(parser, args, branches)
+
+    s3 = S3Options(
+        part_size=args.s3_part_mb * 1024 * 1024,
+        concurrency=args.s3_concurrency,
+        endpoint_url=args.s3_endpoint,
+    )
+    options = ProcessOptions(
+        config_path=args.config,
+        config_cache=not args.no_config_cache,
+        config_cache_dir=args.config_cache_dir,
+        reference_index_dir=args.reference_index_dir,
+        input_encoding=args.encoding,
+        passthrough=args.passthrough,
+        quarantine_path=args.quarantine,
+        manifest_path=args.manifest,
+        manifest_chunk_size=args.manifest_chunk,
+        s3=s3,
+        sink=SinkOptions(
+            s3=s3,
+            batch_size=args.batch_size,
+            row_group_size=args.row_group_size,
+            compression=None if args.compression == "none" else args.compression,
+            use_dictionary=not args.no_dictionary,
+            encoding=args.output_encoding,
+            table=args.table,
+            index_columns=args.index_columns.split(",") if args.index_columns else [],
+        ),
+        progress=ProgressOptions(
+            sample_every=args.progress_every,
+            interval=args.progress_interval,
+            stderr=args.progress,
+            prometheus_path=args.metrics_file,
+        )
+        if args.progress or args.metrics_file
+        else None,
+        memory=MemoryOptions(limit=args.memory_limit * 1024 * 1024) if args.memory_limit else None,
+        query=QueryOptions(sql=args.query, fetch_size=args.fetch_size) if args.query else None,
+        parallel=ParallelOptions(
+            backend=args.backend, workers=args.workers, batch_size=args.batch_size
+        )
+        if args.workers is not None
+        else None,
+        sort=SortOptions(
+            keys=args.sort_by.split(","),
+            dedupe=args.dedupe,
+            memory_budget=args.sort_memory * 1024 * 1024,
+            temp_dir=args.temp_dir,
+        )
+        if args.sort_by
+        else None,
+        partition=PartitionOptions(
+            column=args.partition_by,
+            max_file_bytes=args.max_file_mb * 1024 * 1024 if args.max_file_mb else None,
+            max_open_files=args.max_open_files,
+        )
+        if args.partition_by or args.max_file_mb
+        else None,
+        follow=FollowOptions(
+            poll_interval=args.poll_interval,
+            idle_timeout=args.idle_timeout,
+            state_path=args.follow_state,
+            pattern=args.watch_pattern,
+            workers=args.watch_workers,
+        ),
+    )
+
+    _run(args, branches, options)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,23 @@
+from .config_cache import CompiledConfiguration, ConfigCache
 from .csv_io_layout import CSVIOlayer
+from .external_sort import ExternalSortSink
+from .partitioned import PartitionedSink
+from .quarantine import QuarantineSink
+from .readers import QueryReader
+from .sinks import ArrowIPCSink, BaseSink, CSVSink, ParquetSink, SQLiteSink, build_sink
 
 __all__ = [
+    "ArrowIPCSink",
+    "BaseSink",
     "CSVIOlayer",
+    "CSVSink",
+    "CompiledConfiguration",
+    "ConfigCache",
+    "ExternalSortSink",
+    "ParquetSink",
+    "PartitionedSink",
+    "QuarantineSink",
+    "QueryReader",
+    "SQLiteSink",
+    "build_sink",
 ]
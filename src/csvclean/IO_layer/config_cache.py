@@ -0,0 +1,178 @@
+import hashlib
+import os
+import pickle
+import sys
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from ..models.config import Configuration
+from ..validators.rule_validator import ColumnCheck, compile_rules
+from .csv_io_layout import CSVIOlayer
+
+# Changing the layout of the cached objects must change this number.
+CACHE_FORMAT = 5
+
+
+def _tool_version() -> str:
+    try:
+        return version("csvclean")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def default_cache_dir() -> Path:
+    """
+    Local cache directory of csvclean, following XDG_CACHE_HOME when it is defined.
+
+    :return: Path of the cache directory
+    :rtype: Path
+    """
+    cache_home: str = os.environ.get("XDG_CACHE_HOME", "") or str(Path.home() / ".cache")
+    return Path(cache_home) / "csvclean" / "configs"
+
+
+class CompiledConfiguration:
+    """
+    Configuration together with the tables compiled from it at startup.
+
+    :attribute config: Parsed configuration
+    :type config: Configuration
+    :attribute compiled_rules: Check function of each column with rules
+    :type compiled_rules: list[tuple[int, ColumnCheck]]
+    :attribute reference_index_dir: Directory of the indexes of the references, the user
+        cache if None. It belongs to the run, not to the cached entry.
+    :type reference_index_dir: str | None
+    """
+
+    def __init__(
+        self,
+        config: Configuration,
+        compiled_rules: list[tuple[int, ColumnCheck]],
+        reference_index_dir: str | None = None,
+    ):
+        self.config = config
+        self.compiled_rules = compiled_rules
+        self.reference_index_dir = reference_index_dir
+
+
+class ConfigCache:
+    """
+    Persistent cache of compiled configurations, keyed by the hash of the config text,
+    the tool version and the Python version. The least recently used entries are
+    evicted when the cache exceeds its size. The entries are pickles, so the cache
+    directory must only be writable by the user.
+
+    :attribute cache_dir: Directory of the cache entries
+    :type cache_dir: Path
+    :attribute max_entries: Maximum number of entries
+    :type max_entries: int
+    :attribute max_bytes: Maximum total size of the entries
+    :type max_bytes: int
+    """
+
+    def __init__(
+        self, cache_dir: str | None = None, max_entries: int = 32, max_bytes: int = 64 * 1024**2
+    ):
+        self.cache_dir: Path = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def key(self, config_content: bytes) -> str:
+        """
+        Hash of the config content and of everything that changes its compilation.
+
+        :param config_content: Bytes of the config file
+        :type config_content: bytes
+        :return: Hex digest used as entry name
+        :rtype: str
+        """
+        digest = hashlib.sha256(config_content)
+        digest.update(f"\0{_tool_version()}\0{CACHE_FORMAT}\0{sys.version_info[:2]}".encode())
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pickle"
+
+    def get(self, key: str) -> CompiledConfiguration | None:
+        """
+        Load an entry, marking it as recently used. An entry that can't be loaded, e.g.
+        truncated or pickled by an incompatible version, is deleted, so the config is
+        parsed again instead of failing the run.
+
+        :param key: Key of the entry
+        :type key: str
+        :return: Cached compiled configuration or None if there is no valid entry
+        :rtype: CompiledConfiguration | None
+        """
+        entry_path = self._entry_path(key)
+
+        try:
+            with entry_path.open("rb") as entry_file:
+                compiled = pickle.load(entry_file)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+        except Exception:  # A broken entry of any kind is only a cache miss
+            compiled = None
+
+        if not isinstance(compiled, CompiledConfiguration):
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        return compiled
+
+    def put(self, key: str, compiled: CompiledConfiguration):
+        """
+        Save an entry atomically and evict the least recently used ones.
+
+        :param key: Key of the entry
+        :type key: str
+        :param compiled: Compiled configuration
+        :type compiled: CompiledConfiguration
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(key)
+        temporal_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+
+        with temporal_path.open("wb") as entry_file:
+            pickle.dump(compiled, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        temporal_path.replace(entry_path)
+        self._evict()
+
+    def _evict(self):
+        """Delete the least recently used entries until the cache fits its limits."""
+        entries = sorted(
+            ((path.stat(), path) for path in self.cache_dir.glob("*.pickle")),
+            key=lambda entry: entry[0].st_mtime_ns,
+        )
+        total_bytes: int = sum(stat.st_size for stat, _ in entries)
+
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            stat, path = entries.pop(0)
+            path.unlink(missing_ok=True)
+            total_bytes -= stat.st_size
+
+    def load(self, io_layer: CSVIOlayer, config_path: str) -> CompiledConfiguration:
+        """
+        Return the compiled configuration of a config file, parsing and compiling
+        it only when it is not in the cache.
+
+        :param io_layer: IO layer that parses the config
+        :type io_layer: CSVIOlayer
+        :param config_path: Path of the config file
+        :type config_path: str
+        :return: Compiled configuration
+        :rtype: CompiledConfiguration
+        """
+        key: str = self.key(Path(config_path).read_bytes())
+        cached: CompiledConfiguration | None = self.get(key)
+
+        if cached is not None:
+            return cached
+
+        config: Configuration = io_layer.parse_config(config_path)
+        compiled = CompiledConfiguration(config, compile_rules(config))
+        self.put(key, compiled)
+
+        return compiled
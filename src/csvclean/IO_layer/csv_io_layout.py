@@ -1,27 +1,68 @@
 import csv
-from collections.abc import Generator, Iterable
+import random
+import re
+import time
+from collections.abc import Generator, Iterable, Sequence
 from pathlib import Path
+from typing import Any
 from xmlrpc.client import boolean
 
-from ..models.config import Configuration
+from ..models.config import Configuration, FieldSpec, OutlierSpec, ReferenceSpec, RuleSpec
 from ..models.data_register import TYPE_MAP
+from ..models.options import FollowOptions, S3Options
+from ..validators.dates import compile_date_format
+from .encoding import TrackedLines, detect_encoding, is_ascii_compatible
+from .follow import FollowedLines
+from .object_store import is_s3_url, open_text
+from .readers import QueryReader, build_reader, is_csv_input
+from .sampling import FULL_SCAN_BYTES, reservoir_sample, seek_sample
+from .sinks import SINK_FORMATS, SQLiteSink
 
+RULE_PATTERN = re.compile(r"^\s*(\d+)\s*:\s*(\w+)\s*(?:\((.*)\))?\s*$")
+REFERENCE_PATTERN = re.compile(r"^\s*(\d+)\s*:\s*(.+?)(?:@(\w+))?\s*$")
+LAYOUT_PATTERN = re.compile(r"^\s*(.+?)\s*:\s*(\d+)\s*$")
+DATE_FORMAT_PATTERN = re.compile(r"^\s*(\d+)\s*:\s*(.+?)\s*$")
 
-class CSVIOlayer:
-    """Class to read inputs from CSV and file text and write the clean CSV."""
 
-    def __init__(self, output_path: str):
+class CSVIOlayer:
+    """
+    Class to read inputs from CSV and file text and write the clean CSV.
+
+    :attribute position: Line number and byte offset where the last read record starts
+    :type position: tuple[int, int]
+    :attribute bytes_read: Bytes of the input consumed by the reader
+    :type bytes_read: int
+    :attribute s3: Options of the reads of the s3:// inputs
+    :type s3: S3Options | None
+    """
+
+    def __init__(self, output_path: str | None, s3: S3Options | None = None):
         """
-        Check the output file is valid and prepare it for writing.
-
-        :param output_path: Path to check if is valid
-        :type output_path: str
+        Check the output file is valid and prepare it for writing. The s3:// outputs
+        are only created when their sink is closed, and the SQLite databases are kept,
+        since their sink only replaces its own table.
+
+        :param output_path: Path to check if is valid, None to only read
+        :type output_path: str | None
+        :param s3: Options of the reads of the s3:// inputs, the default ones if None
+        :type s3: S3Options | None
         """
-        path: Path = Path(output_path)
-        if output_path.lower().endswith(".csv"):
-            path.open("w", encoding="utf-8").close()
-        else:
-            raise ValueError("The output path is incorrect.")
+        if output_path is not None:
+            path: Path = Path(output_path)
+            if path.suffix.lower() not in SINK_FORMATS:
+                raise ValueError("The output path is incorrect.")
+            sink_class: type = SINK_FORMATS[path.suffix.lower()]
+            if not is_s3_url(output_path) and sink_class is not SQLiteSink:
+                path.open("w", encoding="utf-8").close()
+
+        self.s3 = s3
+        self.position: tuple[int, int] = (0, 0)
+        self._lines: TrackedLines | None = None
+
+    @property
+    def bytes_read(self) -> int:
+        """Bytes of the input consumed by the reader."""
+        return self._lines.offset if self._lines is not None else 0
 
     def _validate_input_path(self, csv_path: str) -> bool:
         """
@@ -36,17 +77,29 @@ class CSVIOlayer:
 
         return not path.exists() or Path(csv_path).suffix.lower() == ".csv"
 
-    def _detect_delimiter(self, csv_path: str) -> tuple[str, boolean]:
+    def detect_encoding(self, csv_path: str) -> str:
+        """
+        Detect the encoding of the csv file from its bom or from a sample.
+
+        :param csv_path: Path of csv file
+        :type csv_path: str
+        :return: Name of the codec
+        :rtype: str
+        """
+        return detect_encoding(csv_path, s3=self.s3)
+
+    def _detect_delimiter(self, csv_path: str, encoding: str = "utf-8") -> tuple[str, boolean]:
         """
         Detect the delimeter of csv file and check if is valid.
 
         :param csv_path: Path of csv file
         :type csv_path: str
+        :param encoding: Encoding of csv file
+        :type encoding: str
         :return: tuple that contains the delimeter and check if is a valid delimeter
         :rtype: tuple[str, bool]
         """
-        path: Path = Path(csv_path)
-        with path.open() as f:
+        with open_text(csv_path, "r", encoding, self.s3) as f:
             line = f.readline()
             sniffer = csv.Sniffer()
             dialect = sniffer.sniff(line)
@@ -104,6 +157,173 @@ class CSVIOlayer:
 
         return validators
 
+    def _parse_sections(self, lines: Iterable[str]) -> dict[str, str]:
+        """
+        Parse the optional lines of the config, written as "name:{values}".
+
+        :param lines: Remaining lines of the config file
+        :type lines: Iterable[str]
+        :return: Text inside the braces of each section by name
+        :rtype: dict[str, str]
+        """
+        sections: dict[str, str] = {}
+
+        for line in lines:
+            name, _, values = line.strip().partition(":")
+            values = values.strip()
+
+            if values.startswith("{") and values.endswith("}"):
+                sections[name.strip()] = values[1:-1]
+
+        return sections
+
+    def _parse_rules(self, rules_text: str) -> list[RuleSpec]:
+        """
+        Parse the rules section, e.g. "2:range(0,120); 3:enum(Madrid|Bilbao); 0:unique".
+
+        :param rules_text: Text of the rules section
+        :type rules_text: str
+        :return: List of declared rules
+        :rtype: list[RuleSpec]
+        """
+        rules: list[RuleSpec] = []
+
+        for rule_text in rules_text.split(";"):
+            if not rule_text.strip():
+                continue
+
+            match = RULE_PATTERN.match(rule_text)
+            if match is None:
+                raise ValueError(f"Not soported rule: {rule_text.strip()}")
+
+            column, name, args = match.groups()
+            rules.append(
+                RuleSpec(column=int(column), name=name, args=args.split(",") if args else [])
+            )
+
+        return rules
+
+    def _parse_outliers(self, outliers_text: str) -> list[OutlierSpec]:
+        """
+        Parse the outliers section, e.g. "2:zscore(3); 3:mad(3.5,500); 4:iqr".
+
+        :param outliers_text: Text of the outliers section
+        :type outliers_text: str
+        :return: List of declared outlier detectors
+        :rtype: list[OutlierSpec]
+        """
+        outliers: list[OutlierSpec] = []
+
+        for outlier_text in outliers_text.split(";"):
+            if not outlier_text.strip():
+                continue
+
+            match = RULE_PATTERN.match(outlier_text)
+            if match is None:
+                raise ValueError(f"Not soported outlier detector: {outlier_text.strip()}")
+
+            column, method, args = match.groups()
+            values: list[str] = [arg.strip() for arg in args.split(",")] if args else []
+            spec: dict[str, Any] = {"column": int(column), "method": method}
+
+            if values and values[0]:
+                spec["threshold"] = float(values[0])
+            if len(values) > 1:
+                spec["window"] = int(values[1])
+
+            outliers.append(OutlierSpec(**spec))
+
+        return outliers
+
+    def _parse_references(self, references_text: str) -> list[ReferenceSpec]:
+        """
+        Parse the references section, e.g. "3:refs/countries.csv; 5:refs/sku.csv@code".
+
+        :param references_text: Text of the references section
+        :type references_text: str
+        :return: List of declared references
+        :rtype: list[ReferenceSpec]
+        """
+        references: list[ReferenceSpec] = []
+
+        for reference_text in references_text.split(";"):
+            if not reference_text.strip():
+                continue
+
+            match = REFERENCE_PATTERN.match(reference_text)
+            if match is None:
+                raise ValueError(f"Not soported reference: {reference_text.strip()}")
+
+            column, path, reference_column = match.groups()
+            references.append(
+                ReferenceSpec(
+                    column=int(column), path=path, reference_column=reference_column or "0"
+                )
+            )
+
+        return references
+
+    def _parse_layout(self, layout_text: str) -> list[FieldSpec]:
+        """
+        Parse the layout section of fixed-width inputs, e.g. "id:5; name:20; city:15".
+
+        :param layout_text: Text of the layout section
+        :type layout_text: str
+        :return: Columns in the order of the lines
+        :rtype: list[FieldSpec]
+        """
+        layout: list[FieldSpec] = []
+
+        for field_text in layout_text.split(";"):
+            if not field_text.strip():
+                continue
+
+            match = LAYOUT_PATTERN.match(field_text)
+            if match is None:
+                raise ValueError(f"Not soported layout field: {field_text.strip()}")
+
+            name, width = match.groups()
+            layout.append(FieldSpec(name=name, width=int(width)))
+
+        return layout
+
+    def _parse_dates(self, dates_text: str) -> dict[int, str]:
+        """
+        Parse the formats of the date and datetime columns, e.g. "2:%d/%m/%Y; 4:%Y%m%d".
+
+        :param dates_text: Text of the dates section
+        :type dates_text: str
+        :return: Format by column number
+        :rtype: dict[int, str]
+        :raises ValueError: If a format is not supported
+        """
+        date_formats: dict[int, str] = {}
+
+        for format_text in dates_text.split(";"):
+            if not format_text.strip():
+                continue
+
+            match = DATE_FORMAT_PATTERN.match(format_text)
+            if match is None:
+                raise ValueError(f"Not soported date format: {format_text.strip()}")
+
+            column, pattern = match.groups()
+            compile_date_format(pattern)
+            date_formats[int(column)] = pattern
+
+        return date_formats
+
+    def _parse_columns(self, columns_text: str) -> list[str]:
+        """
+        Parse the columns section with the expected header, e.g. "id; name; city".
+
+        :param columns_text: Text of the columns section
+        :type columns_text: str
+        :return: Names of the columns, in the order of the config
+        :rtype: list[str]
+        """
+        return [name.strip() for name in columns_text.split(";") if name.strip()]
+
     def parse_config(self, config_path: str) -> Configuration:
         """
         Parse the configuration file text and create the dataclass Configuration.
@@ -115,46 +335,253 @@ class CSVIOlayer:
         """
         path: Path = Path(config_path)
 
-        with path.open() as config_file:
+        with path.open(encoding="utf-8") as config_file:
             header_line: str = config_file.readline().strip()
             header_types: list[type] = self._parse_headers(header_line)
             validators_line: str = config_file.readline().strip()
             validators: list[str] = self._parse_validators(validators_line)
+            sections: dict[str, str] = self._parse_sections(config_file)
 
         return Configuration(
             header_types=header_types,
+            columns=self._parse_columns(sections.get("columns", "")),
             trate_nullerror="Null Errors" in validators,
             trate_typeerror="Type Errors" in validators,
+            trate_outliererror="Outlier Errors" in validators,
+            rules=self._parse_rules(sections.get("rules", "")),
+            references=self._parse_references(sections.get("references", "")),
+            outliers=self._parse_outliers(sections.get("outliers", "")),
+            layout=self._parse_layout(sections.get("layout", "")),
+            date_formats=self._parse_dates(sections.get("dates", "")),
+            normalize_dates="Normalize Dates" in validators,
         )
 
-    def read_csv(self, csv_path: str) -> Generator:
+    def read_csv(self, csv_path: str, encoding: str | None = None) -> Generator:
         """
-        Read the csv file line by line.
+        Read the csv file line by line, decoding it incrementally.
 
         :param csv_path: Path to the CSV file
         :type csv_path: str
+        :param encoding: Encoding of the CSV file, detected if None
+        :type encoding: str | None
         :return: if CSV file exist return a Generator
         :rtype: Generator
         """
-        path: Path = Path(csv_path)
-
         if not self._validate_input_path(csv_path):
             raise FileNotFoundError(f"The {csv_path} doesn't exists or isn't a csv file.")
 
-        delimiter, correct_delimiter = self._detect_delimiter(csv_path)
+        encoding = encoding or self.detect_encoding(csv_path)
+        delimiter, correct_delimiter = self._detect_delimiter(csv_path, encoding)
+
+        if not correct_delimiter:
+            raise ValueError("Delimiter is incorrect.")
+
+        self._lines = TrackedLines(csv_path, encoding, self.s3)
+        reader = csv.reader(self._lines, delimiter=delimiter)
+        records: Generator = self._tracked_records(reader)
+
+        header: list[str] = next(records)
+        yield ("__header__", header)
+
+        yield from (("__row__", fila) for fila in records)
+
+    def read_input(
+        self, input_path: str, encoding: str | None = None, layout: list[FieldSpec] | None = None
+    ) -> Generator:
+        """
+        Read a csv, fixed-width (.txt, .dat, .fwf) or json lines (.jsonl, .ndjson) input,
+        chosen by its extension, with the protocol of read_csv.
+
+        :param input_path: Path to the input
+        :type input_path: str
+        :param encoding: Encoding of the input, detected if None
+        :type encoding: str | None
+        :param layout: Columns of the fixed-width inputs, from the config
+        :type layout: list[FieldSpec] | None
+        :return: Generator with the header and the rows
+        :rtype: Generator
+        """
+        reader = build_reader(input_path, layout)
+
+        if reader is None:
+            yield from self.read_csv(input_path, encoding)
+            return
+
+        encoding = encoding or self.detect_encoding(input_path)
+
+        for record in reader.read(input_path, encoding, self.s3):
+            self._lines = reader.lines
+            self.position = reader.position
+            yield record
+
+    def read_query(
+        self,
+        connection: Any,
+        query: str,
+        fetch_size: int = 10000,
+        parameters: Sequence[Any] = (),
+    ) -> Generator:
+        """
+        Read the result of a query over a DB-API connection, with the protocol of read_csv.
+        The position of the records is their row number, with 0 as byte offset.
+
+        :param connection: Open DB-API connection
+        :type connection: Any
+        :param query: Query that returns the rows to clean
+        :type query: str
+        :param fetch_size: Rows fetched from the cursor at once
+        :type fetch_size: int
+        :param parameters: Parameters of the query
+        :type parameters: Sequence[Any]
+        :return: Generator with the header and the rows
+        :rtype: Generator
+        """
+        reader = QueryReader(fetch_size)
+        self._lines = None
+
+        for record in reader.read(connection, query, parameters):
+            self.position = reader.position
+            yield record
+
+    def _tracked_records(
+        self, reader: Any, first_line: int = 1
+    ) -> Generator[list[str], None, None]:
+        """
+        Read the records, saving in position where each one starts.
+
+        :param reader: csv reader over the tracked lines
+        :type reader: csv reader
+        :param first_line: Line number of the first line of the reader
+        :type first_line: int
+        :return: Generator of the records
+        :rtype: Generator
+        """
+        lines: TrackedLines | None = self._lines
+
+        while True:
+            start: tuple[int, int] = (
+                first_line + reader.line_num,
+                lines.offset if lines else 0,
+            )
+            row: list[str] | None = next(reader, None)
+
+            if row is None:
+                return
+
+            self.position = start
+            yield row
+
+    def follow_csv(
+        self,
+        csv_path: str,
+        follow: FollowOptions,
+        encoding: str | None = None,
+        start: tuple[int, int] | None = None,
+    ) -> Generator:
+        """
+        Read a csv that keeps growing, with the protocol of read_csv. The file is kept
+        open and polled every poll_interval seconds for complete records appended to it.
+        After each poll that found rows, an ("__idle__", []) record is returned, with
+        position at the start of the next record, so the rows can be flushed and the
+        position saved. It ends after idle_timeout seconds without new records.
+
+        :param csv_path: Path to the CSV file, local and with an ascii compatible encoding
+        :type csv_path: str
+        :param follow: Options of the polling
+        :type follow: FollowOptions
+        :param encoding: Encoding of the CSV file, detected if None
+        :type encoding: str | None
+        :param start: Line and byte offset where the rows start, after the header if None
+        :type start: tuple[int, int] | None
+        :return: Generator with the header, the rows and the idle records
+        :rtype: Generator
+        """
+        if not self._validate_input_path(csv_path) or is_s3_url(csv_path):
+            raise FileNotFoundError(f"The {csv_path} doesn't exists or isn't a local csv file.")
+
+        encoding = encoding or self.detect_encoding(csv_path)
+        delimiter, correct_delimiter = self._detect_delimiter(csv_path, encoding)
 
         if not correct_delimiter:
             raise ValueError("Delimiter is incorrect.")
 
-        with path.open() as csv_file:
-            reader: Iterable = csv.reader(csv_file, delimiter=delimiter)
+        lines = FollowedLines(csv_path, encoding)
+        self._lines = lines
+
+        try:
+            reader = csv.reader(lines, delimiter=delimiter)
+            yield ("__header__", next(reader))
+
+            next_line, lines.offset = start or (reader.line_num + 1, lines.offset)
+            idle_since: float = time.monotonic()
+
+            while (
+                follow.idle_timeout is None or time.monotonic() - idle_since < follow.idle_timeout
+            ):
+                reader = csv.reader(lines, delimiter=delimiter)
+                yield from (("__row__", fila) for fila in self._tracked_records(reader, next_line))
+
+                if not reader.line_num:
+                    time.sleep(follow.poll_interval)
+                    continue
+
+                next_line += reader.line_num
+                self.position = (next_line, lines.offset)
+                idle_since = time.monotonic()
+                yield ("__idle__", [])
+        finally:
+            lines.close()
+
+    def sample_csv(
+        self,
+        csv_path: str,
+        size: int,
+        encoding: str | None = None,
+        seed: int | None = None,
+        layout: list[FieldSpec] | None = None,
+    ) -> Generator:
+        """
+        Read the header and a uniform random sample of the rows of the input, a csv,
+        fixed-width or json lines file as in read_input. Big ascii compatible csv files
+        are sampled seeking to random byte offsets, the rest are read whole with
+        reservoir sampling.
 
-            header: list[str] = next(reader)
-            yield ("__header__", header)
+        :param csv_path: Path to the input
+        :type csv_path: str
+        :param size: Number of rows of the sample
+        :type size: int
+        :param encoding: Encoding of the input, detected if None
+        :type encoding: str | None
+        :param seed: Seed of the random generator, a random one if None
+        :type seed: int | None
+        :param layout: Columns of the fixed-width inputs, from the config
+        :type layout: list[FieldSpec] | None
+        :return: Generator with the header and the sampled rows, like read_csv
+        :rtype: Generator
+        """
+        encoding = encoding or self.detect_encoding(csv_path)
+        records: Generator = self.read_input(csv_path, encoding, layout)
+        rng = random.Random(seed)
+
+        yield next(records)
+
+        if (
+            is_csv_input(csv_path)
+            and is_ascii_compatible(encoding)
+            and not is_s3_url(csv_path)
+            and Path(csv_path).stat().st_size > FULL_SCAN_BYTES
+        ):
+            delimiter, _ = self._detect_delimiter(csv_path, encoding)
+            rows = seek_sample(
+                csv_path, encoding, delimiter, size, rng=rng, data_start=self.bytes_read
+            )
+            records.close()
+        else:
+            rows = reservoir_sample((row for _, row in records), size, rng)
 
-            yield from (("__row__", fila) for fila in reader)
+        yield from (("__row__", fila) for fila in rows)
 
-    def write(self, outputpath: str, csv_row_clean: list[str]):
+    def write(self, outputpath: str, csv_row_clean: list[str], encoding: str = "utf-8"):
         """
         Write the clean csv Data Frame into outputpath.
 
@@ -162,9 +589,11 @@ class CSVIOlayer:
         :type outputpath: str
         :param csv_row_clean: List with the row of clean csv
         :type csv_row_clean: list[str]
+        :param encoding: Encoding of clean csv
+        :type encoding: str
         """
         path: Path = Path(outputpath)
 
-        with path.open(mode="a", newline="", encoding="utf-8") as file:
+        with path.open(mode="a", newline="", encoding=encoding) as file:
             writer = csv.writer(file, delimiter=";")
             writer.writerow(csv_row_clean)
@@ -0,0 +1,164 @@
+import codecs
+from collections.abc import Iterator
+from typing import IO
+
+from ..models.options import S3Options
+from .object_store import open_binary, open_text
+
+SAMPLE_SIZE = 64 * 1024
+
+# The utf-32 boms go first because the utf-32-le one starts with the utf-16-le one.
+BOMS: list[tuple[bytes, str]] = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# Encodings where the ascii characters (digits, delimiters, quotes and new lines)
+# are the same single bytes, so the rows can be handled byte by byte.
+ASCII_COMPATIBLE = {"ascii", "utf-8", "utf-8-sig", "latin-1", "iso8859-1", "cp1252", "iso8859-15"}
+
+# Byte transparent codec: every byte is one character and encodes back to the same byte.
+PASSTHROUGH_ENCODING = "latin-1"
+
+
+def _sniff_utf16_without_bom(sample: bytes) -> str | None:
+    """
+    Detect utf-16 text without bom by the zero bytes of the ascii characters.
+
+    :param sample: First bytes of the file
+    :type sample: bytes
+    :return: utf-16 codec or None if the sample doesn't look like utf-16
+    :rtype: str | None
+    """
+    pairs: int = len(sample) // 2
+    if pairs == 0:
+        return None
+
+    even_zeros: int = sample[0 : pairs * 2 : 2].count(0)
+    odd_zeros: int = sample[1 : pairs * 2 : 2].count(0)
+
+    if odd_zeros > pairs * 0.3 and even_zeros < pairs * 0.05:
+        return "utf-16-le"
+    if even_zeros > pairs * 0.3 and odd_zeros < pairs * 0.05:
+        return "utf-16-be"
+    return None
+
+
+def _is_utf8(sample: bytes) -> bool:
+    """
+    Check the sample is valid utf-8. The incremental decoder accepts a character
+    cut at the end of the sample.
+
+    :param sample: First bytes of the file
+    :type sample: bytes
+    :return: True if the sample is utf-8
+    :rtype: bool
+    """
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _single_byte_encoding(sample: bytes) -> str:
+    """
+    Choose cp1252 for the samples it can decode and latin-1, that decodes any byte, otherwise.
+
+    :param sample: First bytes of the file
+    :type sample: bytes
+    :return: Name of the codec
+    :rtype: str
+    """
+    try:
+        sample.decode("cp1252")
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "cp1252"
+
+
+def detect_encoding(path: str, sample_size: int = SAMPLE_SIZE, s3: S3Options | None = None) -> str:
+    """
+    Detect the encoding of a text file from its bom or from a bounded sample.
+
+    :param path: Path of the file or s3:// url of the object
+    :type path: str
+    :param sample_size: Maximum number of bytes read to guess the encoding
+    :type sample_size: int
+    :param s3: Options of the reads of the s3:// objects
+    :type s3: S3Options | None
+    :return: Name of the codec
+    :rtype: str
+    """
+    with open_binary(path, "rb", s3) as binary_file:
+        sample: bytes = binary_file.read(sample_size)
+
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    utf16_encoding: str | None = _sniff_utf16_without_bom(sample)
+    if utf16_encoding is not None:
+        return utf16_encoding
+
+    if _is_utf8(sample):
+        return "utf-8"
+
+    return _single_byte_encoding(sample)
+
+
+def is_ascii_compatible(encoding: str) -> bool:
+    """
+    Check if the ascii characters are single bytes in the encoding.
+
+    :param encoding: Name of the codec
+    :type encoding: str
+    :return: True if the encoding is ascii compatible
+    :rtype: bool
+    """
+    return codecs.lookup(encoding).name in {codecs.lookup(name).name for name in ASCII_COMPATIBLE}
+
+
+class TrackedLines:
+    """
+    Lines of a text file, decoded incrementally, that keep count of the bytes consumed
+    so the readers can know the byte offset of each record.
+
+    Ascii compatible files are split in bytes and each line is decoded on its own.
+    Other encodings are split after decoding and the offset is counted encoding the
+    lines back with an incremental encoder.
+
+    :attribute offset: Bytes of the file consumed by the returned lines
+    :type offset: int
+    """
+
+    def __init__(self, path: str, encoding: str, s3: S3Options | None = None):
+        self.path = path
+        self.encoding = encoding
+        self.s3 = s3
+        self.offset = 0
+
+    def _ascii_compatible_lines(self, binary_file: IO[bytes]) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+
+        for raw_line in binary_file:
+            self.offset += len(raw_line)
+            yield decoder.decode(raw_line)
+
+    def _decoded_lines(self, text_file: IO[str]) -> Iterator[str]:
+        encoder = codecs.getincrementalencoder(self.encoding)()
+
+        for line in text_file:
+            self.offset += len(encoder.encode(line))
+            yield line
+
+    def __iter__(self) -> Iterator[str]:
+        if is_ascii_compatible(self.encoding):
+            with open_binary(self.path, "rb", self.s3) as binary_file:
+                yield from self._ascii_compatible_lines(binary_file)
+        else:
+            with open_text(self.path, "r", self.encoding, self.s3) as text_file:
+                yield from self._decoded_lines(text_file)
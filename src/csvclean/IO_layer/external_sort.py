@@ -0,0 +1,257 @@
+import csv
+import heapq
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from ..memory import MemoryGovernor, row_bytes
+from ..models.config import Configuration
+from ..models.options import SortOptions
+from ..reporters.cleaning_report import Report
+from .sinks import BaseSink
+
+KeyPart = tuple[int, int | float | str]
+SortKey = tuple[KeyPart, ...]
+
+
+def _int_part(value: str) -> KeyPart:
+    """Integers sort before the values that can not be converted, exact at any size."""
+    try:
+        return (0, int(value))
+    except ValueError:
+        return (1, value)
+
+
+def _float_part(value: str) -> KeyPart:
+    """Numbers sort before the values that can not be converted."""
+    try:
+        return (0, float(value))
+    except ValueError:
+        return (1, value)
+
+
+def _text_part(value: str) -> KeyPart:
+    return (0, value)
+
+
+KEY_PARTS: dict[type, Callable[[str], KeyPart]] = {int: _int_part, float: _float_part}
+
+
+class ExternalSortSink(BaseSink):
+    """
+    Sink that sorts the clean rows by key columns before passing them to another sink.
+
+    The rows are gathered in runs that fit in the memory budget. Each full run is
+    sorted and spilled to a temporary file, and at the end the runs are merged
+    with a heap, optionally dropping the rows with a repeated key.
+
+    :attribute inner: Sink that receives the sorted rows
+    :type inner: BaseSink
+    :attribute sort_options: Options of the sort
+    :type sort_options: SortOptions
+    :attribute reporter: Report where the progress and the dropped duplicates are counted
+    :type reporter: Report | None
+    :attribute governor: Memory governor of the run, that can make the runs smaller
+        than the memory budget of the sort
+    :type governor: MemoryGovernor | None
+    :attribute on_drop: Called with each row dropped by the dedupe, if any
+    :type on_drop: Callable[[list[str]], None] | None
+    """
+
+    def __init__(
+        self,
+        inner: BaseSink,
+        config: Configuration,
+        sort_options: SortOptions,
+        reporter: Report | None = None,
+        governor: MemoryGovernor | None = None,
+    ):
+        super().__init__(inner.output_path, config, inner.options)
+        self.inner = inner
+        self.sort_options = sort_options
+        self.reporter = reporter
+        self.governor = governor
+        self.on_drop: Callable[[list[str]], None] | None = None
+        self._key_columns: list[int] = []
+        self._key_parts: list[Callable[[str], KeyPart]] = []
+        self._run: list[list[str]] = []
+        self._run_bytes = 0
+        self._run_paths: list[Path] = []
+        self._sorted_rows = 0
+        self._temp_dir = tempfile.TemporaryDirectory(
+            prefix="csvclean-sort-", dir=sort_options.temp_dir
+        )
+
+    def _resolve_key_column(self, key: str, header: list[str]) -> int:
+        """
+        Find the index of a key column, given by name or by index.
+
+        :param key: Name or index of the column
+        :type key: str
+        :param header: Names of the columns
+        :type header: list[str]
+        :return: Index of the column
+        :rtype: int
+        :raises ValueError: If the column doesn't exist
+        """
+        if key in header:
+            return header.index(key)
+
+        if key.isdigit() and int(key) < len(header):
+            return int(key)
+
+        raise ValueError(f"Sort key column not found: {key}")
+
+    def _open(self, header: list[str]):
+        self._key_columns = [
+            self._resolve_key_column(key, header) for key in self.sort_options.keys
+        ]
+        types: list[type] = self.config.header_types
+        self._key_parts = [
+            KEY_PARTS.get(types[column], _text_part) if column < len(types) else _text_part
+            for column in self._key_columns
+        ]
+        self.inner.write_header(header)
+
+    def _key(self, row: list[str]) -> SortKey:
+        return tuple(
+            key_part(row[column])
+            for column, key_part in zip(self._key_columns, self._key_parts, strict=True)
+        )
+
+    def _write_batch(self, rows: list[list[str]]):
+        self._run.extend(rows)
+        self._run_bytes += sum(map(row_bytes, rows))
+
+        if self._run_bytes >= self._memory_budget():
+            self._spill_run()
+
+        if self.governor is not None:
+            self.governor.hold("sort", self._run_bytes)
+
+    def _memory_budget(self) -> int:
+        """Bytes a run may take: the budget of the sort, or less if the governor has less room."""
+        if self.governor is None:
+            return self.sort_options.memory_budget
+        return min(self.sort_options.memory_budget, self.governor.room("sort"))
+
+    def _spill_run(self):
+        """Sort the current run and write it into a temporary file."""
+        self._run.sort(key=self._key)
+        run_path = Path(self._temp_dir.name) / f"run-{len(self._run_paths):06d}.csv"
+
+        with run_path.open("w", newline="", encoding="utf-8") as run_file:
+            csv.writer(run_file).writerows(self._run)
+
+        self._run_paths.append(run_path)
+        self._sorted_rows += len(self._run)
+        self._run = []
+        self._run_bytes = 0
+        self._report_progress()
+
+    def _report_progress(self):
+        if self.reporter is not None:
+            self.reporter.record_metric("sort_spilled_runs", len(self._run_paths))
+            self.reporter.record_metric("sort_spilled_rows", self._sorted_rows)
+
+    def _read_run(self, run_path: Path) -> Iterator[list[str]]:
+        with run_path.open(newline="", encoding="utf-8") as run_file:
+            yield from csv.reader(run_file)
+
+    def _merge_group(self, group: list[Path]) -> Path:
+        """
+        Merge several runs into a new one, deleting them.
+
+        :param group: Paths of the runs, in the order they were written
+        :type group: list[Path]
+        :return: Path of the merged run
+        :rtype: Path
+        """
+        merged_path = group[0].with_name(f"merged-{group[0].name}")
+
+        with merged_path.open("w", newline="", encoding="utf-8") as merged_file:
+            merged_runs = heapq.merge(*(self._read_run(path) for path in group), key=self._key)
+            csv.writer(merged_file).writerows(merged_runs)
+
+        for path in group:
+            path.unlink()
+
+        return merged_path
+
+    def _reduce_runs(self):
+        """
+        Merge consecutive groups of runs until they can be merged at the same time.
+        Keeping the runs in order keeps the sort stable, so dedupe keeps the first row.
+        """
+        fan_in = self.sort_options.max_fan_in
+
+        while len(self._run_paths) > fan_in:
+            self._run_paths = [
+                self._merge_group(self._run_paths[start : start + fan_in])
+                for start in range(0, len(self._run_paths), fan_in)
+            ]
+
+    def _sorted_rows_iterator(self) -> Iterable[list[str]]:
+        if not self._run_paths:
+            self._run.sort(key=self._key)
+            return self._run
+
+        if self._run:
+            self._spill_run()
+        self._reduce_runs()
+
+        return heapq.merge(*(self._read_run(path) for path in self._run_paths), key=self._key)
+
+    def _emit(self, rows: Iterable[list[str]]):
+        """
+        Pass the sorted rows to the inner sink, dropping repeated keys if it is asked.
+
+        :param rows: Rows sorted by key
+        :type rows: Iterable[list[str]]
+        """
+        previous_key: SortKey | None = None
+        written_rows = 0
+        duplicate_rows = 0
+
+        for row in rows:
+            if self.sort_options.dedupe:
+                key = self._key(row)
+                if key == previous_key:
+                    duplicate_rows += 1
+                    if self.on_drop is not None:
+                        self.on_drop(row)
+                    continue
+                previous_key = key
+
+            self.inner.write_row(row)
+            written_rows += 1
+
+        if self.reporter is not None:
+            self.reporter.record_metric("sort_written_rows", written_rows)
+
+            if self.sort_options.dedupe:
+                self.reporter.record_metric("sort_duplicate_rows", duplicate_rows)
+
+    def _close(self):
+        try:
+            if self.inner.header:
+                self._emit(self._sorted_rows_iterator())
+            self.inner.close()
+        finally:
+            self._release()
+
+    def abort(self):
+        """Drop the runs without writing them and abort the inner sink."""
+        try:
+            self.inner.abort()
+        finally:
+            self._release()
+
+    def _release(self):
+        self._temp_dir.cleanup()
+
+        if self.governor is not None:
+            self.governor.release("sort")
+
+    def record_metrics(self, reporter: Report):
+        self.inner.record_metrics(reporter)
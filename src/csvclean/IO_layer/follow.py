@@ -0,0 +1,216 @@
+import fnmatch
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .encoding import TrackedLines, is_ascii_compatible
+from .object_store import open_binary
+
+STATE_VERSION = 1
+
+
+def _write_state(state_path: Path, state: dict[str, Any]):
+    """Replace a state file atomically, so a crash never leaves half a file."""
+    temporal_path = state_path.with_name(f".{state_path.name}.{os.getpid()}.tmp")
+    temporal_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    temporal_path.replace(state_path)
+
+
+def _read_state(state_path: Path) -> dict[str, Any]:
+    if not state_path.is_file():
+        return {}
+
+    with state_path.open(encoding="utf-8") as state_file:
+        state: dict[str, Any] = json.load(state_file)
+
+    return state if state.get("version") == STATE_VERSION else {}
+
+
+class FollowedLines(TrackedLines):
+    """
+    Lines of a csv that keeps growing. Each pass over it returns the lines of the
+    complete records appended since the last pass: lines that end in a newline, with
+    the quotes of the record balanced. An incomplete record is left in the file and
+    read again, whole, in a later pass, so a record is never cut by a poll.
+
+    Only ascii compatible encodings are supported, where a newline is one byte.
+    """
+
+    def __init__(self, path: str, encoding: str):
+        """
+        :param path: Path of the csv
+        :type path: str
+        :param encoding: Encoding of the csv
+        :type encoding: str
+        :raises ValueError: If the encoding isn't ascii compatible
+        """
+        if not is_ascii_compatible(encoding):
+            raise ValueError(f"Only ascii compatible inputs can be followed, not {encoding}.")
+
+        super().__init__(path, encoding)
+        self._file = open_binary(path, "rb")
+
+    def __iter__(self) -> Iterator[str]:
+        if os.fstat(self._file.fileno()).st_size < self.offset:
+            raise ValueError(f"The followed file {self.path} was truncated.")
+
+        self._file.seek(self.offset)
+        record: list[bytes] = []
+        quotes: int = 0
+
+        while (raw_line := self._file.readline()).endswith(b"\n"):
+            record.append(raw_line)
+            quotes += raw_line.count(b'"')
+
+            if quotes % 2 == 0:
+                for line in record:
+                    self.offset += len(line)
+                    yield line.decode(self.encoding)
+                record = []
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+
+class FollowState:
+    """
+    Position of a followed csv saved in a json: the line and byte offset where the
+    next record starts, and the device and inode of the file, so a restart goes on
+    where the last run stopped and a new file at the same path is read from the start.
+
+    :attribute state_path: Path of the json, nothing is saved if None
+    :type state_path: str | None
+    :attribute input_path: Path of the followed csv
+    :type input_path: str
+    :attribute identity: Device and inode of the csv when the run started
+    :type identity: list[int]
+    """
+
+    def __init__(self, state_path: str | None, input_path: str):
+        self.state_path = state_path
+        self.input_path = input_path
+        stat: os.stat_result = Path(input_path).stat()
+        self.identity: list[int] = [stat.st_dev, stat.st_ino]
+
+    def load(self) -> tuple[int, int] | None:
+        """
+        Position saved by the last run.
+
+        :return: Line and byte offset of the next record, None if there is no state or
+            it is of another file
+        :rtype: tuple[int, int] | None
+        """
+        if self.state_path is None:
+            return None
+
+        state: dict[str, Any] = _read_state(Path(self.state_path))
+
+        if state.get("identity") != self.identity:
+            return None
+        if state["offset"] > Path(self.input_path).stat().st_size:
+            return None
+
+        return state["line"], state["offset"]
+
+    def save(self, position: tuple[int, int]):
+        """
+        Save the position of the next record.
+
+        :param position: Line and byte offset of the next record
+        :type position: tuple[int, int]
+        """
+        if self.state_path is None:
+            return
+
+        line, offset = position
+        _write_state(
+            Path(self.state_path),
+            {
+                "version": STATE_VERSION,
+                "path": self.input_path,
+                "identity": self.identity,
+                "line": line,
+                "offset": offset,
+            },
+        )
+
+
+class DirectoryWatcher:
+    """
+    Polling of a directory for new files. A file is ready when its size and
+    modification time are the same in two polls, so the files still being written are
+    not picked up. The names of the cleaned files are saved in a json, so a restart
+    doesn't clean them again.
+
+    :attribute directory: Watched directory
+    :type directory: Path
+    :attribute pattern: Glob of the names of the picked up files
+    :type pattern: str
+    :attribute state_path: Path of the json with the cleaned files, none if None
+    :type state_path: str | None
+    """
+
+    def __init__(self, directory: str, pattern: str, state_path: str | None = None):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.state_path = state_path
+        self._done: set[str] = set()
+        self._dispatched: set[str] = set()
+        self._seen: dict[str, tuple[int, int]] = {}
+
+        if not self.directory.is_dir():
+            raise FileNotFoundError(f"The directory {directory} doesn't exists.")
+
+        if state_path is not None:
+            self._done = set(_read_state(Path(state_path)).get("done", []))
+
+    def poll(self) -> list[Path]:
+        """
+        Look for the files that became ready since the last poll.
+
+        :return: Ready files not cleaned nor dispatched before, oldest first
+        :rtype: list[Path]
+        """
+        seen: dict[str, tuple[int, int]] = {}
+        ready: list[tuple[int, Path]] = []
+
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not fnmatch.fnmatch(entry.name, self.pattern) or not entry.is_file():
+                    continue
+                if entry.name in self._done or entry.name in self._dispatched:
+                    continue
+
+                stat: os.stat_result = entry.stat()
+                seen[entry.name] = (stat.st_size, stat.st_mtime_ns)
+
+                if self._seen.get(entry.name) == seen[entry.name]:
+                    ready.append((stat.st_mtime_ns, Path(entry.path)))
+
+        ready.sort()
+        self._dispatched.update(path.name for _, path in ready)
+        self._seen = {name: size for name, size in seen.items() if name not in self._dispatched}
+        return [path for _, path in ready]
+
+    @property
+    def waiting(self) -> bool:
+        """True if some file was seen in the last poll but is still being written."""
+        return bool(self._seen)
+
+    def done(self, path: Path):
+        """
+        Save a file as cleaned.
+
+        :param path: Cleaned file
+        :type path: Path
+        """
+        self._done.add(path.name)
+        self._dispatched.discard(path.name)
+
+        if self.state_path is not None:
+            _write_state(
+                Path(self.state_path), {"version": STATE_VERSION, "done": sorted(self._done)}
+            )
@@ -0,0 +1,325 @@
+import csv
+import hashlib
+import json
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from ..reporters.cleaning_report import Report
+from .sinks import BaseSink
+
+MANIFEST_VERSION = 2
+
+# The hash of a whole stream is the sum of the hashes of its rows modulo 2**128, so the
+# hash of the input is the sum of the hashes of the rejected and of the kept rows, that
+# are interleaved in the input. The hash of a chunk is a rolling hash that chains the
+# hashes of its rows in order, so a chunk of the output with its rows reordered doesn't
+# match.
+HASH_BITS = 128
+HASH_MASK = (1 << HASH_BITS) - 1
+
+
+def row_digest(row: list[str]) -> bytes:
+    """
+    Digest of the text of a row, independent of the delimiter and quoting of the file.
+
+    :param row: Values of the row
+    :type row: list[str]
+    :return: 128 bits digest
+    :rtype: bytes
+    """
+    encoded: bytes = ("\x1f".join(row) + "\x1e").encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(encoded, digest_size=HASH_BITS // 8).digest()
+
+
+def row_hash(row: list[str]) -> int:
+    """
+    Hash of the text of a row, as a number that can be summed.
+
+    :param row: Values of the row
+    :type row: list[str]
+    :return: 128 bits hash
+    :rtype: int
+    """
+    return int.from_bytes(row_digest(row), "big")
+
+
+def _chunk_hasher() -> Any:
+    return hashlib.blake2b(digest_size=HASH_BITS // 8)
+
+
+def hash_rows(rows: Iterable[list[str]]) -> tuple[int, str]:
+    """
+    Number of rows and rolling hash of a chunk of rows.
+
+    :param rows: Rows of the chunk, in order
+    :type rows: Iterable[list[str]]
+    :return: Number of rows and hex rolling hash
+    :rtype: tuple[int, str]
+    """
+    count: int = 0
+    hasher = _chunk_hasher()
+
+    for row in rows:
+        count += 1
+        hasher.update(row_digest(row))
+
+    return count, hasher.hexdigest()
+
+
+class HashStream:
+    """
+    Row count and hash of a stream of rows, as a whole and by chunks of chunk_size rows.
+
+    :attribute chunk_size: Rows per chunk
+    :type chunk_size: int
+    :attribute rows: Rows added
+    :type rows: int
+    :attribute hash: Sum of the hashes of all the rows
+    :type hash: int
+    :attribute chunks: Rows and hex rolling hash of each closed chunk
+    :type chunks: list[tuple[int, str]]
+    """
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.hash = 0
+        self.chunks: list[tuple[int, str]] = []
+        self._chunk_rows = 0
+        self._chunk_hasher = _chunk_hasher()
+
+    def add(self, row: list[str]):
+        """
+        Add a row to the stream.
+
+        :param row: Values of the row
+        :type row: list[str]
+        """
+        digest: bytes = row_digest(row)
+        self.rows += 1
+        self.hash = (self.hash + int.from_bytes(digest, "big")) & HASH_MASK
+        self._chunk_rows += 1
+        self._chunk_hasher.update(digest)
+
+        if self._chunk_rows == self.chunk_size:
+            self._close_chunk()
+
+    def _close_chunk(self):
+        self.chunks.append((self._chunk_rows, self._chunk_hasher.hexdigest()))
+        self._chunk_rows = 0
+        self._chunk_hasher = _chunk_hasher()
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summary of the stream, closing the last chunk.
+
+        :return: Summary that can be saved as json
+        :rtype: dict[str, Any]
+        """
+        if self._chunk_rows:
+            self._close_chunk()
+
+        return {
+            "rows": self.rows,
+            "hash": f"{self.hash:032x}",
+            "chunks": [{"rows": rows, "hash": value} for rows, value in self.chunks],
+        }
+
+
+class HashingSink(BaseSink):
+    """
+    Sink that hashes the rows it passes to another sink, in the order they are written.
+
+    :attribute inner: Sink that receives the rows
+    :type inner: BaseSink
+    :attribute stream: Hashes of the written rows
+    :type stream: HashStream
+    """
+
+    def __init__(self, inner: BaseSink, stream: HashStream):
+        super().__init__(inner.output_path, inner.config, inner.options)
+        self.inner = inner
+        self.stream = stream
+
+    def _open(self, header: list[str]):
+        self.inner.write_header(header)
+
+    def _write_batch(self, rows: list[list[str]]):
+        for row in rows:
+            self.stream.add(row)
+        self.inner.write_rows(rows)
+
+    def _close(self):
+        self.inner.close()
+
+    def abort(self):
+        self.inner.abort()
+
+    def record_metrics(self, reporter: Report):
+        self.inner.record_metrics(reporter)
+
+
+class ManifestBuilder:
+    """
+    Integrity manifest of a run, computed while the rows stream: hashes and counts of
+    the input, the rejected and the written rows, by chunks, and the hash of the config.
+    The rows that pass the cleaning are hashed as they were read in the kept stream,
+    since the cleaners can rewrite their values, and the kept rows a dedupe drops after
+    the cleaning are hashed in the dropped stream.
+
+    :attribute chunk_size: Rows per chunk
+    :type chunk_size: int
+    :attribute input: Hashes of the read rows
+    :type input: HashStream
+    :attribute rejected: Hashes of the rejected rows
+    :type rejected: HashStream
+    :attribute kept: Hashes of the rows that passed the cleaning, as they were read
+    :type kept: HashStream
+    :attribute dropped: Hashes of the clean rows dropped by a dedupe
+    :type dropped: HashStream
+    :attribute output: Hashes of the written rows
+    :type output: HashStream
+    """
+
+    def __init__(self, chunk_size: int = 100000):
+        self.chunk_size = chunk_size
+        self.input = HashStream(chunk_size)
+        self.rejected = HashStream(chunk_size)
+        self.kept = HashStream(chunk_size)
+        self.dropped = HashStream(chunk_size)
+        self.output = HashStream(chunk_size)
+
+    def wrap(self, sink: BaseSink) -> HashingSink:
+        """
+        Hash the rows written to a sink.
+
+        :param sink: Sink of the clean rows
+        :type sink: BaseSink
+        :return: Sink that hashes and writes the rows
+        :rtype: HashingSink
+        """
+        return HashingSink(sink, self.output)
+
+    def write(
+        self, manifest_path: str, config_path: str, input_path: str, output_path: str, encoding: str
+    ):
+        """
+        Save the manifest as json.
+
+        :param manifest_path: Path of the manifest
+        :type manifest_path: str
+        :param config_path: Path of the config of the run
+        :type config_path: str
+        :param input_path: Path of the input
+        :type input_path: str
+        :param output_path: Path of the output
+        :type output_path: str
+        :param encoding: Encoding of the output
+        :type encoding: str
+        """
+        manifest: dict[str, Any] = {
+            "version": MANIFEST_VERSION,
+            "config_sha256": hashlib.sha256(Path(config_path).read_bytes()).hexdigest(),
+            "chunk_size": self.chunk_size,
+            "input": {"path": input_path, **self.input.to_dict()},
+            "rejected": self.rejected.to_dict(),
+            "kept": self.kept.to_dict(),
+            "dropped": self.dropped.to_dict(),
+            "output": {"path": output_path, "encoding": encoding, **self.output.to_dict()},
+        }
+
+        with Path(manifest_path).open("w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+
+
+def _chunked(rows: Iterator[list[str]], chunk_size: int) -> Iterator[list[list[str]]]:
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def _read_output_rows(output_path: str, encoding: str) -> Iterator[list[str]]:
+    """Rows of a csv output of csvclean, without its header."""
+    if Path(output_path).suffix.lower() != ".csv":
+        raise ValueError("Only csv outputs can be verified.")
+
+    with Path(output_path).open(newline="", encoding=encoding) as output_file:
+        reader = csv.reader(output_file, delimiter=";")
+        next(reader, None)
+        yield from reader
+
+
+def _check_chunk(expected: list[dict[str, Any]], index: int, chunk: tuple[int, str]) -> list[str]:
+    """Problem of a chunk of the output that doesn't match the manifest, if any."""
+    # The chunks out of the manifest are reported by the count of chunks
+    if index >= len(expected) or (expected[index]["rows"], expected[index]["hash"]) == chunk:
+        return []
+    return [f"Chunk {index} of the output doesn't match the manifest."]
+
+
+def _check_balance(manifest: dict[str, Any]) -> list[str]:
+    """Problems of the counts and hashes of the streams of a manifest."""
+    problems: list[str] = []
+
+    balance: int = int(manifest["rejected"]["hash"], 16) + int(manifest["kept"]["hash"], 16)
+    if balance & HASH_MASK != int(manifest["input"]["hash"], 16):
+        problems.append("The input hash isn't the sum of the rejected and kept hashes.")
+
+    if manifest["kept"]["rows"] != manifest["output"]["rows"] + manifest["dropped"]["rows"]:
+        problems.append("The kept rows aren't the sum of the written and dropped rows.")
+
+    return problems
+
+
+def verify_manifest(
+    manifest_path: str, output_path: str | None = None, workers: int | None = None
+) -> list[str]:
+    """
+    Check an output against its manifest, hashing its chunks in parallel processes,
+    and check the input is the sum of the rejected and kept rows. Only a window of
+    twice the workers of chunks is read ahead, so the memory used doesn't grow with
+    the output.
+
+    :param manifest_path: Path of the manifest
+    :type manifest_path: str
+    :param output_path: Path of the output, the one in the manifest if None
+    :type output_path: str | None
+    :param workers: Number of processes, the number of cpus if None
+    :type workers: int | None
+    :return: Problems found, empty if the output matches
+    :rtype: list[str]
+    """
+    with Path(manifest_path).open(encoding="utf-8") as manifest_file:
+        manifest: dict[str, Any] = json.load(manifest_file)
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return [f"The manifest version isn't {MANIFEST_VERSION}."]
+
+    output: dict[str, Any] = manifest["output"]
+    expected: list[dict[str, Any]] = output["chunks"]
+    rows = _read_output_rows(output_path or output["path"], output["encoding"])
+    workers = workers or os.cpu_count() or 1
+    pending: deque[Future] = deque()
+    problems: list[str] = []
+    chunks: int = 0
+
+    with ProcessPoolExecutor(workers) as executor:
+        for chunk in _chunked(rows, manifest["chunk_size"]):
+            pending.append(executor.submit(hash_rows, chunk))
+
+            if len(pending) >= 2 * workers:
+                problems += _check_chunk(expected, chunks, pending.popleft().result())
+                chunks += 1
+
+        while pending:
+            problems += _check_chunk(expected, chunks, pending.popleft().result())
+            chunks += 1
+
+    if chunks != len(expected):
+        problems.append(f"The output has {chunks} chunks and the manifest {len(expected)}.")
+
+    return problems + _check_balance(manifest)
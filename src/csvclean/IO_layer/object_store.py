@@ -0,0 +1,302 @@
+import io
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any
+
+from ..models.options import S3Options
+
+S3_SCHEME = "s3://"
+
+
+def _import_boto3() -> Any:
+    """
+    Import boto3, that is only needed by the s3:// inputs and outputs.
+
+    :return: boto3 module
+    :rtype: Any
+    :raises ImportError: If boto3 is not installed
+    """
+    try:
+        import boto3
+    except ImportError as error:
+        raise ImportError(
+            "s3:// inputs and outputs need boto3, install it with 'pip install csvclean[s3]'."
+        ) from error
+
+    return boto3
+
+
+def is_s3_url(path: str) -> bool:
+    """
+    Check if a path is an object of an S3-compatible store.
+
+    :param path: Path or url
+    :type path: str
+    :return: True if the path starts with s3://
+    :rtype: bool
+    """
+    return path.startswith(S3_SCHEME)
+
+
+def split_s3_url(url: str) -> tuple[str, str]:
+    """
+    Bucket and key of an s3:// url.
+
+    :param url: Url as s3://bucket/key
+    :type url: str
+    :return: Bucket and key
+    :rtype: tuple[str, str]
+    :raises ValueError: If the url has no bucket or no key
+    """
+    bucket, _, key = url.removeprefix(S3_SCHEME).partition("/")
+
+    if not bucket or not key:
+        raise ValueError(f"The url {url} isn't s3://bucket/key.")
+
+    return bucket, key
+
+
+class RangedReader(io.RawIOBase):
+    """
+    Readable stream of an object, downloaded with concurrent range requests. Up to
+    concurrency parts of part_size bytes are requested ahead and handed over in order,
+    so the memory used is bounded by concurrency * part_size. The parts are asked with
+    the ETag of the object, so a change of the object in the middle of the read fails.
+
+    :attribute size: Bytes of the object
+    :type size: int
+    """
+
+    def __init__(self, client: Any, url: str, options: S3Options):
+        super().__init__()
+        self.client = client
+        self.bucket, self.key = split_s3_url(url)
+        self.options = options
+
+        head: dict[str, Any] = client.head_object(Bucket=self.bucket, Key=self.key)
+        self.size: int = head["ContentLength"]
+        self._etag: str = head["ETag"]
+        self._executor = ThreadPoolExecutor(options.concurrency)
+        self._parts: deque[Future[bytes]] = deque()
+        self._next_offset = 0
+        self._part = memoryview(b"")
+        self._request_parts()
+
+    def _get_range(self, start: int, end: int) -> bytes:
+        response: dict[str, Any] = self.client.get_object(
+            Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end}", IfMatch=self._etag
+        )
+        return response["Body"].read()
+
+    def _request_parts(self):
+        """Keep concurrency range requests in flight, until the end of the object."""
+        while len(self._parts) < self.options.concurrency and self._next_offset < self.size:
+            end: int = min(self._next_offset + self.options.part_size, self.size) - 1
+            self._parts.append(self._executor.submit(self._get_range, self._next_offset, end))
+            self._next_offset = end + 1
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._part:
+            if not self._parts:
+                return 0
+            self._part = memoryview(self._parts.popleft().result())
+            self._request_parts()
+
+        size: int = min(len(buffer), len(self._part))
+        buffer[:size] = self._part[:size]
+        self._part = self._part[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            for part in self._parts:
+                part.cancel()
+            self._parts.clear()
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        super().close()
+
+
+class MultipartWriter(io.RawIOBase):
+    """
+    Writable stream of an object, uploaded as a multipart upload while it is written.
+    Each part_size bytes are sent as a part, with up to concurrency parts in flight.
+    The upload is completed on close, or aborted if a part failed or abort is called,
+    after which the writes are discarded. Objects smaller than one part are sent with a
+    single put.
+    """
+
+    def __init__(self, client: Any, url: str, options: S3Options):
+        super().__init__()
+        self.client = client
+        self.bucket, self.key = split_s3_url(url)
+        self.options = options
+        self._executor = ThreadPoolExecutor(options.concurrency)
+        self._buffer = bytearray()
+        self._parts: list[Future[dict[str, Any]]] = []
+        self._upload_id: str | None = None
+        self._aborted = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        if self._aborted:
+            return len(data)
+
+        self._buffer += data
+
+        try:
+            while len(self._buffer) >= self.options.part_size:
+                self._upload_part(bytes(self._buffer[: self.options.part_size]))
+                del self._buffer[: self.options.part_size]
+        except Exception:
+            self.abort()
+            raise
+
+        return len(data)
+
+    def _send_part(self, number: int, body: bytes) -> dict[str, Any]:
+        response: dict[str, Any] = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id, PartNumber=number, Body=body
+        )
+        return {"PartNumber": number, "ETag": response["ETag"]}
+
+    def _upload_part(self, body: bytes):
+        """Send a part, waiting first for the oldest one if concurrency are in flight."""
+        if self._upload_id is None:
+            response = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key)
+            self._upload_id = response["UploadId"]
+
+        if len(self._parts) >= self.options.concurrency:
+            self._parts[len(self._parts) - self.options.concurrency].result()
+
+        self._parts.append(self._executor.submit(self._send_part, len(self._parts) + 1, body))
+
+    def _complete(self):
+        if self._upload_id is None:
+            self.client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer))
+            return
+
+        if self._buffer:
+            self._upload_part(bytes(self._buffer))
+
+        parts: list[dict[str, Any]] = [part.result() for part in self._parts]
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+
+    def abort(self):
+        """Drop the object: cancel the pending parts and abort the multipart upload."""
+        if self._aborted:
+            return
+
+        self._aborted = True
+        self._buffer = bytearray()
+
+        for part in self._parts:
+            part.cancel()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+        if self._upload_id is not None:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+
+    def close(self):
+        if not self.closed and not self._aborted:
+            try:
+                self._complete()
+            except Exception:
+                self.abort()
+                raise
+            finally:
+                self._buffer = bytearray()
+                self._executor.shutdown(wait=True)
+        super().close()
+
+
+def _client(options: S3Options) -> Any:
+    return _import_boto3().client("s3", endpoint_url=options.endpoint_url)
+
+
+def open_binary(path: str, mode: str, s3: S3Options | None = None) -> IO[bytes]:
+    """
+    Open a local file or an s3:// object as a buffered binary stream.
+
+    :param path: Path of the file or url of the object
+    :type path: str
+    :param mode: "rb" to read or "wb" to write
+    :type mode: str
+    :param s3: Options of the transfers of the objects, the default ones if None
+    :type s3: S3Options | None
+    :return: Binary stream
+    :rtype: IO[bytes]
+    """
+    if not is_s3_url(path):
+        return Path(path).open(mode)
+
+    s3 = s3 or S3Options()
+
+    if mode == "rb":
+        return io.BufferedReader(RangedReader(_client(s3), path, s3), s3.part_size)
+    return io.BufferedWriter(MultipartWriter(_client(s3), path, s3), s3.part_size)
+
+
+def abort_upload(stream: IO[Any]):
+    """
+    Abort the upload of an s3:// object opened by open_text or open_binary, so closing
+    the stream doesn't publish it. A local file is left as it is.
+
+    :param stream: Stream opened by open_text or open_binary
+    :type stream: IO[Any]
+    """
+    raw: Any = getattr(getattr(stream, "buffer", stream), "raw", None)
+
+    if isinstance(raw, MultipartWriter):
+        raw.abort()
+
+
+def open_text(path: str, mode: str, encoding: str, s3: S3Options | None = None) -> IO[str]:
+    """
+    Open a local file or an s3:// object as a text stream, without newline translation.
+
+    :param path: Path of the file or url of the object
+    :type path: str
+    :param mode: "r" to read or "w" to write
+    :type mode: str
+    :param encoding: Encoding of the text
+    :type encoding: str
+    :param s3: Options of the transfers of the objects, the default ones if None
+    :type s3: S3Options | None
+    :return: Text stream
+    :rtype: IO[str]
+    """
+    if not is_s3_url(path):
+        return Path(path).open(mode, newline="", encoding=encoding)
+
+    return io.TextIOWrapper(open_binary(path, f"{mode}b", s3), encoding=encoding, newline="")
+
+
+def input_size(path: str, s3: S3Options | None = None) -> int:
+    """
+    Bytes of a local file or of an s3:// object.
+
+    :param path: Path of the file or url of the object
+    :type path: str
+    :param s3: Options of the transfers of the objects, the default ones if None
+    :type s3: S3Options | None
+    :return: Size in bytes
+    :rtype: int
+    """
+    if not is_s3_url(path):
+        return Path(path).stat().st_size
+
+    bucket, key = split_s3_url(path)
+    return _client(s3 or S3Options()).head_object(Bucket=bucket, Key=key)["ContentLength"]
@@ -0,0 +1,236 @@
+import csv
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, TextIO
+
+from ..models.config import Configuration
+from ..models.options import PartitionOptions, SinkOptions
+from .sinks import BaseSink
+
+PARTITIONS_MANIFEST = "_partitions.json"
+EMPTY_PARTITION = "__empty__"
+# Characters escaped as %XX in the directory names, like the Hive partitions.
+UNSAFE_CHARACTERS = frozenset('/\\:*?"<>|%=')
+
+
+def _escape(text: str) -> str:
+    return "".join(
+        f"%{ord(char):02X}" if char in UNSAFE_CHARACTERS or ord(char) < 32 else char
+        for char in text
+    )
+
+
+def partition_directory(column_name: str, value: str) -> str:
+    """
+    Name of the directory of a partition, as "column=value" with the characters that are
+    not valid in a file name escaped.
+
+    :param column_name: Name of the partition column
+    :type column_name: str
+    :param value: Value of the partition
+    :type value: str
+    :return: Name of the directory
+    :rtype: str
+    """
+    return f"{_escape(column_name)}={_escape(value) or EMPTY_PARTITION}"
+
+
+class Partition:
+    """
+    Buffer and files of one partition of the output.
+
+    :attribute value: Value of the partition column, None if the output is only rolled
+    :type value: str | None
+    :attribute directory: Directory of the files of the partition
+    :type directory: Path
+    :attribute buffer: Rows waiting to be written
+    :type buffer: list[list[str]]
+    :attribute files: Path and number of rows of each file of the partition
+    :type files: list[tuple[Path, int]]
+    """
+
+    def __init__(self, value: str | None, directory: Path):
+        self.value = value
+        self.directory = directory
+        self.buffer: list[list[str]] = []
+        self.files: list[tuple[Path, int]] = []
+        self.file: TextIO | None = None
+        self.writer: Any = None
+        self.rolled = True
+
+    def open(self, header: list[str], encoding: str):
+        """
+        Open the current file of the partition, starting a new one after a roll.
+
+        :param header: Names of the columns, written at the start of each file
+        :type header: list[str]
+        :param encoding: Encoding of the files
+        :type encoding: str
+        """
+        if self.rolled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.files.append((self.directory / f"part-{len(self.files) + 1:04d}.csv", 0))
+            self.file = self.files[-1][0].open("w", newline="", encoding=encoding)
+            self.writer = csv.writer(self.file, delimiter=";")
+            self.writer.writerow(header)
+            self.rolled = False
+        else:
+            self.file = self.files[-1][0].open("a", newline="", encoding=encoding)
+            self.writer = csv.writer(self.file, delimiter=";")
+
+    def write_buffer(self, max_file_bytes: int | None):
+        """
+        Write the whole buffer in the open file, rolling it once it reaches max_file_bytes.
+
+        :param max_file_bytes: Size that ends a file, no limit if None
+        :type max_file_bytes: int | None
+        """
+        if self.file is None:
+            raise RuntimeError("The file of the partition is not open.")
+
+        self.writer.writerows(self.buffer)
+        path, rows = self.files[-1]
+        self.files[-1] = (path, rows + len(self.buffer))
+        self.buffer = []
+
+        if max_file_bytes is not None and self.file.tell() >= max_file_bytes:
+            self.close()
+            self.rolled = True
+
+    def close(self):
+        """Close the open file, if any."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.writer = None
+
+
+class PartitionedSink(BaseSink):
+    """
+    Sink that splits the clean rows in csv files by the value of a column, as
+    "column=value/part-0001.csv", and rolls the files of each partition over after a
+    size. The rows are buffered by partition and each buffer is written whole; the open
+    files are kept in an LRU pool of max_open_files. On close, a json manifest with the
+    produced files is written in the output directory.
+
+    :attribute partition_options: Options of the partitions
+    :type partition_options: PartitionOptions
+    :attribute partitions: Partitions by value of the column
+    :type partitions: dict[str | None, Partition]
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        config: Configuration,
+        options: SinkOptions,
+        partition_options: PartitionOptions,
+    ):
+        super().__init__(output_path, config, options)
+        self.partition_options = partition_options
+        self.partitions: dict[str | None, Partition] = {}
+        self._open_files: OrderedDict[str | None, Partition] = OrderedDict()
+        self._key_column: int | None = None
+        self._buffered = 0
+
+    def _open(self, header: list[str]):
+        Path(self.output_path).mkdir(parents=True, exist_ok=True)
+        column: str | None = self.partition_options.column
+
+        if column is None:
+            return
+        if column in header:
+            self._key_column = header.index(column)
+        elif column.isdigit() and int(column) < len(header):
+            self._key_column = int(column)
+        else:
+            raise ValueError(f"Partition column not found: {column}")
+
+    def _partition(self, row: list[str]) -> Partition:
+        """Partition of a row, created the first time its value is seen."""
+        value: str | None = None
+        if self._key_column is not None:
+            value = row[self._key_column] if self._key_column < len(row) else ""
+
+        partition: Partition | None = self.partitions.get(value)
+
+        if partition is None:
+            directory = Path(self.output_path)
+            if value is not None and self._key_column is not None:
+                directory /= partition_directory(self.header[self._key_column], value)
+            partition = Partition(value, directory)
+            self.partitions[value] = partition
+
+        return partition
+
+    def _write_batch(self, rows: list[list[str]]):
+        for row in rows:
+            partition = self._partition(row)
+            partition.buffer.append(row)
+            self._buffered += 1
+
+            if len(partition.buffer) >= self.batch_size:
+                self._flush_partition(partition)
+
+        if self._buffered >= self.batch_size * self.partition_options.max_open_files:
+            self._flush_partitions()
+
+    def _flush_partition(self, partition: Partition):
+        """Write the buffer of a partition, through the pool of open files."""
+        if partition.value in self._open_files:
+            self._open_files.move_to_end(partition.value)
+        else:
+            if len(self._open_files) >= self.partition_options.max_open_files:
+                _, evicted = self._open_files.popitem(last=False)
+                evicted.close()
+            partition.open(self.header, self.options.encoding)
+            self._open_files[partition.value] = partition
+
+        self._buffered -= len(partition.buffer)
+        partition.write_buffer(self.partition_options.max_file_bytes)
+
+        if partition.file is None:
+            del self._open_files[partition.value]
+
+    def _flush_partitions(self):
+        for partition in self.partitions.values():
+            if partition.buffer:
+                self._flush_partition(partition)
+
+    def manifest(self) -> dict[str, Any]:
+        """
+        Files produced by the sink.
+
+        :return: Partition column and path, partition value and rows of each file
+        :rtype: dict[str, Any]
+        """
+        output_path = Path(self.output_path)
+        column: str | None = None
+        if self._key_column is not None:
+            column = self.header[self._key_column]
+
+        return {
+            "column": column,
+            "files": [
+                {
+                    "path": path.relative_to(output_path).as_posix(),
+                    "partition": partition.value,
+                    "rows": rows,
+                }
+                for partition in self.partitions.values()
+                for path, rows in partition.files
+            ],
+        }
+
+    def _close(self):
+        self._flush_partitions()
+
+        for partition in self._open_files.values():
+            partition.close()
+        self._open_files.clear()
+
+        Path(self.output_path).mkdir(parents=True, exist_ok=True)
+        manifest_path = Path(self.output_path) / PARTITIONS_MANIFEST
+        with manifest_path.open("w", encoding="utf-8") as manifest_file:
+            json.dump(self.manifest(), manifest_file, indent=2, ensure_ascii=False)
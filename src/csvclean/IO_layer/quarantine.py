@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from ..models.config import Configuration
+from ..models.data_register import LineError
+from ..models.options import SinkOptions
+from .sinks import CSVSink
+
+QUARANTINE_COLUMNS = ["line_number", "byte_offset", "errors"]
+
+
+def format_errors(errors: LineError) -> str:
+    """
+    Write the errors of a row as "column:ERROR" pairs separated by '|'.
+
+    :param errors: Errors of the row
+    :type errors: LineError
+    :return: Text with the errors, e.g. "1:NULL|3:TYPE"
+    :rtype: str
+    """
+    return "|".join(f"{column}:{error.name}" for column, error in sorted(errors.items()))
+
+
+class QuarantineSink(CSVSink):
+    """
+    Side csv with the rejected rows, their position in the input and their errors.
+    It uses the buffered batches of CSVSink, so it is cheap even with many rejections.
+    """
+
+    def __init__(self, output_path: str, config: Configuration, options: SinkOptions):
+        if Path(output_path).suffix.lower() != ".csv":
+            raise ValueError("The quarantine path must be a csv file.")
+        super().__init__(output_path, config, options)
+
+    def _open(self, header: list[str]):
+        super()._open(QUARANTINE_COLUMNS + header)
+
+    def write_rejected(self, row: list[str], errors: LineError, line_number: int, offset: int):
+        """
+        Buffer a rejected row.
+
+        :param row: Rejected row as it was read
+        :type row: list[str]
+        :param errors: Errors of the row
+        :type errors: LineError
+        :param line_number: Line of the input where the row starts
+        :type line_number: int
+        :param offset: Byte offset of the input where the row starts
+        :type offset: int
+        """
+        self.write_row([str(line_number), str(offset), format_errors(errors), *row])
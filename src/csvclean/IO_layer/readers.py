@@ -0,0 +1,273 @@
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Generator, Sequence
+from operator import itemgetter
+from pathlib import Path
+from typing import Any
+
+from ..models.config import FieldSpec
+from ..models.options import S3Options
+from .encoding import TrackedLines
+from .object_store import is_s3_url
+
+FIXED_WIDTH_SUFFIXES = {".txt", ".dat", ".fwf"}
+NDJSON_SUFFIXES = {".jsonl", ".ndjson"}
+
+
+class BaseReader(ABC):
+    """
+    Reader of an input format that yields ("__header__", header) and then
+    ("__row__", row) for each record, like CSVIOlayer.read_csv.
+
+    :attribute position: Line number and byte offset where the last read record starts
+    :type position: tuple[int, int]
+    :attribute lines: Tracked lines of the input being read
+    :type lines: TrackedLines | None
+    """
+
+    def __init__(self):
+        self.position: tuple[int, int] = (0, 0)
+        self.lines: TrackedLines | None = None
+
+    @property
+    def bytes_read(self) -> int:
+        """Bytes of the input consumed by the reader."""
+        return self.lines.offset if self.lines is not None else 0
+
+    def read(self, path: str, encoding: str, s3: S3Options | None = None) -> Generator:
+        """
+        Read the input line by line.
+
+        :param path: Path of the input or s3:// url of the object
+        :type path: str
+        :param encoding: Encoding of the input
+        :type encoding: str
+        :param s3: Options of the reads of the s3:// objects
+        :type s3: S3Options | None
+        :return: Generator with the header and the rows
+        :rtype: Generator
+        """
+        if not is_s3_url(path) and not Path(path).is_file():
+            raise FileNotFoundError(f"The {path} doesn't exists.")
+
+        self.lines = TrackedLines(path, encoding, s3)
+        yield from self._records(self.lines)
+
+    def _numbered_lines(self, lines: TrackedLines) -> Generator[str, None, None]:
+        """Lines without their line break, saving in position where each one starts."""
+        start: int = lines.offset
+
+        for line_number, line in enumerate(lines, start=1):
+            self.position = (line_number, start)
+            start = lines.offset
+            yield line.rstrip("\r\n")
+
+    @abstractmethod
+    def _records(self, lines: TrackedLines) -> Generator:
+        """Header and rows of the input."""
+
+
+class FixedWidthReader(BaseReader):
+    """
+    Reader of fixed-width files. The slices of the columns are computed once from the
+    layout and applied to each line at once with an itemgetter. The padding of the
+    values is removed. The file has no header line; the header is the layout names.
+    A line of another width is cut in a row of another number of values, so the
+    structural stage rejects it.
+
+    :attribute header: Names of the columns
+    :type header: list[str]
+    :attribute width: Number of characters of the lines
+    :type width: int
+    """
+
+    def __init__(self, layout: list[FieldSpec]):
+        super().__init__()
+        if not layout:
+            raise ValueError("Fixed-width inputs need a layout in the config.")
+
+        self.header: list[str] = [field.name for field in layout]
+        slices: list[slice] = []
+        start: int = 0
+
+        for field in layout:
+            slices.append(slice(start, start + field.width))
+            start += field.width
+
+        self.width: int = start
+        self._slices = slices
+        self._getter = itemgetter(*slices)
+        self._single_column: bool = len(slices) == 1
+
+    def split(self, line: str) -> list[str]:
+        """
+        Cut a line in the values of the columns.
+
+        :param line: Line without its line break
+        :type line: str
+        :return: Values without padding. A short line only has the values of the columns
+            it covers whole, and a long line has the rest of the line as one more value
+        :rtype: list[str]
+        """
+        if len(line) != self.width:
+            values: list[str] = [
+                line[column].strip() for column in self._slices if column.stop <= len(line)
+            ]
+            return [*values, line[self.width :]] if len(line) > self.width else values
+
+        values = self._getter(line)
+        if self._single_column:
+            return [values.strip()]
+        return [value.strip() for value in values]
+
+    def _records(self, lines: TrackedLines) -> Generator:
+        yield ("__header__", list(self.header))
+
+        for line in self._numbered_lines(lines):
+            if line:
+                yield ("__row__", self.split(line))
+
+
+def _json_text(value: Any) -> str:
+    """Text of a json value as it would be written in a csv cell."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return str(value)
+
+
+class NDJSONReader(BaseReader):
+    """
+    Reader of json lines files, one object per line. The header is the layout names
+    if given, else the keys of the first object. Missing keys are empty values and
+    keys not in the header are ignored.
+
+    :attribute header: Names of the columns, None until the first object is read
+    :type header: list[str] | None
+    """
+
+    def __init__(self, layout: list[FieldSpec] | None = None):
+        super().__init__()
+        self.header: list[str] | None = [field.name for field in layout] if layout else None
+
+    def _records(self, lines: TrackedLines) -> Generator:
+        header: list[str] | None = self.header
+
+        if header is not None:
+            yield ("__header__", list(header))
+
+        for line in self._numbered_lines(lines):
+            if not line.strip():
+                continue
+
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f"The line {self.position[0]} isn't a json object.")
+
+            if header is None:
+                header = list(record)
+                yield ("__header__", list(header))
+
+            yield ("__row__", [_json_text(record.get(key)) for key in header])
+
+        if header is None:
+            yield ("__header__", [])
+
+
+def _sql_text(value: Any) -> str:
+    """Text of a database value as it would be written in a csv cell."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    return str(value)
+
+
+class QueryReader:
+    """
+    Reader of the result of a query over a DB-API connection, like sqlite3, with the
+    protocol of BaseReader. The rows are pulled from the cursor with fetchmany in
+    batches of fetch_size, so the driver streams the result instead of building it
+    whole. The header is the column names of the cursor and NULL values are empty.
+
+    :attribute fetch_size: Rows asked to the cursor at once
+    :type fetch_size: int
+    :attribute position: Number of the last read row, with 0 as byte offset
+    :type position: tuple[int, int]
+    """
+
+    def __init__(self, fetch_size: int = 10000):
+        if fetch_size <= 0:
+            raise ValueError("The fetch size must be positive.")
+
+        self.fetch_size = fetch_size
+        self.position: tuple[int, int] = (0, 0)
+
+    def read(self, connection: Any, query: str, parameters: Sequence[Any] = ()) -> Generator:
+        """
+        Run the query and read its result.
+
+        :param connection: Open DB-API connection
+        :type connection: Any
+        :param query: Query that returns the rows to clean
+        :type query: str
+        :param parameters: Parameters of the query
+        :type parameters: Sequence[Any]
+        :return: Generator with the header and the rows
+        :rtype: Generator
+        :raises ValueError: If the query doesn't return rows
+        """
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute(query, parameters)
+            if cursor.description is None:
+                raise ValueError("The query doesn't return rows.")
+
+            yield ("__header__", [str(column[0]) for column in cursor.description])
+            row_number: int = 0
+
+            while rows := cursor.fetchmany(self.fetch_size):
+                for row in rows:
+                    row_number += 1
+                    self.position = (row_number, 0)
+                    yield ("__row__", [_sql_text(value) for value in row])
+        finally:
+            cursor.close()
+
+
+def is_csv_input(path: str) -> bool:
+    """
+    Check if an input is read as csv, without a reader of its own, by its extension.
+
+    :param path: Path of the input
+    :type path: str
+    :return: True if the input is a csv
+    :rtype: bool
+    """
+    return Path(path).suffix.lower() not in FIXED_WIDTH_SUFFIXES | NDJSON_SUFFIXES
+
+
+def build_reader(path: str, layout: list[FieldSpec] | None = None) -> BaseReader | None:
+    """
+    Create the reader of an input by its extension.
+
+    :param path: Path of the input
+    :type path: str
+    :param layout: Columns declared in the layout of the config
+    :type layout: list[FieldSpec] | None
+    :return: Reader, None for the csv inputs
+    :rtype: BaseReader | None
+    """
+    suffix: str = Path(path).suffix.lower()
+
+    if suffix in FIXED_WIDTH_SUFFIXES:
+        return FixedWidthReader(layout or [])
+    if suffix in NDJSON_SUFFIXES:
+        return NDJSONReader(layout)
+    return None
@@ -0,0 +1,100 @@
+import csv
+import math
+import random
+from collections.abc import Iterable
+from itertools import islice
+from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Below this size reading the whole file is already fast, and exact.
+FULL_SCAN_BYTES = 8 * 1024 * 1024
+
+
+def _open_unit(rng: random.Random) -> float:
+    """Random number in (0, 1], safe to take its logarithm."""
+    return 1.0 - rng.random()
+
+
+def reservoir_sample(records: Iterable[T], size: int, rng: random.Random) -> list[T]:
+    """
+    Uniform sample of a stream of unknown length, with the algorithm L of Li: after
+    filling the reservoir, it jumps over the records that wouldn't be chosen instead
+    of drawing a random number for each one.
+
+    :param records: Stream of records
+    :type records: Iterable[T]
+    :param size: Size of the sample
+    :type size: int
+    :param rng: Random generator
+    :type rng: random.Random
+    :return: Sampled records, all of them if the stream is shorter than the sample
+    :rtype: list[T]
+    """
+    iterator = iter(records)
+    reservoir: list[T] = list(islice(iterator, size))
+
+    if len(reservoir) < size:
+        return reservoir
+
+    weight: float = math.exp(math.log(_open_unit(rng)) / size)
+
+    while True:
+        skip: int = math.floor(math.log(_open_unit(rng)) / math.log1p(-weight))
+        chosen: list[T] = list(islice(iterator, skip, skip + 1))
+
+        if not chosen:
+            return reservoir
+
+        reservoir[rng.randrange(size)] = chosen[0]
+        weight *= math.exp(math.log(_open_unit(rng)) / size)
+
+
+def seek_sample(
+    csv_path: str,
+    encoding: str,
+    delimiter: str,
+    size: int,
+    *,
+    rng: random.Random,
+    data_start: int,
+) -> list[list[str]]:
+    """
+    Sample of the rows of a big csv reading only around random byte offsets. Each
+    offset picks the line that follows it, so the sample is uniform when the lines
+    have similar lengths. Only for ascii compatible encodings and csvs without new
+    lines inside quoted fields.
+
+    :param csv_path: Path of the csv
+    :type csv_path: str
+    :param encoding: Ascii compatible encoding of the csv
+    :type encoding: str
+    :param delimiter: Delimiter of the csv
+    :type delimiter: str
+    :param size: Size of the sample
+    :type size: int
+    :param rng: Random generator
+    :type rng: random.Random
+    :param data_start: Byte offset where the first row after the header starts
+    :type data_start: int
+    :return: Sampled rows
+    :rtype: list[list[str]]
+    """
+    rows: list[list[str]] = []
+
+    with Path(csv_path).open("rb") as binary_file:
+        file_size: int = binary_file.seek(0, 2)
+        attempts: int = 0
+
+        # Offsets start on the end of the header, so the first row can be picked too.
+        while len(rows) < size and attempts < 4 * size and data_start < file_size:
+            attempts += 1
+            binary_file.seek(rng.randrange(data_start - 1, file_size - 1))
+            binary_file.readline()
+            line: bytes = binary_file.readline()
+
+            if line:
+                rows.append(next(csv.reader([line.decode(encoding)], delimiter=delimiter), []))
+
+    return rows
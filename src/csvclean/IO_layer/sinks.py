@@ -0,0 +1,700 @@
+import csv
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from ..models.config import Configuration
+from ..models.options import SinkOptions
+from ..models.row_batch import RowBatch
+from ..reporters.cleaning_report import Report
+from ..validators.dates import column_date_format
+from .object_store import abort_upload, is_s3_url, open_text
+
+BOOL_VALUES: dict[str, bool] = {
+    "true": True,
+    "1": True,
+    "yes": True,
+    "false": False,
+    "0": False,
+    "no": False,
+}
+
+# Share of distinct values in the first batch above which a text column of an Arrow
+# output is written as plain strings instead of dictionary encoded, for first batches
+# of at least DICTIONARY_MIN_ROWS rows.
+DICTIONARY_MAX_RATIO = 0.5
+DICTIONARY_MIN_ROWS = 64
+
+
+def _import_pyarrow() -> Any:
+    """
+    Import pyarrow, that is only needed by the columnar sinks.
+
+    :return: pyarrow module
+    :rtype: Any
+    :raises ImportError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError(
+            "Parquet and Arrow outputs need pyarrow, install it with 'pip install csvclean[arrow]'."
+        ) from error
+
+    return pyarrow
+
+
+def _to_int(value: str) -> int | None:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _to_float(value: str) -> float | None:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _to_bool(value: str) -> bool | None:
+    return BOOL_VALUES.get(value.lower())
+
+
+def _to_str(value: str) -> str:
+    return value
+
+
+def _to_date(value: str) -> date | None:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _to_datetime(value: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+# The date and datetime converters take the values in ISO 8601, see _column_converters.
+CONVERTERS: dict[type, Callable[[str], Any]] = {
+    int: _to_int,
+    float: _to_float,
+    bool: _to_bool,
+    str: _to_str,
+    date: _to_date,
+    datetime: _to_datetime,
+}
+
+# SQLite has no date type, so the dates are stored as ISO 8601 text.
+SQLITE_CONVERTERS: dict[type, Callable[[str], Any]] = {
+    **CONVERTERS,
+    date: _to_str,
+    datetime: _to_str,
+}
+
+SQLITE_TYPES = {
+    int: "INTEGER",
+    float: "REAL",
+    bool: "INTEGER",
+    str: "TEXT",
+    date: "TEXT",
+    datetime: "TEXT",
+}
+
+
+def _column_types(config: Configuration, header: list[str]) -> list[type]:
+    """
+    Type of each column, text for the columns without configured type.
+
+    :param config: Configuration of the cleaning
+    :type config: Configuration
+    :param header: Names of the columns
+    :type header: list[str]
+    :return: Type of each column
+    :rtype: list[type]
+    """
+    types: list[type] = list(config.header_types[: len(header)])
+    return types + [str] * (len(header) - len(types))
+
+
+def _column_converters(
+    config: Configuration, types: list[type], converters: dict[type, Callable[[str], Any]]
+) -> list[Callable[[str], Any]]:
+    """
+    Converter of each column. The values of the date and datetime columns are first
+    normalized to ISO 8601 with the format of the column, that leaves as they are the
+    values already normalized by the cleaning.
+
+    :param config: Configuration of the cleaning
+    :type config: Configuration
+    :param types: Type of each column
+    :type types: list[type]
+    :param converters: Converter of each type
+    :type converters: dict[type, Callable[[str], Any]]
+    :return: Converter of each column
+    :rtype: list[Callable[[str], Any]]
+    """
+    column_converters: list[Callable[[str], Any]] = []
+
+    for column, column_type in enumerate(types):
+        convert: Callable[[str], Any] = converters.get(column_type, _to_str)
+        date_format = column_date_format(config, column)
+
+        if date_format is not None:
+            convert = _from_iso(convert, date_format.to_iso)
+        column_converters.append(convert)
+
+    return column_converters
+
+
+def _from_iso(convert: Callable[[str], Any], to_iso: Callable[[str], str]) -> Callable[[str], Any]:
+    return lambda value: convert(to_iso(value))
+
+
+class BaseSink(ABC):
+    """
+    Destination of the clean rows. The rows are buffered and written in batches,
+    so the memory used is bounded by the batch size.
+
+    :attribute output_path: Path of the output file
+    :type output_path: str
+    :attribute config: Configuration of the cleaning
+    :type config: Configuration
+    :attribute options: Options of the sink
+    :type options: SinkOptions
+    """
+
+    def __init__(self, output_path: str, config: Configuration, options: SinkOptions):
+        self.output_path = output_path
+        self.config = config
+        self.options = options
+        self.header: list[str] = []
+        self._buffer: list[list[str]] = []
+
+    @property
+    def batch_size(self) -> int:
+        """Number of buffered rows that triggers a write."""
+        return self.options.batch_size
+
+    def write_header(self, header: list[str]):
+        """
+        Open the output with the header of the csv.
+
+        :param header: Names of the columns
+        :type header: list[str]
+        """
+        self.header = header
+        self._open(header)
+
+    def write_row(self, row: list[str]):
+        """
+        Buffer one clean row, writing the batch when it is full.
+
+        :param row: Clean row
+        :type row: list[str]
+        """
+        self._buffer.append(row)
+
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_rows(self, rows: list[list[str]]):
+        """
+        Buffer several clean rows.
+
+        :param rows: Clean rows
+        :type rows: list[list[str]]
+        """
+        for row in rows:
+            self.write_row(row)
+
+    def write_batch(self, batch: RowBatch):
+        """
+        Buffer the rows of a batch that survived the cleaning.
+
+        :param batch: Batch of clean rows and its selection vector
+        :type batch: RowBatch
+        """
+        self.write_rows(list(batch.selected_rows()))
+
+    def record_metrics(self, reporter: Report):  # noqa: B027
+        """
+        Save the timings of the sink in a report, after it is closed.
+
+        :param reporter: Report of the run
+        :type reporter: Report
+        """
+
+    def flush(self):
+        """Write the buffered rows."""
+        if self._buffer:
+            self._write_batch(self._buffer)
+            self._buffer = []
+
+    def commit(self):
+        """
+        Write the buffered rows and hand them to the output, so its readers see them
+        before the sink is closed.
+        """
+        self.flush()
+
+    def close(self):
+        """Write the pending rows and close the output."""
+        self.flush()
+        self._close()
+
+    def abort(self):
+        """
+        Close the output after a failed run, without writing the buffered rows. The
+        sinks that can discard what they wrote do it.
+        """
+        self._buffer = []
+        self._close()
+
+    def __enter__(self) -> "BaseSink":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_: object):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    @abstractmethod
+    def _open(self, header: list[str]): ...
+
+    @abstractmethod
+    def _write_batch(self, rows: list[list[str]]): ...
+
+    @abstractmethod
+    def _close(self): ...
+
+
+class CSVSink(BaseSink):
+    """
+    Sink that writes the clean rows in a ';' delimited csv, a local file or an s3://
+    object uploaded in parts while it is written. On append, the rows are added to the
+    end of a local file and the header is only written if the file is empty.
+    """
+
+    def __init__(self, output_path: str, config: Configuration, options: SinkOptions):
+        super().__init__(output_path, config, options)
+        if options.append and is_s3_url(output_path):
+            raise ValueError("The s3:// outputs can't be appended to.")
+
+        mode: str = "a" if options.append else "w"
+        self._file = open_text(output_path, mode, options.encoding, options.s3)
+        self._writer = csv.writer(self._file, delimiter=";")
+
+    def _open(self, header: list[str]):
+        if not (self.options.append and self._file.tell()):
+            self._writer.writerow(header)
+
+    def _write_batch(self, rows: list[list[str]]):
+        self._writer.writerows(rows)
+
+    def commit(self):
+        super().commit()
+        self._file.flush()
+
+    def abort(self):
+        abort_upload(self._file)
+        super().abort()
+
+    def _close(self):
+        self._file.close()
+
+
+class ArrowSink(BaseSink):
+    """
+    Common logic of the sinks that build Arrow record batches, typed with
+    the header_types of the configuration. The rows are buffered by column, so the
+    columns of a batch are written without being turned into rows.
+    """
+
+    def __init__(self, output_path: str, config: Configuration, options: SinkOptions):
+        super().__init__(output_path, config, options)
+        self.pa = _import_pyarrow()
+        self.schema: Any = None
+        self._types: list[type] = []
+        self._converters: list[Callable[[str], Any]] = []
+        self._writer: Any = None
+        self._columns: list[list[str]] = []
+        self._buffered: int = 0
+
+    def _arrow_type(self, column_type: type) -> Any:
+        arrow_types = {
+            int: self.pa.int64(),
+            float: self.pa.float64(),
+            bool: self.pa.bool_(),
+            str: self.pa.string(),
+            date: self.pa.date32(),
+            datetime: self.pa.timestamp("us"),
+        }
+        return arrow_types.get(column_type, self.pa.string())
+
+    def _open(self, header: list[str]):
+        self._types = _column_types(self.config, header)
+        self._converters = _column_converters(self.config, self._types, CONVERTERS)
+        self.schema = self.pa.schema(
+            [
+                (name, self._arrow_type(column_type))
+                for name, column_type in zip(header, self._types, strict=True)
+            ]
+        )
+        self._columns = [[] for _ in header]
+        self._writer = self._new_writer()
+
+    def write_row(self, row: list[str]):
+        for values, value in zip(self._columns, row, strict=True):
+            values.append(value)
+        self._buffered += 1
+
+        if self._buffered >= self.batch_size:
+            self.flush()
+
+    def write_batch(self, batch: RowBatch):
+        for values, selected in zip(self._columns, batch.selected_columns(), strict=True):
+            values.extend(selected)
+        self._buffered += len(batch.selection)
+
+        while self._buffered >= self.batch_size:
+            self._write_buffered(self.batch_size)
+
+    def flush(self):
+        if self._buffered:
+            self._write_buffered(self._buffered)
+
+    def _write_buffered(self, size: int):
+        """
+        Write the first rows of the column buffer.
+
+        :param size: Number of rows to write
+        :type size: int
+        """
+        if size == self._buffered:
+            columns, self._columns = self._columns, [[] for _ in self._columns]
+        else:
+            columns = [values[:size] for values in self._columns]
+            self._columns = [values[size:] for values in self._columns]
+        self._buffered -= size
+        self._write_columns(columns)
+
+    def _build_column(self, values: list[str], column: int) -> Any:
+        converter = self._converters[column]
+        return self.pa.array(
+            [converter(value) for value in values], type=self.schema.field(column).type
+        )
+
+    def _record_batch(self, columns: list[list[str]]) -> Any:
+        """
+        Build the typed Arrow columns.
+
+        :param columns: Values of each column
+        :type columns: list[list[str]]
+        :return: Record batch with the rows
+        :rtype: pyarrow.RecordBatch
+        """
+        arrays = [self._build_column(values, column) for column, values in enumerate(columns)]
+        return self.pa.record_batch(arrays, schema=self.schema)
+
+    def _write_columns(self, columns: list[list[str]]):
+        self._writer.write_batch(self._record_batch(columns))
+
+    def _write_batch(self, rows: list[list[str]]):
+        self._write_columns([list(values) for values in zip(*rows, strict=True)])
+
+    def _close(self):
+        if self._writer is None:
+            Path(self.output_path).unlink(missing_ok=True)
+            return
+        self._writer.close()
+
+    @abstractmethod
+    def _new_writer(self) -> Any: ...
+
+
+class ParquetSink(ArrowSink):
+    """Sink that writes the clean rows in a Parquet file, one row group per batch."""
+
+    @property
+    def batch_size(self) -> int:
+        return self.options.row_group_size
+
+    def _new_writer(self) -> Any:
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(
+            self.output_path,
+            self.schema,
+            compression=self.options.compression or "none",
+            use_dictionary=self.options.use_dictionary,
+        )
+
+
+class ArrowIPCSink(ArrowSink):
+    """
+    Sink that writes the clean rows in an Arrow IPC file. The dictionaries of the
+    text columns grow between batches, so they are written as dictionary deltas: each
+    batch only converts the values it adds and appends them to the dictionary built
+    before. The schema is fixed with the first batch, where the text columns with more
+    than DICTIONARY_MAX_RATIO of distinct values, like ids or names, are kept as plain
+    strings, since their dictionary would grow with every row.
+    """
+
+    def __init__(self, output_path: str, config: Configuration, options: SinkOptions):
+        super().__init__(output_path, config, options)
+        self._dictionaries: dict[int, dict[str, int]] = {}
+        self._dictionary_arrays: dict[int, Any] = {}
+
+    def _arrow_type(self, column_type: type) -> Any:
+        if self.options.use_dictionary and column_type is str:
+            return self.pa.dictionary(self.pa.int32(), self.pa.string())
+        return super()._arrow_type(column_type)
+
+    def _open(self, header: list[str]):
+        super()._open(header)
+        # The writer waits for the first batch, which decides the dictionary columns
+        self._writer = None
+
+    def _fix_schema(self, columns: list[list[str]]):
+        """Keep as plain strings the text columns that are mostly distinct values."""
+        length: int = len(columns[0]) if columns else 0
+        if length < DICTIONARY_MIN_ROWS:
+            return
+
+        for column, field in enumerate(self.schema):
+            if not self.pa.types.is_dictionary(field.type):
+                continue
+
+            distinct: int = len(set(columns[column]))
+            if distinct > length * DICTIONARY_MAX_RATIO:
+                self.schema = self.schema.set(column, field.with_type(self.pa.string()))
+
+    def _new_writer(self) -> Any:
+        write_options = self.pa.ipc.IpcWriteOptions(
+            compression=self.options.compression, emit_dictionary_deltas=True
+        )
+        return self.pa.ipc.new_file(self.output_path, self.schema, options=write_options)
+
+    def _build_column(self, values: list[str], column: int) -> Any:
+        if not self.pa.types.is_dictionary(self.schema.field(column).type):
+            return super()._build_column(values, column)
+
+        dictionary = self._dictionaries.setdefault(column, {})
+        indices: list[int] = []
+        added: list[str] = []
+
+        for value in values:
+            index: int | None = dictionary.get(value)
+            if index is None:
+                index = dictionary[value] = len(dictionary)
+                added.append(value)
+            indices.append(index)
+
+        previous = self._dictionary_arrays.get(column)
+        if previous is None or added:
+            new_values = self.pa.array(added, type=self.pa.string())
+            self._dictionary_arrays[column] = (
+                new_values if previous is None else self.pa.concat_arrays([previous, new_values])
+            )
+
+        return self.pa.DictionaryArray.from_arrays(
+            self.pa.array(indices, type=self.pa.int32()), self._dictionary_arrays[column]
+        )
+
+    def _write_columns(self, columns: list[list[str]]):
+        if self._writer is None:
+            self._fix_schema(columns)
+            self._writer = self._new_writer()
+        super()._write_columns(columns)
+
+    def _close(self):
+        if self._writer is None and self.schema is not None:
+            self._writer = self._new_writer()
+        super()._close()
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteSink(BaseSink):
+    """
+    Sink that loads the clean rows in a SQLite table typed with the header_types of the
+    configuration. Each batch is inserted with one executemany inside transactions of
+    transaction_rows rows, into a load table that replaces the table, with its indexes,
+    in one last transaction. A failed run drops the load table and leaves the table as
+    it was. The journal and the syncs are off for a new database; an existing one is
+    loaded in WAL mode, so a crash can't corrupt its other tables.
+
+    :attribute rows: Rows inserted
+    :type rows: int
+    :attribute insert_seconds: Time spent inserting the rows
+    :type insert_seconds: float
+    :attribute index_seconds: Time spent creating the indexes
+    :type index_seconds: float
+    """
+
+    def __init__(self, output_path: str, config: Configuration, options: SinkOptions):
+        super().__init__(output_path, config, options)
+        path = Path(output_path)
+        self._new_database: bool = not path.exists() or not path.stat().st_size
+        self._connection = sqlite3.connect(output_path, isolation_level=None)
+        self._table: str = _quote_identifier(options.table)
+        self._load_table: str = _quote_identifier(f"{options.table}__csvclean_load")
+        self._converters: list[Callable[[str], Any]] = []
+        self._insert: str = ""
+        self._transaction_rows = 0
+        self.rows = 0
+        self.insert_seconds = 0.0
+        self.index_seconds = 0.0
+
+    def _open(self, header: list[str]):
+        types: list[type] = _column_types(self.config, header)
+        self._converters = _column_converters(self.config, types, SQLITE_CONVERTERS)
+        columns: str = ", ".join(
+            f"{_quote_identifier(name)} {SQLITE_TYPES.get(column_type, 'TEXT')}"
+            for name, column_type in zip(header, types, strict=True)
+        )
+
+        if self._new_database:
+            self._connection.execute("PRAGMA journal_mode=OFF")
+            self._connection.execute("PRAGMA synchronous=OFF")
+        else:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        self._connection.execute("BEGIN")
+        self._connection.execute(f"DROP TABLE IF EXISTS {self._load_table}")
+        self._connection.execute(f"CREATE TABLE {self._load_table} ({columns})")
+        self._insert = f"INSERT INTO {self._load_table} VALUES ({', '.join('?' * len(header))})"
+
+    def _write_batch(self, rows: list[list[str]]):
+        start: float = time.perf_counter()
+        self._connection.executemany(
+            self._insert,
+            (
+                [convert(value) for convert, value in zip(self._converters, row, strict=True)]
+                for row in rows
+            ),
+        )
+        self.rows += len(rows)
+        self._transaction_rows += len(rows)
+
+        if self._transaction_rows >= self.options.transaction_rows:
+            self._connection.execute("COMMIT")
+            self._connection.execute("BEGIN")
+            self._transaction_rows = 0
+
+        self.insert_seconds += time.perf_counter() - start
+
+    def _create_indexes(self):
+        """Index the index_columns, given by name or by index, after the load."""
+        for column in self.options.index_columns:
+            if column in self.header:
+                name = column
+            elif column.isdigit() and int(column) < len(self.header):
+                name = self.header[int(column)]
+            else:
+                raise ValueError(f"Index column not found: {column}")
+
+            index: str = _quote_identifier(f"idx_{self.options.table}_{name}")
+            self._connection.execute(
+                f"CREATE INDEX {index} ON {self._table} ({_quote_identifier(name)})"
+            )
+
+    def _replace_table(self):
+        """Replace the table with the load table and index it, in one transaction."""
+        if not self._connection.in_transaction:
+            self._connection.execute("BEGIN")
+
+        self._connection.execute(f"DROP TABLE IF EXISTS {self._table}")
+        self._connection.execute(f"ALTER TABLE {self._load_table} RENAME TO {self._table}")
+
+        start: float = time.perf_counter()
+        self._create_indexes()
+        self.index_seconds = time.perf_counter() - start
+
+        self._connection.execute("COMMIT")
+
+    def _close(self):
+        if self._insert:
+            try:
+                self._replace_table()
+            except BaseException:
+                self.abort()
+                raise
+
+        self._connection.close()
+
+    def abort(self):
+        """
+        Roll back the pending transaction and drop the load table, or delete the
+        database if the sink created it, since it has no journal to roll back.
+        """
+        self._buffer = []
+        try:
+            if not self._new_database:
+                if self._connection.in_transaction:
+                    self._connection.execute("ROLLBACK")
+                if self._insert:
+                    self._connection.execute(f"DROP TABLE IF EXISTS {self._load_table}")
+        finally:
+            self._connection.close()
+
+            if self._new_database:
+                Path(self.output_path).unlink(missing_ok=True)
+
+    def record_metrics(self, reporter: Report):
+        rows_per_second: float = self.rows / self.insert_seconds if self.insert_seconds else 0.0
+        reporter.record_metric("sqlite_rows", self.rows)
+        reporter.record_metric("sqlite_rows_per_second", round(rows_per_second, 1))
+        reporter.record_metric("sqlite_index_seconds", round(self.index_seconds, 4))
+
+
+SINK_FORMATS: dict[str, type[BaseSink]] = {
+    ".csv": CSVSink,
+    ".parquet": ParquetSink,
+    ".arrow": ArrowIPCSink,
+    ".feather": ArrowIPCSink,
+    ".sqlite": SQLiteSink,
+    ".sqlite3": SQLiteSink,
+    ".db": SQLiteSink,
+}
+
+
+def build_sink(output_path: str, config: Configuration, options: SinkOptions) -> BaseSink:
+    """
+    Create the sink of the output format, chosen by the extension of the path.
+
+    :param output_path: Path of the output file
+    :type output_path: str
+    :param config: Configuration of the cleaning
+    :type config: Configuration
+    :param options: Options of the sink
+    :type options: SinkOptions
+    :return: Sink for the output path
+    :rtype: BaseSink
+    :raises ValueError: If the format is not supported, or isn't csv for an s3:// url or
+        an append
+    """
+    suffix: str = Path(output_path).suffix.lower()
+
+    if suffix not in SINK_FORMATS:
+        raise ValueError(f"Not supported output format: {suffix}")
+    if is_s3_url(output_path) and suffix != ".csv":
+        raise ValueError("Only csv outputs can be written to s3:// urls.")
+    if options.append and suffix != ".csv":
+        raise ValueError("Only csv outputs can be appended to.")
+
+    return SINK_FORMATS[suffix](output_path, config, options)
@@ -1,3 +1,19 @@
-from .cleaner import LineOrchestrator, NullCleaner, TypeCleaner
+from .cleaner import (
+    DateCleaner,
+    LineOrchestrator,
+    NullCleaner,
+    OutlierCleaner,
+    ReferenceCleaner,
+    RuleCleaner,
+    TypeCleaner,
+)
 
-__all__ = ["LineOrchestrator", "NullCleaner", "TypeCleaner"]
+__all__ = [
+    "DateCleaner",
+    "LineOrchestrator",
+    "NullCleaner",
+    "OutlierCleaner",
+    "ReferenceCleaner",
+    "RuleCleaner",
+    "TypeCleaner",
+]
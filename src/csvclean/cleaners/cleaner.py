@@ -2,7 +2,10 @@ from abc import ABC, abstractmethod
 from typing import Any
 
 from csvclean.models.data_register import ErrorTypes, LineError
+from csvclean.models.row_batch import RowBatch
 from csvclean.validators.data_validator import DataValidator
+from csvclean.validators.dates import DateFormat, column_date_format
+from csvclean.validators.memo import MemoCache
 
 
 class Cleaner(ABC):
@@ -54,6 +57,132 @@ class TypeCleaner(Cleaner):
         return row, errors
 
 
+class RuleCleaner(Cleaner):
+    """Cleaner specialized in handling the errors of the config rules."""
+
+    def clean(self, row: list[str], errors: LineError) -> tuple[list[str], LineError]:
+        """
+        Validates if the row breaks any rule of the config.
+
+        Args:
+            row (List[str]): The input data row as a list of strings.
+            errors (LineError): Dictionary mapping column indices to ErrorTypes.
+
+        Returns:
+            Tuple[List[str], LineError]: An empty list and the errors if a RULE
+                error is found; otherwise, the original row and errors.
+        """
+        row = DataValidator.require_row(row)
+        errors = DataValidator.require_line_error(errors)
+        if ErrorTypes.RULE in errors.values():
+            return [], errors
+        return row, errors
+
+
+class ReferenceCleaner(Cleaner):
+    """Cleaner specialized in handling values missing in the reference lists."""
+
+    def clean(self, row: list[str], errors: LineError) -> tuple[list[str], LineError]:
+        """
+        Validates if the row contains any value missing in its reference list.
+
+        Args:
+            row (List[str]): The input data row as a list of strings.
+            errors (LineError): Dictionary mapping column indices to ErrorTypes.
+
+        Returns:
+            Tuple[List[str], LineError]: An empty list and the errors if a REFERENCE
+                error is found; otherwise, the original row and errors.
+        """
+        row = DataValidator.require_row(row)
+        errors = DataValidator.require_line_error(errors)
+        if ErrorTypes.REFERENCE in errors.values():
+            return [], errors
+        return row, errors
+
+
+class OutlierCleaner(Cleaner):
+    """Cleaner specialized in handling the outliers of the numeric columns."""
+
+    def clean(self, row: list[str], errors: LineError) -> tuple[list[str], LineError]:
+        """
+        Validates if the row contains any outlier of its column.
+
+        Args:
+            row (List[str]): The input data row as a list of strings.
+            errors (LineError): Dictionary mapping column indices to ErrorTypes.
+
+        Returns:
+            Tuple[List[str], LineError]: An empty list and the errors if an OUTLIER
+                error is found; otherwise, the original row and errors.
+        """
+        row = DataValidator.require_row(row)
+        errors = DataValidator.require_line_error(errors)
+        if ErrorTypes.OUTLIER in errors.values():
+            return [], errors
+        return row, errors
+
+
+class DateCleaner(Cleaner):
+    """Cleaner that writes the values of the date and datetime columns in ISO 8601."""
+
+    def __init__(self, config: Any):
+        """
+        Compiles the format of each date and datetime column of the configuration.
+
+        Args:
+            config (Configuration): Configuration with the types and the date formats.
+        """
+        self.normalizers: dict[int, MemoCache] = {}
+
+        for column_number in range(len(getattr(config, "header_types", []))):
+            date_format: DateFormat | None = column_date_format(config, column_number)
+            if date_format is not None:
+                self.normalizers[column_number] = MemoCache(date_format.to_iso)
+
+    def clean(self, row: list[str], errors: LineError) -> tuple[list[str], LineError]:
+        """
+        Normalizes the dates of the row.
+
+        Args:
+            row (List[str]): The input data row as a list of strings.
+            errors (LineError): Dictionary mapping column indices to ErrorTypes.
+
+        Returns:
+            Tuple[List[str], LineError]: The row with its dates in ISO 8601 and the
+                errors. The values that are not valid dates are kept as they are.
+        """
+        row = DataValidator.require_row(row)
+        errors = DataValidator.require_line_error(errors)
+        for column_number, normalize in self.normalizers.items():
+            if column_number < len(row):
+                row[column_number] = normalize(row[column_number])
+        return row, errors
+
+    def clean_batch(self, batch: RowBatch):
+        """
+        Normalizes the dates of the columns of a batch, in place.
+
+        Args:
+            batch (RowBatch): The batch, stored by columns.
+        """
+        for column_number, normalize in self.normalizers.items():
+            if column_number < batch.width:
+                batch.columns[column_number] = [
+                    normalize(value) for value in batch.columns[column_number]
+                ]
+
+
+# Error type rejected by the cleaner of each toggle of LineOrchestrator.
+REJECTED_ERRORS: dict[str, ErrorTypes] = {
+    "use_null": ErrorTypes.NULL,
+    "use_type": ErrorTypes.TYPE,
+    "use_rules": ErrorTypes.RULE,
+    "use_references": ErrorTypes.REFERENCE,
+    "use_outliers": ErrorTypes.OUTLIER,
+}
+
+
 class LineOrchestrator:
     """
     Orchestrates the cleaning process by executing multiple cleaners
@@ -72,9 +201,20 @@ class LineOrchestrator:
         self.config = {
             "use_null": getattr(config, "trate_nullerror", False),
             "use_type": getattr(config, "trate_typeerror", False),
+            "use_rules": bool(getattr(config, "rules", [])),
+            "use_references": bool(getattr(config, "references", [])),
+            "use_outliers": getattr(config, "trate_outliererror", False),
+            "normalize_dates": getattr(config, "normalize_dates", False),
+        }
+        self.rejected_errors = {
+            error for toggle, error in REJECTED_ERRORS.items() if self.config[toggle]
         }
         self.null_cleaner = NullCleaner()
         self.type_cleaner = TypeCleaner()
+        self.rule_cleaner = RuleCleaner()
+        self.reference_cleaner = ReferenceCleaner()
+        self.outlier_cleaner = OutlierCleaner()
+        self.date_cleaner = DateCleaner(config)
         # self.duplicate_cleaner = DuplicateCleaner()  # noqa: ERA001
 
     def process(self, row: list[str], errors: LineError) -> tuple[list[str], LineError]:
@@ -102,8 +242,50 @@ class LineOrchestrator:
         if current_row and self.config.get("use_type", False):
             current_row, _ = self.type_cleaner.clean(current_row, errors)
 
-        # # 3. Duplicate Cleaning (only if row is still valid)
+        # 3. Rule Cleaning (only if row is still valid)
+        if current_row and self.config.get("use_rules", False):
+            current_row, _ = self.rule_cleaner.clean(current_row, errors)
+
+        # 4. Reference Cleaning (only if row is still valid)
+        if current_row and self.config.get("use_references", False):
+            current_row, _ = self.reference_cleaner.clean(current_row, errors)
+
+        # 5. Outlier Cleaning (only if row is still valid)
+        if current_row and self.config.get("use_outliers", False):
+            current_row, _ = self.outlier_cleaner.clean(current_row, errors)
+
+        # 6. Date Normalization (only if row is still valid)
+        if current_row and self.config.get("normalize_dates", False):
+            current_row, _ = self.date_cleaner.clean(current_row, errors)
+
+        # # 7. Duplicate Cleaning (only if row is still valid)
         # if current_row and self.config.get("use_duplicate", False):
         #     current_row, _ = self.duplicate_cleaner.clean(current_row, errors)  # noqa: ERA001
 
         return current_row, errors
+
+    def process_batch(self, batch: RowBatch) -> RowBatch:
+        """
+        Runs the enabled cleaners on a whole batch at once.
+
+        The rows are not copied: a row with an error rejected by an enabled
+        cleaner is removed from the selection vector of the batch, as process
+        would return an empty list for it. The date columns are replaced by
+        their normalized values if the dates are normalized.
+
+        Args:
+            batch (RowBatch): The batch, with the errors found by the validators.
+
+        Returns:
+            RowBatch: The same batch, with the rejected rows out of its selection.
+        """
+        batch.drop(
+            index
+            for index, errors in batch.errors.items()
+            if not self.rejected_errors.isdisjoint(errors.values())
+        )
+
+        if self.config.get("normalize_dates", False):
+            self.date_cleaner.clean_batch(batch)
+
+        return batch
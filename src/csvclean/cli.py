@@ -1,55 +1,849 @@
+import sqlite3
+import sys
+import time
 from collections.abc import Generator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import ExitStack, closing
+from pathlib import Path
 
-from csvclean.models.config import Configuration
+from csvclean.models.config import Configuration, FieldSpec
 
 from .cleaners import LineOrchestrator
-from .IO_layer import CSVIOlayer
-from .models import LineError
-from .reporters import Report
+from .IO_layer import (
+    BaseSink,
+    CompiledConfiguration,
+    ConfigCache,
+    CSVIOlayer,
+    ExternalSortSink,
+    PartitionedSink,
+    QuarantineSink,
+    build_sink,
+)
+from .IO_layer.encoding import PASSTHROUGH_ENCODING, is_ascii_compatible
+from .IO_layer.follow import DirectoryWatcher, FollowState
+from .IO_layer.manifest import ManifestBuilder, verify_manifest
+from .IO_layer.object_store import input_size, is_s3_url
+from .IO_layer.readers import is_csv_input
+from .memory import MemoryGovernor
+from .models import BranchOptions, ProcessOptions, SinkOptions
+from .parallel import ParallelCleaner, positioned_batches
+from .pipeline import CleaningBranch
+from .reporters import ProgressTracker, Report
+from .reporters.estimate import SampleEstimate
+from .reporters.profiler import DataProfiler
 from .validators import ValidatorManager
+from .validators.rule_validator import compile_rules
+from .validators.rules import has_stateful_rules, has_text_rules
+from .validators.structure_validator import StructureValidator
 
 
-def base_process(csv_path: str, outputpath: str, do_report: bool):
+def _load_configuration(io_layer: CSVIOlayer, options: ProcessOptions) -> CompiledConfiguration:
     """
-    Base Process to organize all classes of CSV Cleanner
+    Parse and compile the config, through the config cache if it is enabled.
+
+    :param io_layer: IO layer of the run
+    :type io_layer: CSVIOlayer
+    :param options: Options of the run
+    :type options: ProcessOptions
+    :return: Configuration and its compiled tables
+    :rtype: CompiledConfiguration
+    """
+    if not options.config_cache:
+        config: Configuration = io_layer.parse_config(options.config_path)
+        return CompiledConfiguration(config, compile_rules(config), options.reference_index_dir)
+
+    compiled = ConfigCache(options.config_cache_dir).load(io_layer, options.config_path)
+    compiled.reference_index_dir = options.reference_index_dir
+    return compiled
+
+
+def _input_encoding(io_layer: CSVIOlayer, csv_path: str, options: ProcessOptions) -> str:
+    """Encoding of the input file, detected if not given; database inputs have none."""
+    if options.query is not None:
+        return "utf-8"
+    return options.input_encoding or io_layer.detect_encoding(csv_path)
+
+
+def _read_records(
+    io_layer: CSVIOlayer,
+    input_path: str,
+    input_encoding: str,
+    layout: list[FieldSpec] | None,
+    options: ProcessOptions,
+) -> Generator:
+    """
+    Header and rows of the input of the run, a file or the result of the query of the
+    options over the SQLite database in input_path, opened read-only.
+
+    :param io_layer: IO layer of the reader
+    :type io_layer: CSVIOlayer
+    :param input_path: path of the input file or database
+    :type input_path: str
+    :param input_encoding: Encoding of the input file
+    :type input_encoding: str
+    :param layout: Columns of the fixed-width inputs, from the config
+    :type layout: list[FieldSpec] | None
+    :param options: Options of the run
+    :type options: ProcessOptions
+    :return: Generator with the header and the rows
+    :rtype: Generator
+    """
+    if options.query is None:
+        yield from io_layer.read_input(input_path, input_encoding, layout)
+        return
+
+    if not Path(input_path).is_file():
+        raise FileNotFoundError(f"The {input_path} doesn't exists.")
 
+    uri: str = f"{Path(input_path).resolve().as_uri()}?mode=ro"
+
+    with closing(sqlite3.connect(uri, uri=True)) as connection:
+        yield from io_layer.read_query(connection, options.query.sql, options.query.fetch_size)
+
+
+def _is_byte_safe(output_path: str | None, config: Configuration, options: ProcessOptions) -> bool:
+    """
+    Check if a branch gives the same result on the raw bytes of its input: its output
+    is a plain csv, which keeps the bytes, and none of its checks depends on the
+    characters of the values, like the reference lists or the regex, enum and length
+    rules.
+
+    :param output_path: Path of the output of the branch
+    :type output_path: str | None
+    :param config: Configuration of the branch
+    :type config: Configuration
+    :param options: Options of the run
+    :type options: ProcessOptions
+    :return: True if the branch can run on passthrough
+    :rtype: bool
+    """
+    return (
+        output_path is not None
+        and options.partition is None
+        and Path(output_path).suffix.lower() == ".csv"
+        and not config.references
+        and not has_text_rules(config)
+    )
+
+
+def _resolve_encodings(
+    io_layer: CSVIOlayer, csv_path: str, options: ProcessOptions, byte_safe: bool
+) -> tuple[str, SinkOptions]:
+    """
+    Choose the encoding to read the input and the sink options to write the output.
+    On passthrough, ascii compatible inputs are read and written byte by byte, when
+    the branches of the run are byte safe; the other runs are transcoded.
+
+    :param io_layer: IO layer of the run
+    :type io_layer: CSVIOlayer
     :param csv_path: path of the csv to clean
     :type csv_path: str
-    :param outputpath: path to save the new clean csv
+    :param options: Options of the run
+    :type options: ProcessOptions
+    :param byte_safe: True if every branch gives the same result on the raw bytes
+    :type byte_safe: bool
+    :return: Input encoding and sink options
+    :rtype: tuple[str, SinkOptions]
+    """
+    input_encoding: str = _input_encoding(io_layer, csv_path, options)
+    passthrough: bool = options.passthrough and byte_safe and options.query is None
+
+    if passthrough and is_ascii_compatible(input_encoding):
+        return PASSTHROUGH_ENCODING, options.sink.model_copy(
+            update={"encoding": PASSTHROUGH_ENCODING}
+        )
+
+    return input_encoding, options.sink
+
+
+def _build_branch(
+    outputpath: str,
+    compiled: CompiledConfiguration,
+    sink_options: SinkOptions,
+    options: ProcessOptions,
+    governor: MemoryGovernor | None,
+) -> CleaningBranch:
+    """
+    Create the cleaning branch with the sinks asked in the options, and its report.
+
+    :param outputpath: path to save the new clean data
+    :type outputpath: str
+    :param compiled: Configuration and its compiled tables
+    :type compiled: CompiledConfiguration
+    :param sink_options: Options of the sinks
+    :type sink_options: SinkOptions
+    :param options: Options of the run
+    :type options: ProcessOptions
+    :param governor: Memory governor of the run, if any
+    :type governor: MemoryGovernor | None
+    :return: Cleaning branch
+    :rtype: CleaningBranch
+    """
+    reporter = Report()
+    sink: BaseSink
+
+    if options.partition is not None:
+        sink = PartitionedSink(outputpath, compiled.config, sink_options, options.partition)
+    else:
+        sink = build_sink(outputpath, compiled.config, sink_options)
+
+    manifest: ManifestBuilder | None = None
+
+    if options.manifest_path is not None:
+        manifest = ManifestBuilder(options.manifest_chunk_size)
+        sink = manifest.wrap(sink)
+
+    if options.sort is not None:
+        sink = ExternalSortSink(sink, compiled.config, options.sort, reporter, governor)
+
+        if manifest is not None:
+            sink.on_drop = manifest.dropped.add
+
+    quarantine: QuarantineSink | None = None
+
+    if options.quarantine_path is not None:
+        quarantine = QuarantineSink(options.quarantine_path, compiled.config, sink_options)
+
+    return CleaningBranch(compiled, sink, reporter, quarantine, manifest)
+
+
+def _clean_sequential(
+    csv_reader_generator: Generator,
+    io_layer: CSVIOlayer,
+    branch: CleaningBranch,
+    batch_size: int | MemoryGovernor,
+    tracker: ProgressTracker | None,
+):
+    """
+    Clean the rows of the reader in this thread, in chunks stored by columns.
+
+    :param csv_reader_generator: Reader, after the header
+    :type csv_reader_generator: Generator
+    :param io_layer: IO layer of the reader
+    :type io_layer: CSVIOlayer
+    :param branch: Cleaning branch of the run
+    :type branch: CleaningBranch
+    :param batch_size: Rows per chunk, or memory governor that sizes the chunks
+    :type batch_size: int | MemoryGovernor
+    :param tracker: Progress of the run, if any
+    :type tracker: ProgressTracker | None
+    """
+    batches = positioned_batches(csv_reader_generator, lambda: io_layer.position, batch_size)
+
+    for batch in batches:
+        rows: list[list[str]] = [row for row, _ in batch]
+        written: int = branch.process_batch(rows, [position for _, position in batch])
+
+        if tracker is not None:
+            tracker.count_many(written, len(rows) - written)
+
+
+def _is_stateful(config: Configuration) -> bool:
+    """Check if the validation of a row depends on the previous rows."""
+    return has_stateful_rules(config) or bool(config.outliers)
+
+
+def _fit_outliers(
+    csv_path: str,
+    input_encoding: str,
+    config: Configuration,
+    validator: ValidatorManager,
+    options: ProcessOptions,
+):
+    """
+    First pass over the input for the outlier detectors that need the whole column.
+
+    :param csv_path: path of the input to clean
+    :type csv_path: str
+    :param input_encoding: Encoding of the input
+    :type input_encoding: str
+    :param config: Configuration of the run
+    :type config: Configuration
+    :param validator: Validators of the cleaning branch
+    :type validator: ValidatorManager
+    :param options: Options of the run
+    :type options: ProcessOptions
+    """
+    records: Generator = _read_records(
+        CSVIOlayer(output_path=None, s3=options.s3),
+        csv_path,
+        input_encoding,
+        config.layout,
+        options,
+    )
+    structure = StructureValidator()
+    _, header = next(records)
+    structure.check_header(header, config)
+
+    validator.outlier_validator.fit(
+        (
+            structure.remap(csv_row)
+            for _, csv_row in records
+            if not structure.validate_line(csv_row, config)
+        ),
+        config,
+    )
+
+
+def _checked_records(
+    csv_reader_generator: Generator,
+    io_layer: CSVIOlayer,
+    branch: CleaningBranch,
+    tracker: ProgressTracker | None,
+) -> Generator:
+    """Records of the reader that pass the structural stage of the branch."""
+    for record, csv_row in csv_reader_generator:
+        checked_row: list[str] | None = branch.check_structure(csv_row, io_layer.position)
+
+        if checked_row is not None:
+            yield record, checked_row
+        elif tracker is not None:
+            tracker.count(False)
+
+
+def _clean_parallel(
+    csv_reader_generator: Generator,
+    io_layer: CSVIOlayer,
+    branch: CleaningBranch,
+    pool: ParallelCleaner,
+    tracker: ProgressTracker | None,
+):
+    """
+    Clean batches of rows of the reader in a pool of workers, writing them in order.
+    The structural stage runs in this thread, so the malformed rows never reach the
+    workers. The report of each batch is merged into the report of the branch.
+
+    :param csv_reader_generator: Reader, after the header
+    :type csv_reader_generator: Generator
+    :param io_layer: IO layer of the reader
+    :type io_layer: CSVIOlayer
+    :param branch: Cleaning branch of the run
+    :type branch: CleaningBranch
+    :param pool: Pool of workers, with the memory governor of the run if any
+    :type pool: ParallelCleaner
+    :param tracker: Progress of the run, if any
+    :type tracker: ProgressTracker | None
+    """
+    batches = positioned_batches(
+        _checked_records(csv_reader_generator, io_layer, branch, tracker),
+        lambda: io_layer.position,
+        pool.governor or pool.options.batch_size,
+    )
+
+    for batch, (cleaned, batch_report) in pool.map(batches):
+        branch.reporter.merge(batch_report)
+
+        for (csv_row, position), (row_clean, data_errors) in zip(batch, cleaned, strict=True):
+            written: bool = branch.route(csv_row, row_clean, data_errors, position)
+
+            if tracker is not None:
+                tracker.count(written)
+
+
+def _memory_governor(options: ProcessOptions, batch_size: int) -> MemoryGovernor | None:
+    """Memory governor of the budget of the options, None without a budget."""
+    if options.memory is None:
+        return None
+    return MemoryGovernor(options.memory, batch_size)
+
+
+def _check_manifest_output(outputpath: str, options: ProcessOptions):
+    """Reject a manifest for an output that verify can't read, a partitioned or not csv one."""
+    if options.manifest_path is not None and (
+        options.partition is not None or Path(outputpath).suffix.lower() != ".csv"
+    ):
+        raise ValueError("Only csv outputs without partitions can have a manifest.")
+
+
+def base_process(
+    csv_path: str, outputpath: str, do_report: bool, options: ProcessOptions | None = None
+):
+    """
+    Base Process to organize all classes of CSV Cleanner
+
+    :param csv_path: path of the input to clean (csv, fixed-width or json lines), or of
+        the SQLite database of the query of the options
+    :type csv_path: str
+    :param outputpath: path to save the new clean data (csv, parquet or arrow), or directory
+        of the files of a partitioned output
     :type outputpath: str
     :param do_report: Boolean to decide if a report is desired
     :type do_report: bool
+    :param options: Options of the run, the default ones if None
+    :type options: ProcessOptions | None
+    :raises ValueError: If a manifest is asked for an output that can't be verified, a
+        partitioned or not csv one
     """
+    options = options or ProcessOptions()
 
-    io_layer = CSVIOlayer(output_path=outputpath)
-    configurate: Configuration = io_layer.parse_config("tests\\fixtures\\config.txt")
-    csv_reader_generator: Generator = io_layer.read_csv(csv_path)
+    _check_manifest_output(outputpath, options)
 
-    cleanner = LineOrchestrator(configurate)
+    # The directory of a partitioned output is created by its sink.
+    io_layer = CSVIOlayer(
+        output_path=outputpath if options.partition is None else None, s3=options.s3
+    )
+    compiled: CompiledConfiguration = _load_configuration(io_layer, options)
+    input_encoding, sink_options = _resolve_encodings(
+        io_layer, csv_path, options, _is_byte_safe(outputpath, compiled.config, options)
+    )
+    csv_reader_generator: Generator = _read_records(
+        io_layer, csv_path, input_encoding, compiled.config.layout, options
+    )
 
-    reporter = Report()
+    governor: MemoryGovernor | None = _memory_governor(
+        options, (options.parallel or sink_options).batch_size
+    )
+    tracker: ProgressTracker | None = None
+
+    if options.progress is not None:
+        tracker = ProgressTracker(
+            input_size(csv_path, options.s3), lambda: io_layer.bytes_read, options.progress
+        )
+        tracker.memory_usage = governor.usage if governor is not None else None
+
+    with _build_branch(outputpath, compiled, sink_options, options, governor) as branch:
+        _, header = next(csv_reader_generator)
+        branch.start(header)
+
+        if branch.validator.outlier_validator.needs_fit(compiled.config):
+            _fit_outliers(csv_path, input_encoding, compiled.config, branch.validator, options)
+
+        if options.parallel is not None and not _is_stateful(compiled.config):
+            with ParallelCleaner(compiled, options.parallel, governor) as pool:
+                _clean_parallel(csv_reader_generator, io_layer, branch, pool, tracker)
+        else:
+            _clean_sequential(
+                csv_reader_generator, io_layer, branch, governor or sink_options.batch_size, tracker
+            )
+
+    reporter: Report = branch.reporter
+
+    if governor is not None:
+        governor.record_metrics(reporter)
+
+    if branch.manifest is not None and options.manifest_path is not None:
+        branch.manifest.write(
+            options.manifest_path, options.config_path, csv_path, outputpath, sink_options.encoding
+        )
+
+    if tracker is not None:
+        tracker.finish(reporter)
+
+    if do_report:
+        reporter.do_report()
+
+
+def _branch_options(spec: BranchOptions, options: ProcessOptions) -> ProcessOptions:
+    """Options of one branch of a fan-out run: the ones of the run with its config."""
+    return options.model_copy(
+        update={
+            "config_path": spec.config_path,
+            "quarantine_path": spec.quarantine_path,
+            "manifest_path": None,
+        }
+    )
+
+
+def _fanout_branch(
+    spec: BranchOptions,
+    compiled: CompiledConfiguration,
+    sink_options: SinkOptions,
+    options: ProcessOptions,
+    governor: MemoryGovernor | None,
+) -> CleaningBranch:
+    """
+    Create the cleaning branch of one configuration of a fan-out run. The options of
+    the run are shared by the branches, except the config and the quarantine.
+
+    :param spec: Configuration and outputs of the branch
+    :type spec: BranchOptions
+    :param compiled: Configuration of the branch
+    :type compiled: CompiledConfiguration
+    :param sink_options: Options of the sinks
+    :type sink_options: SinkOptions
+    :param options: Options of the branch
+    :type options: ProcessOptions
+    :param governor: Memory governor shared by the branches, if any
+    :type governor: MemoryGovernor | None
+    :return: Cleaning branch, with its own report
+    :rtype: CleaningBranch
+    """
+    # Check and truncate the output, as base_process does.
+    CSVIOlayer(output_path=spec.output_path if options.partition is None else None)
+
+    return _build_branch(spec.output_path, compiled, sink_options, options, governor)
+
+
+def _fanout_rows(
+    csv_reader_generator: Generator,
+    io_layer: CSVIOlayer,
+    branches: list[CleaningBranch],
+    profiler: DataProfiler | None,
+    batch_size: int | MemoryGovernor,
+):
+    """Feed each chunk of rows of the reader to every branch and to the profiler."""
+    batches = positioned_batches(csv_reader_generator, lambda: io_layer.position, batch_size)
+
+    for batch in batches:
+        rows: list[list[str]] = [row for row, _ in batch]
+        positions: list[tuple[int, int]] = [position for _, position in batch]
+
+        for branch in branches:
+            branch.process_batch(rows, positions)
+
+        if profiler is not None:
+            for row in rows:
+                profiler.add_row(row)
+
+
+def fanout_process(
+    csv_path: str,
+    branches: list[BranchOptions],
+    profile_path: str | None = None,
+    options: ProcessOptions | None = None,
+) -> list[Report]:
+    """
+    Clean an input with several configurations in one pass. The input is read and
+    parsed once and each chunk of rows is fed to the cleaning branch of every
+    configuration, each one with its own output, quarantine and report, and to the
+    profiler if a profile is asked. Fixed-width inputs are cut with the layout of the
+    first branch.
+
+    :param csv_path: path of the input to clean
+    :type csv_path: str
+    :param branches: Configuration and outputs of each branch
+    :type branches: list[BranchOptions]
+    :param profile_path: path of the json profile of the input, none if None
+    :type profile_path: str | None
+    :param options: Options shared by the branches, the default ones if None
+    :type options: ProcessOptions | None
+    :return: Report of each branch
+    :rtype: list[Report]
+    :raises ValueError: If there is no branch and no profile
+    """
+    options = options or ProcessOptions()
+
+    if not branches and profile_path is None:
+        raise ValueError("A fan-out run needs a branch or a profile.")
+
+    io_layer = CSVIOlayer(output_path=None, s3=options.s3)
+    branch_options: list[ProcessOptions] = [_branch_options(spec, options) for spec in branches]
+    compiled: list[CompiledConfiguration] = [
+        _load_configuration(io_layer, branch) for branch in branch_options
+    ]
+    # The profile counts the characters of the values, so it needs them decoded.
+    byte_safe: bool = profile_path is None and all(
+        _is_byte_safe(spec.output_path, branch.config, options)
+        for spec, branch in zip(branches, compiled, strict=True)
+    )
+    input_encoding, sink_options = _resolve_encodings(io_layer, csv_path, options, byte_safe)
+    governor: MemoryGovernor | None = _memory_governor(options, sink_options.batch_size)
+
+    with ExitStack() as stack:
+        cleaning: list[CleaningBranch] = [
+            stack.enter_context(_fanout_branch(spec, config, sink_options, branch, governor))
+            for spec, config, branch in zip(branches, compiled, branch_options, strict=True)
+        ]
+        csv_reader_generator: Generator = _read_records(
+            io_layer,
+            csv_path,
+            input_encoding,
+            cleaning[0].config.layout if cleaning else None,
+            options,
+        )
+        _, header = next(csv_reader_generator)
+        profiler: DataProfiler | None = DataProfiler(header) if profile_path else None
+
+        for branch in cleaning:
+            branch.start(header)
+
+            if branch.validator.outlier_validator.needs_fit(branch.config):
+                _fit_outliers(csv_path, input_encoding, branch.config, branch.validator, options)
+
+        _fanout_rows(
+            csv_reader_generator, io_layer, cleaning, profiler, governor or sink_options.batch_size
+        )
+
+    if profiler is not None and profile_path is not None:
+        profiler.write(profile_path)
+
+    for spec, branch in zip(branches, cleaning, strict=True):
+        if governor is not None:
+            governor.record_metrics(branch.reporter)
 
-    validator = ValidatorManager()
+        if spec.report_path is not None:
+            branch.reporter.do_report(spec.report_path)
 
-    while True:
-        try:
-            type, csv_row = next(csv_reader_generator)
+    return [branch.reporter for branch in cleaning]
 
-            if type != "__header__":
-                errors_detected: LineError = validator.validate(data=csv_row, config=configurate)
 
-                csv_row_clean, data_errors = cleanner.process(csv_row, errors_detected)
+def _follow_rows(
+    records: Generator,
+    io_layer: CSVIOlayer,
+    branch: CleaningBranch,
+    batch_size: int,
+    state: FollowState,
+):
+    """
+    Clean the rows of a followed csv in chunks. A chunk is also cleaned when the reader
+    catches up with the file, and then the outputs are flushed and the position of the
+    next record is saved, so the rows reach the outputs one poll after they arrive.
+    """
+    rows: list[list[str]] = []
+    positions: list[tuple[int, int]] = []
+
+    for kind, csv_row in records:
+        if kind == "__row__":
+            rows.append(csv_row)
+            positions.append(io_layer.position)
+
+        if rows and (kind == "__idle__" or len(rows) >= batch_size):
+            branch.process_batch(rows, positions)
+            rows, positions = [], []
+
+        if kind == "__idle__":
+            branch.commit()
+            state.save(io_layer.position)
+
 
-                if do_report:
-                    reporter.count_errors(data_errors)
+def follow_process(
+    csv_path: str, outputpath: str, do_report: bool = False, options: ProcessOptions | None = None
+) -> Report:
+    """
+    Clean a csv that keeps growing, like a log: the file is kept open and the records
+    appended to it are cleaned as they arrive, until the idle timeout of the follow
+    options passes without new records. With a state path in the follow options, the
+    position of the next record is saved after each poll, and a restart goes on from
+    there, appending to the outputs. The rows cleaned after the last saved position
+    are cleaned again after a crash.
 
-            else:
-                csv_row_clean = csv_row
+    :param csv_path: path of the csv to follow, local and ascii compatible
+    :type csv_path: str
+    :param outputpath: path of the csv with the clean data
+    :type outputpath: str
+    :param do_report: Boolean to decide if a report is desired
+    :type do_report: bool
+    :param options: Options of the run, the default ones if None
+    :type options: ProcessOptions | None
+    :return: Report of the run
+    :rtype: Report
+    :raises ValueError: If the output is not a local csv, that a restart can append to,
+        or if the options need the whole input: a sort, partitions, a manifest or iqr
+        outliers, or read a query
+    """
+    options = options or ProcessOptions()
 
-            if csv_row_clean != []:
-                io_layer.write(outputpath, csv_row_clean)
+    if Path(outputpath).suffix.lower() != ".csv" or is_s3_url(outputpath):
+        raise ValueError("A followed csv can only be cleaned into a local csv output.")
 
-        except StopIteration:
-            if do_report:
-                reporter.do_report()
-            break
+    if options.sort or options.partition or options.manifest_path or options.query:
+        raise ValueError("A followed csv can't be sorted, partitioned, queried or have a manifest.")
+
+    state = FollowState(options.follow.state_path, csv_path)
+    start: tuple[int, int] | None = state.load()
+
+    # A new run truncates the output, a restart appends to it.
+    io_layer = CSVIOlayer(output_path=outputpath if start is None else None)
+    compiled: CompiledConfiguration = _load_configuration(io_layer, options)
+
+    if any(spec.method == "iqr" for spec in compiled.config.outliers):
+        raise ValueError("The iqr outliers need the whole input, use zscore or mad instead.")
+
+    input_encoding, sink_options = _resolve_encodings(
+        io_layer, csv_path, options, _is_byte_safe(outputpath, compiled.config, options)
+    )
+    sink_options = sink_options.model_copy(update={"append": start is not None})
+    records: Generator = io_layer.follow_csv(csv_path, options.follow, input_encoding, start)
+
+    with _build_branch(outputpath, compiled, sink_options, options, None) as branch:
+        _, header = next(records)
+        branch.start(header)
+        _follow_rows(records, io_layer, branch, sink_options.batch_size, state)
+
+    if do_report:
+        branch.reporter.do_report()
+
+    return branch.reporter
+
+
+def _finish_cleaned(
+    running: dict[Future[None], Path], done: set[Future[None]], watcher: DirectoryWatcher
+) -> list[str]:
+    """
+    Save the files cleaned by the workers in the state of the watcher. The files that
+    failed are written to stderr and left out of the state, to be cleaned on a restart.
+    """
+    cleaned: list[str] = []
+
+    for future in done:
+        path: Path = running.pop(future)
+        error: BaseException | None = future.exception()
+
+        if error is not None:
+            sys.stderr.write(f"[csvclean] {path} couldn't be cleaned: {error}\n")
+            continue
+
+        watcher.done(path)
+        cleaned.append(str(path))
+
+    return cleaned
+
+
+def watch_process(
+    watch_dir: str, output_dir: str, options: ProcessOptions | None = None
+) -> list[str]:
+    """
+    Clean the files that land in a directory. The directory is polled every poll
+    interval of the follow options, and each new file whose name matches the pattern
+    is cleaned, once its size stops changing, by a pool of worker processes with
+    base_process, into a csv of the same name in output_dir. With a state path the
+    cleaned files are saved, so a restart skips them. The run ends when the idle
+    timeout passes with no file being cleaned or written.
+
+    :param watch_dir: Directory where the files land
+    :type watch_dir: str
+    :param output_dir: Directory of the clean csvs
+    :type output_dir: str
+    :param options: Options of the runs of the files, the default ones if None
+    :type options: ProcessOptions | None
+    :return: Paths of the cleaned files, in the order they were finished
+    :rtype: list[str]
+    """
+    options = options or ProcessOptions()
+    follow = options.follow
+    watcher = DirectoryWatcher(watch_dir, follow.pattern, follow.state_path)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    # The side outputs of a run have one path, so they are not written for each file.
+    file_options = options.model_copy(update={"quarantine_path": None, "manifest_path": None})
+    running: dict[Future[None], Path] = {}
+    cleaned: list[str] = []
+    idle_since: float = time.monotonic()
+
+    with ProcessPoolExecutor(follow.workers) as pool:
+        while follow.idle_timeout is None or time.monotonic() - idle_since < follow.idle_timeout:
+            for path in watcher.poll():
+                output_path = str(Path(output_dir) / f"{path.stem}.csv")
+                future = pool.submit(base_process, str(path), output_path, False, file_options)
+                running[future] = path
+
+            if running or watcher.waiting:
+                idle_since = time.monotonic()
+
+            done, _ = wait(running, timeout=follow.poll_interval, return_when=FIRST_COMPLETED)
+            cleaned += _finish_cleaned(running, done, watcher)
+
+            if not running:
+                time.sleep(follow.poll_interval)
+
+    return cleaned
+
+
+def profile_process(csv_path: str, profile_path: str, options: ProcessOptions | None = None):
+    """
+    Profile the columns of an input in one streaming pass and save the profile as json.
+    The config is only read for the layout of the fixed-width and json lines inputs.
+
+    :param csv_path: path of the csv to profile
+    :type csv_path: str
+    :param profile_path: path of the json profile
+    :type profile_path: str
+    :param options: Options of the run (input encoding), the default ones if None
+    :type options: ProcessOptions | None
+    """
+    options = options or ProcessOptions()
+
+    io_layer = CSVIOlayer(output_path=None, s3=options.s3)
+    input_encoding: str = _input_encoding(io_layer, csv_path, options)
+    # Only the inputs read by a reader of their own need the layout of the config.
+    layout: list[FieldSpec] | None = (
+        _load_configuration(io_layer, options).config.layout
+        if options.query is None and not is_csv_input(csv_path)
+        else None
+    )
+    csv_reader_generator: Generator = _read_records(
+        io_layer, csv_path, input_encoding, layout, options
+    )
+
+    _, header = next(csv_reader_generator)
+    profiler = DataProfiler(header)
+
+    for _, csv_row in csv_reader_generator:
+        profiler.add_row(csv_row)
+
+    profiler.write(profile_path)
+
+
+def sample_process(
+    csv_path: str, sample_size: int, options: ProcessOptions | None = None, seed: int | None = None
+) -> SampleEstimate:
+    """
+    Validate and clean a random sample of the rows, without writing them, to estimate
+    the error rates of the whole csv.
+
+    :param csv_path: path of the csv to sample
+    :type csv_path: str
+    :param sample_size: Number of rows of the sample
+    :type sample_size: int
+    :param options: Options of the run, the default ones if None
+    :type options: ProcessOptions | None
+    :param seed: Seed of the sample, a random one if None
+    :type seed: int | None
+    :return: Estimated error rates
+    :rtype: SampleEstimate
+    """
+    options = options or ProcessOptions()
+
+    io_layer = CSVIOlayer(output_path=None, s3=options.s3)
+    compiled: CompiledConfiguration = _load_configuration(io_layer, options)
+    structure = StructureValidator()
+    cleanner = LineOrchestrator(compiled.config)
+    estimate = SampleEstimate()
+
+    rows: list[list[str]] = []
+
+    records: Generator = io_layer.sample_csv(
+        csv_path, sample_size, options.input_encoding, seed, compiled.config.layout
+    )
+
+    for type, csv_row in records:
+        if type == "__header__":
+            structure.check_header(csv_row, compiled.config)
+        elif structure_errors := structure.validate_line(csv_row, compiled.config):
+            estimate.add(structure_errors, rejected=True)
+        else:
+            rows.append(structure.remap(csv_row))
+
+    validator = ValidatorManager(
+        compiled.config, compiled.compiled_rules, compiled.reference_index_dir
+    )
+
+    try:
+        if validator.outlier_validator.needs_fit(compiled.config):
+            validator.outlier_validator.fit(rows, compiled.config)
+
+        for row in rows:
+            errors_detected = validator.validate(data=row, config=compiled.config)
+            row_clean, _ = cleanner.process(row, errors_detected)
+            estimate.add(errors_detected, rejected=row_clean == [])
+
+            if row_clean:
+                validator.keep(row)
+    finally:
+        validator.close()
+
+    return estimate
+
+
+def verify_process(manifest_path: str, output_path: str | None = None) -> list[str]:
+    """
+    Check a clean output against the manifest written by its run.
+
+    :param manifest_path: path of the manifest
+    :type manifest_path: str
+    :param output_path: path of the output, the one in the manifest if None
+    :type output_path: str | None
+    :return: Problems found, empty if the output matches
+    :rtype: list[str]
+    """
+    return verify_manifest(manifest_path, output_path)
@@ -0,0 +1,231 @@
+import mmap
+from collections.abc import Callable
+from pathlib import Path
+
+from .models import MemoryOptions
+from .reporters import Report
+
+# Approximate memory of a list and of each str inside it.
+ROW_OVERHEAD = 56
+FIELD_OVERHEAD = 57
+
+# Resident memory over the budget above which the batches shrink by half, and below
+# which they grow by a quarter.
+HIGH_WATER = 0.9
+LOW_WATER = 0.7
+
+# Rows of each batch that are measured, and weight of each batch in the average size.
+SAMPLED_ROWS = 32
+SMOOTHING = 0.3
+
+
+def row_bytes(row: list[str]) -> int:
+    """
+    Approximate memory of a row and its values.
+
+    :param row: Values of the row
+    :type row: list[str]
+    :return: Bytes
+    :rtype: int
+    """
+    return ROW_OVERHEAD + sum(len(field) + FIELD_OVERHEAD for field in row)
+
+
+def current_rss() -> int | None:
+    """
+    Resident memory of the process.
+
+    :return: Bytes, None where /proc/self/statm can't be read
+    :rtype: int | None
+    """
+    try:
+        return int(Path("/proc/self/statm").read_bytes().split()[1]) * mmap.PAGESIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class MemoryGovernor:
+    """
+    Memory of a run against a budget. The stages that keep rows declare the bytes they
+    hold, the batches, the queue of the workers and the runs of the sort, and ask the
+    governor the size of their batches, the depth of their queues and the bytes they
+    may keep. The batch size is halved when the resident memory nears the budget,
+    grows back by a quarter when there is room, and never lets a batch take more than
+    batch_share of the budget, so very wide rows get small batches from the start.
+
+    :attribute limit: Budget of resident memory in bytes
+    :type limit: int
+    :attribute batch_size: Rows per batch advised to the reader
+    :type batch_size: int
+    :attribute row_bytes: Moving average of the bytes of a row
+    :type row_bytes: float
+    :attribute baseline: Resident memory when the governor was created
+    :type baseline: int
+    :attribute peak_rss: Highest resident memory sampled
+    :type peak_rss: int
+    :attribute peak_held: Highest bytes held by the stages at the same time
+    :type peak_held: int
+    :attribute shrinks: Times the batch size was reduced
+    :type shrinks: int
+    :attribute grows: Times the batch size was increased
+    :type grows: int
+    """
+
+    def __init__(
+        self,
+        options: MemoryOptions,
+        batch_size: int,
+        rss: Callable[[], int | None] = current_rss,
+    ):
+        """
+        :param options: Options of the governor
+        :type options: MemoryOptions
+        :param batch_size: Rows per batch at the start
+        :type batch_size: int
+        :param rss: Function that returns the resident memory, None if it is unknown
+        :type rss: Callable[[], int | None]
+        """
+        self.options = options
+        self.limit: int = options.limit
+        self.rss = rss
+        self.batch_size: int = max(options.min_batch_size, min(batch_size, options.max_batch_size))
+        self.row_bytes = 0.0
+        self.baseline: int = rss() or 0
+        self.peak_rss: int = self.baseline
+        self.peak_held = 0
+        self.shrinks = 0
+        self.grows = 0
+        self._last_rss: int = self.baseline
+        self._held: dict[str, int] = {}
+
+    @property
+    def held(self) -> int:
+        """Bytes held by all the stages."""
+        return sum(self._held.values())
+
+    def usage(self) -> int:
+        """
+        Memory counted against the budget: the last sampled resident memory, or the
+        memory at the start plus the bytes held by the stages when that is higher, the
+        only estimate where the resident memory can't be read.
+
+        :return: Bytes
+        :rtype: int
+        """
+        return max(self._last_rss, self.baseline + self.held)
+
+    def hold(self, stage: str, size: int):
+        """
+        Declare the bytes a stage holds now, replacing the ones it declared before.
+
+        :param stage: Name of the stage
+        :type stage: str
+        :param size: Bytes held by the stage
+        :type size: int
+        """
+        self._held[stage] = size
+        self.peak_held = max(self.peak_held, self.held)
+
+    def release(self, stage: str):
+        """
+        Declare a stage holds nothing anymore.
+
+        :param stage: Name of the stage
+        :type stage: str
+        """
+        self._held.pop(stage, None)
+
+    def room(self, stage: str) -> int:
+        """
+        Bytes a stage may hold: the budget up to the high water mark, less the memory
+        at the start and the bytes held by the other stages.
+
+        :param stage: Name of the stage
+        :type stage: str
+        :return: Bytes, 0 if there is no room
+        :rtype: int
+        """
+        others: int = self.held - self._held.get(stage, 0)
+        return max(int(self.limit * HIGH_WATER) - self.baseline - others, 0)
+
+    def queue_depth(self, stage: str, maximum: int) -> int:
+        """
+        Batches a queue may keep in flight: the ones of the current size that fit in
+        the room of the queue.
+
+        :param stage: Name of the queue
+        :type stage: str
+        :param maximum: Most batches in flight
+        :type maximum: int
+        :return: Batches, between 1 and maximum
+        :rtype: int
+        """
+        batch_bytes: float = self.batch_size * self.row_bytes
+
+        if batch_bytes <= 0:
+            return maximum
+        return max(1, min(maximum, int(self.room(stage) / batch_bytes)))
+
+    def observe(self, rows: list[list[str]]) -> int:
+        """
+        Measure a batch read from the input, sampling the size of some of its rows and
+        the resident memory, and adjust the batch size.
+
+        :param rows: Rows of the batch
+        :type rows: list[list[str]]
+        :return: Approximate bytes of the batch
+        :rtype: int
+        """
+        if not rows:
+            return 0
+
+        sample: list[list[str]] = rows[:: max(1, len(rows) // SAMPLED_ROWS)]
+        mean: float = sum(map(row_bytes, sample)) / len(sample)
+
+        if self.row_bytes:
+            self.row_bytes += SMOOTHING * (mean - self.row_bytes)
+        else:
+            self.row_bytes = mean
+
+        rss: int | None = self.rss()
+        if rss is not None:
+            self._last_rss = rss
+            self.peak_rss = max(self.peak_rss, rss)
+
+        self._adjust()
+        return round(mean * len(rows))
+
+    def _adjust(self):
+        """Shrink or grow the batch size with the pressure on the budget."""
+        pressure: float = self.usage() / self.limit
+        size: int = self.batch_size
+
+        if pressure >= HIGH_WATER:
+            size //= 2
+        elif pressure <= LOW_WATER:
+            size += max(1, size // 4)
+
+        ceiling: int = int(self.limit * self.options.batch_share / max(self.row_bytes, 1.0))
+        size = max(self.options.min_batch_size, min(size, ceiling, self.options.max_batch_size))
+
+        if size < self.batch_size:
+            self.shrinks += 1
+        elif size > self.batch_size:
+            self.grows += 1
+        self.batch_size = size
+
+    def record_metrics(self, reporter: Report):
+        """
+        Save the budget, the peaks of memory and the last batch size in a report.
+
+        :param reporter: Report of the run
+        :type reporter: Report
+        """
+        reporter.record_metric("memory_limit_bytes", self.limit)
+        reporter.record_metric("memory_rss_bytes", self._last_rss)
+        reporter.record_metric("memory_peak_rss_bytes", self.peak_rss)
+        reporter.record_metric("memory_peak_held_bytes", self.peak_held)
+        reporter.record_metric("memory_row_bytes", round(self.row_bytes))
+        reporter.record_metric("memory_batch_size", self.batch_size)
+        reporter.record_metric("memory_batch_shrinks", self.shrinks)
+        reporter.record_metric("memory_batch_grows", self.grows)
@@ -1,9 +1,39 @@
-from .config import Configuration
+from .config import Configuration, FieldSpec, OutlierSpec, ReferenceSpec, RuleSpec
 from .data_register import TYPE_MAP, ErrorTypes, LineError
+from .options import (
+    BranchOptions,
+    FollowOptions,
+    MemoryOptions,
+    ParallelOptions,
+    PartitionOptions,
+    ProcessOptions,
+    ProgressOptions,
+    QueryOptions,
+    S3Options,
+    SinkOptions,
+    SortOptions,
+)
+from .row_batch import RowBatch
 
 __all__ = [
     "TYPE_MAP",
+    "BranchOptions",
     "Configuration",
     "ErrorTypes",
+    "FieldSpec",
+    "FollowOptions",
     "LineError",
+    "MemoryOptions",
+    "OutlierSpec",
+    "ParallelOptions",
+    "PartitionOptions",
+    "ProcessOptions",
+    "ProgressOptions",
+    "QueryOptions",
+    "ReferenceSpec",
+    "RowBatch",
+    "RuleSpec",
+    "S3Options",
+    "SinkOptions",
+    "SortOptions",
 ]
@@ -1,11 +1,93 @@
+from datetime import date, datetime
+from typing import Literal
+
 from pydantic import BaseModel, Field, model_validator
 
 
+class RuleSpec(BaseModel):
+    """
+    Rule declared in the config for one column, e.g. "2:range(0,120)".
+
+    :attribute column: Index of the checked column
+    :type column: int
+    :attribute name: Name of the rule in the rule registry
+    :type name: str
+    :attribute args: Arguments of the rule
+    :type args: list[str]
+    """
+
+    column: int = Field(ge=0)
+    name: str
+    args: list[str] = Field(default=[])
+
+
+class ReferenceSpec(BaseModel):
+    """
+    Reference list declared in the config for one column, e.g. "3:refs/countries.csv@code".
+
+    :attribute column: Index of the checked column
+    :type column: int
+    :attribute path: Path of the reference csv
+    :type path: str
+    :attribute reference_column: Column of the reference csv, by name or index
+    :type reference_column: str
+    """
+
+    column: int = Field(ge=0)
+    path: str
+    reference_column: str = Field(default="0")
+
+
+class OutlierSpec(BaseModel):
+    """
+    Outlier detector declared in the config for a numeric column, e.g. "2:zscore(3)".
+
+    :attribute column: Index of the checked column
+    :type column: int
+    :attribute method: "zscore" (running mean and deviation), "mad" (median and median
+        absolute deviation of a sliding window) or "iqr" (quartile fences computed in a
+        first pass over the input)
+    :type method: str
+    :attribute threshold: Distance that makes a value an outlier, the default of the
+        method if None
+    :type threshold: float | None
+    :attribute window: Values of the sliding window of the "mad" method
+    :type window: int
+    """
+
+    column: int = Field(ge=0)
+    method: Literal["zscore", "mad", "iqr"]
+    threshold: float | None = Field(default=None, gt=0)
+    window: int = Field(default=1000, gt=1)
+
+
+class FieldSpec(BaseModel):
+    """
+    Column of a fixed-width input declared in the layout of the config, e.g. "name:20".
+
+    :attribute name: Name of the column
+    :type name: str
+    :attribute width: Number of characters of the column
+    :type width: int
+    """
+
+    name: str
+    width: int = Field(gt=0)
+
+
 class Configuration(BaseModel):
     header_types: list[type] = Field(default=[])
+    columns: list[str] = Field(default=[])
+    rules: list[RuleSpec] = Field(default=[])
+    references: list[ReferenceSpec] = Field(default=[])
+    outliers: list[OutlierSpec] = Field(default=[])
+    layout: list[FieldSpec] = Field(default=[])
+    date_formats: dict[int, str] = Field(default={})
 
     trate_nullerror: bool = Field(default=False)
     trate_typeerror: bool = Field(default=False)
+    trate_outliererror: bool = Field(default=False)
+    normalize_dates: bool = Field(default=False)
 
     @model_validator(mode="after")
     def validate_types(self):
@@ -15,4 +97,13 @@ class Configuration(BaseModel):
         if self.header_types and not self.trate_typeerror:
             raise ValueError("If header_type is empty can not apply type validator.")
 
+        if self.columns and self.header_types and len(self.columns) != len(self.header_types):
+            raise ValueError("The config must declare the same number of columns and types.")
+
+        if any(
+            column >= len(self.header_types) or self.header_types[column] not in (date, datetime)
+            for column in self.date_formats
+        ):
+            raise ValueError("Date formats can only be declared for date and datetime columns.")
+
         return self
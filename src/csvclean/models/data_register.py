@@ -1,3 +1,4 @@
+from datetime import date, datetime
 from enum import Enum
 from typing import TypeAlias
 
@@ -7,6 +8,10 @@ class ErrorTypes(Enum):
     NULL = 1
     TYPE = 2
     DUPLICATE = 3
+    RULE = 4
+    REFERENCE = 5
+    STRUCTURE = 6
+    OUTLIER = 7
 
     # Corrections
     REMOVED_NULL = 50
@@ -15,4 +20,11 @@ class ErrorTypes(Enum):
 
 LineError: TypeAlias = dict[int, ErrorTypes]
 
-TYPE_MAP = {"str": str, "int": int, "float": float, "bool": bool}
+TYPE_MAP = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "date": date,
+    "datetime": datetime,
+}
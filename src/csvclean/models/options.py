@@ -0,0 +1,300 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+# S3 rejects the parts of a multipart upload under 5 MiB, except the last one, only when
+# the upload is completed.
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class S3Options(BaseModel):
+    """
+    Options of the transfers of the s3:// inputs and outputs.
+
+    :attribute part_size: Bytes of each range request of a read and of each part of a
+        multipart upload. S3 needs parts of 5 MiB at least, except the last one.
+    :type part_size: int
+    :attribute concurrency: Range requests or part uploads in flight at the same time.
+    :type concurrency: int
+    :attribute endpoint_url: Endpoint of an S3-compatible store, like MinIO, the AWS one
+        if None.
+    :type endpoint_url: str | None
+    """
+
+    part_size: int = Field(default=8 * 1024 * 1024, ge=MIN_PART_SIZE)
+    concurrency: int = Field(default=8, gt=0)
+    endpoint_url: str | None = Field(default=None)
+
+
+class SinkOptions(BaseModel):
+    """
+    Options of the output sinks.
+
+    :attribute batch_size: Number of rows buffered before each write.
+    :type batch_size: int
+    :attribute row_group_size: Rows per Parquet row group.
+    :type row_group_size: int
+    :attribute compression: Codec of the columnar outputs (None to disable).
+    :type compression: str | None
+    :attribute use_dictionary: Dictionary encode the text columns of the columnar outputs.
+    :type use_dictionary: bool
+    :attribute encoding: Encoding of the csv output.
+    :type encoding: str
+    :attribute table: Table of the SQLite output.
+    :type table: str
+    :attribute index_columns: Columns of the SQLite output indexed after the load.
+    :type index_columns: list[str]
+    :attribute transaction_rows: Rows inserted in each transaction of the SQLite output.
+    :type transaction_rows: int
+    :attribute append: Append the rows to an existing csv output, without writing the
+        header again.
+    :type append: bool
+    :attribute s3: Options of the uploads of the s3:// outputs.
+    :type s3: S3Options
+    """
+
+    batch_size: int = Field(default=1000, gt=0)
+    row_group_size: int = Field(default=65536, gt=0)
+    compression: str | None = Field(default="zstd")
+    use_dictionary: bool = Field(default=True)
+    encoding: str = Field(default="utf-8")
+    table: str = Field(default="clean_data", min_length=1)
+    index_columns: list[str] = Field(default=[])
+    transaction_rows: int = Field(default=100000, gt=0)
+    append: bool = Field(default=False)
+    s3: S3Options = Field(default_factory=S3Options)
+
+
+class SortOptions(BaseModel):
+    """
+    Options of the external sort of the clean rows.
+
+    :attribute keys: Columns of the sort key, by name or by index.
+    :type keys: list[str]
+    :attribute dedupe: Drop the rows whose key is already written.
+    :type dedupe: bool
+    :attribute memory_budget: Approximate bytes of rows sorted in memory before spilling a run.
+    :type memory_budget: int
+    :attribute temp_dir: Directory of the spilled runs (the system one if None).
+    :type temp_dir: str | None
+    :attribute max_fan_in: Maximum number of runs merged at the same time.
+    :type max_fan_in: int
+    """
+
+    keys: list[str] = Field(min_length=1)
+    dedupe: bool = Field(default=False)
+    memory_budget: int = Field(default=256 * 1024 * 1024, gt=0)
+    temp_dir: str | None = Field(default=None)
+    max_fan_in: int = Field(default=64, gt=1)
+
+
+class PartitionOptions(BaseModel):
+    """
+    Options of the output split in several csv files.
+
+    :attribute column: Column whose value chooses the directory of each row, by name or by
+        index. The rows are only rolled over files if None.
+    :type column: str | None
+    :attribute max_file_bytes: Approximate size after which a new file of the partition is
+        started, one file per partition if None.
+    :type max_file_bytes: int | None
+    :attribute max_open_files: Maximum number of files open at the same time.
+    :type max_open_files: int
+    """
+
+    column: str | None = Field(default=None)
+    max_file_bytes: int | None = Field(default=None, gt=0)
+    max_open_files: int = Field(default=64, gt=0)
+
+
+class ProgressOptions(BaseModel):
+    """
+    Options of the progress of long runs.
+
+    :attribute sample_every: Rows processed between two looks at the clock.
+    :type sample_every: int
+    :attribute interval: Minimum seconds between two progress updates.
+    :type interval: float
+    :attribute smoothing: Weight of the last sample in the moving average of the rates.
+    :type smoothing: float
+    :attribute stderr: Write the progress line to stderr.
+    :type stderr: bool
+    :attribute prometheus_path: Text file with the metrics in Prometheus format, none if None.
+    :type prometheus_path: str | None
+    """
+
+    sample_every: int = Field(default=10000, gt=0)
+    interval: float = Field(default=2.0, ge=0)
+    smoothing: float = Field(default=0.3, gt=0, le=1)
+    stderr: bool = Field(default=True)
+    prometheus_path: str | None = Field(default=None)
+
+
+class ParallelOptions(BaseModel):
+    """
+    Options of the parallel validation and cleaning of the rows.
+
+    :attribute backend: Workers used: threads, processes, or "auto" to use threads
+        on free-threaded Python builds and processes otherwise.
+    :type backend: str
+    :attribute workers: Number of workers, the number of cpus if 0.
+    :type workers: int
+    :attribute batch_size: Rows sent to a worker at once.
+    :type batch_size: int
+    :attribute max_pending: Batches in flight per worker, bounding the memory used.
+    :type max_pending: int
+    """
+
+    backend: Literal["auto", "thread", "process"] = Field(default="auto")
+    workers: int = Field(default=0, ge=0)
+    batch_size: int = Field(default=1000, gt=0)
+    max_pending: int = Field(default=2, gt=0)
+
+
+class MemoryOptions(BaseModel):
+    """
+    Options of the memory governor, that sizes the batches, queues and sort runs of a
+    run to keep the resident memory of the process under a budget.
+
+    :attribute limit: Budget of resident memory of the process in bytes.
+    :type limit: int
+    :attribute min_batch_size: Fewest rows per batch when the memory is short.
+    :type min_batch_size: int
+    :attribute max_batch_size: Most rows per batch when there is room.
+    :type max_batch_size: int
+    :attribute batch_share: Share of the budget that one batch of rows may take.
+    :type batch_share: float
+    """
+
+    limit: int = Field(gt=0)
+    min_batch_size: int = Field(default=16, gt=0)
+    max_batch_size: int = Field(default=50000, gt=0)
+    batch_share: float = Field(default=0.05, gt=0, le=1)
+
+
+class FollowOptions(BaseModel):
+    """
+    Options of the runs that wait for new data: following a csv that keeps growing, or
+    watching a directory where new files land.
+
+    :attribute poll_interval: Seconds between two looks for new data.
+    :type poll_interval: float
+    :attribute idle_timeout: Seconds without new data before the run ends, it never
+        ends if None.
+    :type idle_timeout: float | None
+    :attribute state_path: Json with the offset of the followed csv, or the files of the
+        directory already cleaned, so a restart goes on where the last run stopped.
+        No state is saved if None.
+    :type state_path: str | None
+    :attribute pattern: Glob of the names of the files picked up in the directory.
+    :type pattern: str
+    :attribute workers: Files of the directory cleaned at the same time.
+    :type workers: int
+    """
+
+    poll_interval: float = Field(default=1.0, gt=0)
+    idle_timeout: float | None = Field(default=None, gt=0)
+    state_path: str | None = Field(default=None)
+    pattern: str = Field(default="*.csv", min_length=1)
+    workers: int = Field(default=1, gt=0)
+
+
+class QueryOptions(BaseModel):
+    """
+    Options of an input read from a SQLite database instead of a file.
+
+    :attribute sql: Query that returns the rows to clean.
+    :type sql: str
+    :attribute fetch_size: Rows fetched from the cursor at once.
+    :type fetch_size: int
+    """
+
+    sql: str = Field(min_length=1)
+    fetch_size: int = Field(default=10000, gt=0)
+
+
+class BranchOptions(BaseModel):
+    """
+    Configuration and outputs of one branch of a fan-out run.
+
+    :attribute config_path: Path of the configuration of the branch.
+    :type config_path: str
+    :attribute output_path: Output of the clean rows of the branch.
+    :type output_path: str
+    :attribute report_path: Report of the errors of the branch, none if None.
+    :type report_path: str | None
+    :attribute quarantine_path: Csv where the rejected rows of the branch are written,
+        none if None.
+    :type quarantine_path: str | None
+    """
+
+    config_path: str
+    output_path: str
+    report_path: str | None = Field(default=None)
+    quarantine_path: str | None = Field(default=None)
+
+
+class ProcessOptions(BaseModel):
+    """
+    Options of a cleaning run.
+
+    :attribute config_path: Path of the configuration file.
+    :type config_path: str
+    :attribute config_cache: Reuse the compiled configurations saved in the config cache.
+    :type config_cache: bool
+    :attribute config_cache_dir: Directory of the config cache, the user cache if None.
+    :type config_cache_dir: str | None
+    :attribute reference_index_dir: Directory of the indexes of the reference lists, the
+        user cache if None.
+    :type reference_index_dir: str | None
+    :attribute input_encoding: Encoding of the input csv, detected if None.
+    :type input_encoding: str | None
+    :attribute passthrough: For ascii compatible inputs, handle the rows byte by byte and
+        write them in the input encoding, skipping the decoding to unicode and the
+        encoding back.
+    :type passthrough: bool
+    :attribute quarantine_path: Csv where the rejected rows are written, none if None.
+    :type quarantine_path: str | None
+    :attribute manifest_path: Json with the integrity manifest of the run, none if None.
+    :type manifest_path: str | None
+    :attribute manifest_chunk_size: Rows per chunk of the manifest hashes.
+    :type manifest_chunk_size: int
+    :attribute sink: Options of the output sink.
+    :type sink: SinkOptions
+    :attribute progress: Options of the progress updates, no progress if None.
+    :type progress: ProgressOptions | None
+    :attribute sort: Options of the external sort, no sort if None.
+    :type sort: SortOptions | None
+    :attribute partition: Options of the partitioned output, one output file if None.
+    :type partition: PartitionOptions | None
+    :attribute parallel: Options of the parallel cleaning, one thread if None.
+    :type parallel: ParallelOptions | None
+    :attribute query: Query over the SQLite database given as input, the input is a file
+        if None.
+    :type query: QueryOptions | None
+    :attribute s3: Options of the reads of the s3:// inputs.
+    :type s3: S3Options
+    :attribute memory: Options of the memory governor, no budget if None.
+    :type memory: MemoryOptions | None
+    :attribute follow: Options of the follow and watch runs.
+    :type follow: FollowOptions
+    """
+
+    config_path: str = Field(default="tests/fixtures/config.txt")
+    config_cache: bool = Field(default=True)
+    config_cache_dir: str | None = Field(default=None)
+    reference_index_dir: str | None = Field(default=None)
+    input_encoding: str | None = Field(default=None)
+    passthrough: bool = Field(default=False)
+    quarantine_path: str | None = Field(default=None)
+    manifest_path: str | None = Field(default=None)
+    manifest_chunk_size: int = Field(default=100000, gt=0)
+    sink: SinkOptions = Field(default_factory=SinkOptions)
+    progress: ProgressOptions | None = Field(default=None)
+    sort: SortOptions | None = Field(default=None)
+    partition: PartitionOptions | None = Field(default=None)
+    parallel: ParallelOptions | None = Field(default=None)
+    query: QueryOptions | None = Field(default=None)
+    s3: S3Options = Field(default_factory=S3Options)
+    memory: MemoryOptions | None = Field(default=None)
+    follow: FollowOptions = Field(default_factory=FollowOptions)
@@ -0,0 +1,121 @@
+from collections.abc import Iterable, Iterator
+
+from .data_register import ErrorTypes, LineError
+
+
+class RowBatch:
+    """
+    Chunk of rows stored as one list of values per column. The rows are never copied
+    or filtered: the validators fill the errors of the rows that have any, and the
+    cleaners remove the rejected rows from the selection vector.
+
+    :attribute columns: Values of each column, in the order of the rows
+    :type columns: list[list[str]]
+    :attribute length: Number of rows of the chunk
+    :type length: int
+    :attribute selection: Indexes of the rows that survived the cleaning, in order
+    :type selection: list[int]
+    :attribute errors: Errors of each row with errors, by row index
+    :type errors: dict[int, LineError]
+    """
+
+    __slots__ = ("columns", "errors", "length", "selection")
+
+    def __init__(self, columns: list[list[str]], length: int):
+        self.columns = columns
+        self.length = length
+        self.selection: list[int] = list(range(length))
+        self.errors: dict[int, LineError] = {}
+
+    @classmethod
+    def from_rows(cls, rows: list[list[str]]) -> "RowBatch":
+        """
+        Transpose a chunk of rows into columns.
+
+        :param rows: Rows as they were read
+        :type rows: list[list[str]]
+        :return: Batch with the rows
+        :rtype: RowBatch
+        :raises ValueError: If the rows are empty or don't have the same number of values
+        """
+        columns: list[list[str]] = [list(values) for values in zip(*rows, strict=True)]
+
+        if rows and not columns:
+            raise ValueError("Rows without values can't be stored by columns.")
+
+        return cls(columns, len(rows))
+
+    @property
+    def width(self) -> int:
+        """Number of columns."""
+        return len(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.selection)
+
+    def row(self, index: int) -> list[str]:
+        """
+        Values of one row.
+
+        :param index: Index of the row in the chunk
+        :type index: int
+        :return: Values of the row
+        :rtype: list[str]
+        """
+        return [values[index] for values in self.columns]
+
+    def add_error(self, index: int, column_number: int, error: ErrorTypes):
+        """
+        Save the error of a value, unless the value already has one.
+
+        :param index: Index of the row in the chunk
+        :type index: int
+        :param column_number: Column of the value
+        :type column_number: int
+        :param error: Error of the value
+        :type error: ErrorTypes
+        """
+        self.errors.setdefault(index, {}).setdefault(column_number, error)
+
+    def drop(self, indexes: Iterable[int]):
+        """
+        Remove rows from the selection.
+
+        :param indexes: Indexes of the rows to remove
+        :type indexes: Iterable[int]
+        """
+        dropped: set[int] = set(indexes)
+        if dropped:
+            self.selection = [index for index in self.selection if index not in dropped]
+
+    def rejected(self) -> list[int]:
+        """
+        Indexes of the rows removed from the selection.
+
+        :return: Indexes of the removed rows, in order
+        :rtype: list[int]
+        """
+        selected: set[int] = set(self.selection)
+        return [index for index in range(self.length) if index not in selected]
+
+    def selected_columns(self) -> list[list[str]]:
+        """
+        Values of each column for the selected rows, the columns themselves if no row
+        was removed.
+
+        :return: Values of each column
+        :rtype: list[list[str]]
+        """
+        if len(self.selection) == self.length:
+            return self.columns
+        return [[values[index] for index in self.selection] for values in self.columns]
+
+    def selected_rows(self) -> Iterator[list[str]]:
+        """
+        Selected rows, built from the columns.
+
+        :return: Values of each selected row
+        :rtype: Iterator[list[str]]
+        """
+        for values in zip(*self.selected_columns(), strict=True):
+            yield list(values)
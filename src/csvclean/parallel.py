@@ -0,0 +1,273 @@
+import os
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from .cleaners import LineOrchestrator
+from .IO_layer import CompiledConfiguration
+from .memory import MemoryGovernor
+from .models import LineError, ParallelOptions
+from .reporters import Report
+from .validators import ValidatorManager
+
+PositionedRow = tuple[list[str], tuple[int, int]]
+CleanedBatch = tuple[list[tuple[list[str], LineError]], Report]
+PendingBatch = tuple[list[PositionedRow], Future[CleanedBatch]]
+
+
+def gil_enabled() -> bool:
+    """
+    Check if the interpreter runs with the GIL. Builds before 3.13 always do.
+
+    :return: True if the GIL is enabled
+    :rtype: bool
+    """
+    is_gil_enabled: Callable[[], bool] = getattr(sys, "_is_gil_enabled", lambda: True)
+    return is_gil_enabled()
+
+
+def resolve_backend(backend: str) -> str:
+    """
+    Choose the workers of the "auto" backend: threads on free-threaded builds, where
+    they run in parallel without pickling the rows, and processes otherwise.
+
+    :param backend: "auto", "thread" or "process"
+    :type backend: str
+    :return: "thread" or "process"
+    :rtype: str
+    """
+    if backend != "auto":
+        return backend
+    return "process" if gil_enabled() else "thread"
+
+
+def _sized_batches(
+    records: Iterable[tuple[str, list[str]]],
+    position: Callable[[], tuple[int, int]],
+    size: Callable[[], int],
+) -> Iterator[list[PositionedRow]]:
+    """Batches of the rows of a reader, with the size returned by size when each begins."""
+    batch: list[PositionedRow] = []
+    batch_size: int = size()
+
+    for _, row in records:
+        batch.append((row, position()))
+
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+            batch_size = size()
+
+    if batch:
+        yield batch
+
+
+def positioned_batches(
+    records: Iterable[tuple[str, list[str]]],
+    position: Callable[[], tuple[int, int]],
+    size: int | MemoryGovernor,
+) -> Iterator[list[PositionedRow]]:
+    """
+    Group the rows of a reader in batches, keeping the position of each row.
+
+    :param records: Rows of the reader, after the header
+    :type records: Iterable[tuple[str, list[str]]]
+    :param position: Function that returns the position of the last read row
+    :type position: Callable[[], tuple[int, int]]
+    :param size: Rows per batch, or memory governor that measures each batch and
+        chooses the size of the next one
+    :type size: int | MemoryGovernor
+    :return: Batches of rows with their positions
+    :rtype: Iterator[list[PositionedRow]]
+    """
+    if not isinstance(size, MemoryGovernor):
+        yield from _sized_batches(records, position, lambda: size)
+        return
+
+    governor: MemoryGovernor = size
+
+    for batch in _sized_batches(records, position, lambda: governor.batch_size):
+        governor.hold("batch", governor.observe([row for row, _ in batch]))
+        yield batch
+
+    governor.release("batch")
+
+
+class BatchCleaner:
+    """
+    Validation and cleaning of batches of rows. One instance is shared by all the
+    threads of a pool; each thread creates its own validators, so their memo caches
+    are never shared.
+    """
+
+    def __init__(self, compiled: CompiledConfiguration):
+        self.compiled = compiled
+        self.config = compiled.config
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._validators: list[ValidatorManager] = []
+
+    def _thread_state(self) -> tuple[ValidatorManager, LineOrchestrator]:
+        """Validators and cleaners of the current thread."""
+        state: tuple[ValidatorManager, LineOrchestrator] | None = getattr(
+            self._local, "state", None
+        )
+
+        if state is None:
+            state = (
+                ValidatorManager(
+                    self.config, self.compiled.compiled_rules, self.compiled.reference_index_dir
+                ),
+                LineOrchestrator(self.config),
+            )
+            self._local.state = state
+
+            with self._lock:
+                self._validators.append(state[0])
+
+        return state
+
+    def clean_batch(self, rows: list[list[str]]) -> CleanedBatch:
+        """
+        Validate and clean a batch, counting its errors in a report of its own so the
+        workers never share counters.
+
+        :param rows: Rows as they were read
+        :type rows: list[list[str]]
+        :return: Clean row and errors of each row, and report of the batch
+        :rtype: CleanedBatch
+        """
+        validator, cleanner = self._thread_state()
+        report = Report()
+        cleaned: list[tuple[list[str], LineError]] = []
+        memo_counts: dict[str, int] = validator.memo_counts()
+
+        for row in rows:
+            errors_detected: LineError = validator.validate(data=row, config=self.config)
+            row_clean, data_errors = cleanner.process(row, errors_detected)
+            report.count_errors(data_errors)
+            cleaned.append((row_clean, data_errors))
+
+        # The memos of the thread outlive the batch, so only its own lookups are counted
+        for name, count in validator.memo_counts().items():
+            report.record_metric(name, count - memo_counts.get(name, 0))
+
+        return cleaned, report
+
+    def close(self):
+        """Close the validators of all the threads."""
+        with self._lock:
+            for validator in self._validators:
+                validator.close()
+            self._validators = []
+
+
+_process_cleaner: BatchCleaner | None = None
+
+
+def _init_process(compiled: CompiledConfiguration):
+    global _process_cleaner  # noqa: PLW0603
+    _process_cleaner = BatchCleaner(compiled)
+
+
+def _clean_in_process(rows: list[list[str]]) -> CleanedBatch:
+    if _process_cleaner is None:
+        raise RuntimeError("The worker process was not initialized.")
+    return _process_cleaner.clean_batch(rows)
+
+
+class ParallelCleaner:
+    """
+    Pool of workers that validate and clean batches of rows, returning the results in
+    the order of the input with a bounded number of batches in flight.
+
+    :attribute backend: Workers of the pool, "thread" or "process"
+    :type backend: str
+    :attribute workers: Number of workers
+    :type workers: int
+    :attribute governor: Memory governor of the run, that can keep fewer batches in
+        flight than max_pending
+    :type governor: MemoryGovernor | None
+    """
+
+    def __init__(
+        self,
+        compiled: CompiledConfiguration,
+        options: ParallelOptions,
+        governor: MemoryGovernor | None = None,
+    ):
+        self.options = options
+        self.governor = governor
+        self.backend: str = resolve_backend(options.backend)
+        self.workers: int = options.workers or os.cpu_count() or 1
+        self._executor: Executor
+        self._clean: Callable[[list[list[str]]], CleanedBatch]
+        self._cleaner: BatchCleaner | None = None
+
+        if self.backend == "thread":
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="csvclean")
+            self._cleaner = BatchCleaner(compiled)
+            self._clean = self._cleaner.clean_batch
+        else:
+            self._executor = ProcessPoolExecutor(
+                self.workers, initializer=_init_process, initargs=(compiled,)
+            )
+            self._clean = _clean_in_process
+
+    def map(
+        self, batches: Iterable[list[PositionedRow]]
+    ) -> Iterator[tuple[list[PositionedRow], CleanedBatch]]:
+        """
+        Clean the batches in the workers.
+
+        :param batches: Batches of rows with their positions in the input
+        :type batches: Iterable[list[PositionedRow]]
+        :return: Each input batch with its clean rows and report, in order
+        :rtype: Iterator
+        """
+        pending: deque[PendingBatch] = deque()
+
+        for batch in batches:
+            rows: list[list[str]] = [row for row, _ in batch]
+            pending.append((batch, self._executor.submit(self._clean, rows)))
+
+            while len(pending) >= self._max_pending(pending):
+                done_batch, future = pending.popleft()
+                yield done_batch, future.result()
+
+        while pending:
+            done_batch, future = pending.popleft()
+            yield done_batch, future.result()
+
+        if self.governor is not None:
+            self.governor.release("pending")
+
+    def _max_pending(self, pending: deque[PendingBatch]) -> int:
+        """
+        Batches that may be in flight, declaring the ones that are to the governor, which
+        can lower the max_pending batches per worker when the memory is short.
+        """
+        max_pending: int = self.workers * self.options.max_pending
+
+        if self.governor is None:
+            return max_pending
+
+        self.governor.hold(
+            "pending", round(sum(len(batch) for batch, _ in pending) * self.governor.row_bytes)
+        )
+        return self.governor.queue_depth("pending", max_pending)
+
+    def close(self):
+        """Stop the workers, cancelling the batches not started, and close their validators."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+        if self._cleaner is not None:
+            self._cleaner.close()
+
+    def __enter__(self) -> "ParallelCleaner":
+        return self
+
+    def __exit__(self, *_: object):
+        self.close()
@@ -0,0 +1,242 @@
+from .cleaners import LineOrchestrator
+from .IO_layer import BaseSink, CompiledConfiguration, QuarantineSink
+from .IO_layer.manifest import ManifestBuilder
+from .models import LineError, RowBatch
+from .reporters import Report
+from .validators import ValidatorManager
+from .validators.rules import has_stateful_rules
+from .validators.structure_validator import StructureValidator
+
+
+class CleaningBranch:
+    """
+    Validation, cleaning and outputs of the rows read from an input, for one configuration.
+
+    :attribute compiled: Configuration of the branch and its compiled tables
+    :type compiled: CompiledConfiguration
+    :attribute sink: Output of the clean rows
+    :type sink: BaseSink
+    :attribute reporter: Report of the errors of the branch
+    :type reporter: Report
+    :attribute quarantine: Output of the rejected rows, if any
+    :type quarantine: QuarantineSink | None
+    :attribute manifest: Integrity manifest of the read, rejected and kept rows, if any
+    :type manifest: ManifestBuilder | None
+    """
+
+    def __init__(
+        self,
+        compiled: CompiledConfiguration,
+        sink: BaseSink,
+        reporter: Report,
+        quarantine: QuarantineSink | None = None,
+        manifest: ManifestBuilder | None = None,
+    ):
+        self.compiled = compiled
+        self.config = compiled.config
+        self.sink = sink
+        self.reporter = reporter
+        self.quarantine = quarantine
+        self.manifest = manifest
+        self.structure = StructureValidator()
+        self.validator = ValidatorManager(
+            self.config, compiled.compiled_rules, compiled.reference_index_dir
+        )
+        self.cleanner = LineOrchestrator(self.config)
+        # A stateful rule must know the rows written before it checks the next one
+        self._row_by_row = has_stateful_rules(self.config)
+
+    def start(self, header: list[str]):
+        """
+        Check the header of the input against the config and open the outputs with the
+        header of the clean rows.
+
+        :param header: Names of the columns of the input
+        :type header: list[str]
+        :raises ValueError: If the header doesn't match the config
+        """
+        header = self.structure.check_header(header, self.config)
+        self.sink.write_header(header)
+
+        if self.quarantine is not None:
+            self.quarantine.write_header(header)
+
+    def check_structure(self, row: list[str], position: tuple[int, int]) -> list[str] | None:
+        """
+        Run the structural stage on a row. A row with a wrong number of values is
+        rejected at once, without running the per-cell validators.
+
+        :param row: Row as it was read
+        :type row: list[str]
+        :param position: Line number and byte offset where the row starts
+        :type position: tuple[int, int]
+        :return: Row in the order of the columns of the config, None if it was rejected
+        :rtype: list[str] | None
+        """
+        structure_errors: LineError = self.structure.validate_line(row, self.config)
+
+        if structure_errors:
+            self.reporter.count_errors(structure_errors)
+            self.route(row, [], structure_errors, position)
+            return None
+
+        return self.structure.remap(row)
+
+    def process_row(self, row: list[str], position: tuple[int, int]) -> bool:
+        """
+        Validate and clean one row and send it to the right output.
+
+        :param row: Row as it was read
+        :type row: list[str]
+        :param position: Line number and byte offset where the row starts
+        :type position: tuple[int, int]
+        :return: True if the row was written to the output
+        :rtype: bool
+        """
+        checked_row: list[str] | None = self.check_structure(row, position)
+
+        if checked_row is None:
+            return False
+
+        row = checked_row
+        errors_detected: LineError = self.validator.validate(data=row, config=self.config)
+
+        row_clean, data_errors = self.cleanner.process(row, errors_detected)
+
+        self.reporter.count_errors(data_errors)
+
+        return self.route(row, row_clean, data_errors, position)
+
+    def process_batch(self, rows: list[list[str]], positions: list[tuple[int, int]]) -> int:
+        """
+        Validate and clean a chunk of rows stored by columns, and send each row to the
+        right output. The chunks with rows of a wrong length, that the structural stage
+        rejects, and the chunks checked by stateful rules are processed row by row.
+
+        :param rows: Rows as they were read
+        :type rows: list[list[str]]
+        :param positions: Line number and byte offset where each row starts
+        :type positions: list[tuple[int, int]]
+        :return: Number of rows written to the output
+        :rtype: int
+        """
+        width: int | None = self.structure.width
+
+        if self._row_by_row or not width or any(len(row) != width for row in rows):
+            return self._process_rows(rows, positions)
+
+        rows = [self.structure.remap(row) for row in rows]
+        batch = RowBatch.from_rows(rows)
+
+        self.validator.validate_batch(batch, self.config)
+        self.cleanner.process_batch(batch)
+
+        for data_errors in batch.errors.values():
+            self.reporter.count_errors(data_errors)
+
+        if self.manifest is not None:
+            for row in rows:
+                self.manifest.input.add(row)
+            for index in batch.selection:
+                self.manifest.kept.add(rows[index])
+
+        self.sink.write_batch(batch)
+
+        for index in batch.rejected():
+            if self.manifest is not None:
+                self.manifest.rejected.add(rows[index])
+
+            if self.quarantine is not None:
+                self.quarantine.write_rejected(rows[index], batch.errors[index], *positions[index])
+
+        return len(batch)
+
+    def _process_rows(self, rows: list[list[str]], positions: list[tuple[int, int]]) -> int:
+        return sum(
+            self.process_row(row, position) for row, position in zip(rows, positions, strict=True)
+        )
+
+    def route(
+        self,
+        row: list[str],
+        row_clean: list[str],
+        data_errors: LineError,
+        position: tuple[int, int],
+    ) -> bool:
+        """
+        Send a row already validated and cleaned to the right output.
+
+        :param row: Row as it was read
+        :type row: list[str]
+        :param row_clean: Row after the cleaners, empty if rejected
+        :type row_clean: list[str]
+        :param data_errors: Errors of the row
+        :type data_errors: LineError
+        :param position: Line number and byte offset where the row starts
+        :type position: tuple[int, int]
+        :return: True if the row was written to the output
+        :rtype: bool
+        """
+        if self.manifest is not None:
+            self.manifest.input.add(row)
+
+        if row_clean != []:
+            if self.manifest is not None:
+                self.manifest.kept.add(row)
+
+            self.validator.keep(row)
+            self.sink.write_row(row_clean)
+            return True
+
+        if self.manifest is not None:
+            self.manifest.rejected.add(row)
+
+        if self.quarantine is not None:
+            self.quarantine.write_rejected(row, data_errors, *position)
+        return False
+
+    def commit(self):
+        """Hand the rows written so far to the outputs, so their readers see them."""
+        self.sink.commit()
+
+        if self.quarantine is not None:
+            self.quarantine.commit()
+
+    def close(self):
+        """
+        Save the counts and hit rates of the validation memos, close the validators and
+        the outputs and save the timings of the sink. On a parallel run the counts come
+        from the reports of the batches.
+        """
+        for name, count in self.validator.memo_counts().items():
+            self.reporter.record_metric(name, count)
+
+        self.reporter.record_hit_rates()
+
+        self.validator.close()
+
+        try:
+            self.sink.close()
+            self.sink.record_metrics(self.reporter)
+        finally:
+            if self.quarantine is not None:
+                self.quarantine.close()
+
+    def abort(self):
+        """Close the validators and abort the outputs after a failed run."""
+        self.validator.close()
+
+        try:
+            self.sink.abort()
+        finally:
+            if self.quarantine is not None:
+                self.quarantine.abort()
+
+    def __enter__(self) -> "CleaningBranch":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_: object):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
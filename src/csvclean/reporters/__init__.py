@@ -1,5 +1,7 @@
 from .cleaning_report import Report
+from .progress import ProgressTracker
 
 __all__ = [
+    "ProgressTracker",
     "Report",
 ]
@@ -2,6 +2,24 @@ from pathlib import Path
 
 from csvclean.models.data_register import ErrorTypes, LineError
 
+# Words of the metric names that tell how the metrics of two reports are merged: the
+# counters are added up and the peaks keep the highest value. The hit rates are
+# recomputed from their hits and misses, and any other metric keeps the last value.
+COUNTER_WORDS = frozenset({"total", "rows", "runs", "hits", "misses", "shrinks", "grows"})
+RATIO_WORDS = frozenset({"rate", "per"})
+PEAK_WORD = "peak"
+
+
+def _merge_metric(name: str, current: int | float, added: int | float) -> int | float:
+    """Merged value of a metric found in two reports, by the meaning of its name."""
+    words: set[str] = set(name.split("_"))
+
+    if PEAK_WORD in words:
+        return max(current, added)
+    if words & COUNTER_WORDS and not words & RATIO_WORDS:
+        return current + added
+    return added
+
 
 class Report:
     """
@@ -13,6 +31,8 @@ class Report:
     :type total_errors: int
     :attribute fixed_rows: Number of fixed rows.
     :type fixed_rows: int
+    :attribute metrics: Progress and performance values of the pipeline stages.
+    :type metrics: dict{str: int | float}
     """
 
     def __init__(self):
@@ -26,6 +46,7 @@ class Report:
         }
         self.total_errors = 0
         self.fixed_rows = 0
+        self.metrics: dict[str, int | float] = {}
 
     def count_errors(self, errors: LineError):
         """
@@ -36,12 +57,59 @@ class Report:
         """
 
         for _, error in errors.items():
-            self.count_errors_by_type[error] += 1
+            self.count_errors_by_type[error] = self.count_errors_by_type.get(error, 0) + 1
             self.total_errors += 1
 
         if len(errors) > 0:
             self.fixed_rows += 1
 
+    def merge(self, other: "Report"):
+        """
+        Add the counters of another report, e.g. the one of a worker. The metrics are
+        merged by their meaning: counters added up, peaks kept at the highest value and
+        hit rates recomputed from their merged hits and misses.
+
+        :param other: Report to add
+        :type other: Report
+        """
+        for type_error, count_error in other.count_errors_by_type.items():
+            self.count_errors_by_type[type_error] = (
+                self.count_errors_by_type.get(type_error, 0) + count_error
+            )
+
+        self.total_errors += other.total_errors
+        self.fixed_rows += other.fixed_rows
+
+        for name, value in other.metrics.items():
+            current: int | float | None = self.metrics.get(name)
+            self.metrics[name] = value if current is None else _merge_metric(name, current, value)
+
+        self.record_hit_rates()
+
+    def record_hit_rates(self):
+        """
+        Compute the hit rates whose hits and misses are in the metrics, e.g. the rate
+        type_memo_hit_rate_2 of type_memo_hits_2 and type_memo_misses_2.
+        """
+        for name in [name for name in self.metrics if name.endswith("_hits") or "_hits_" in name]:
+            misses_name: str = name.replace("_hits", "_misses", 1)
+            rate_name: str = name.replace("_hits", "_hit_rate", 1)
+            lookups: int | float = self.metrics[name] + self.metrics.get(misses_name, 0)
+
+            if lookups:
+                self.metrics[rate_name] = round(self.metrics[name] / lookups, 4)
+
+    def record_metric(self, name: str, value: int | float):
+        """
+        Save the last value of a progress or performance metric.
+
+        :param name: Name of the metric
+        :type name: str
+        :param value: Value of the metric
+        :type value: int | float
+        """
+        self.metrics[name] = value
+
     def do_report(self, report_path: str = "./tests/fixtures/report.txt"):
         """
         Do the report with the statics saved.
@@ -56,3 +124,6 @@ class Report:
 
             f.write(f"There were {self.total_errors} errors in total.\n")
             f.write(f"{self.fixed_rows} rows has been fixed.")
+
+            for name, value in self.metrics.items():
+                f.write(f"\n{name}: {value}")
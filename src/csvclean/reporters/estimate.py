@@ -0,0 +1,103 @@
+import math
+
+from csvclean.models.data_register import ErrorTypes, LineError
+
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> tuple[float, float]:
+    """
+    Wilson score interval of a proportion, that stays inside [0, 1] and is reliable
+    for small samples and proportions near 0 or 1.
+
+    :param successes: Number of successes
+    :type successes: int
+    :param trials: Number of trials
+    :type trials: int
+    :param z: Quantile of the normal distribution, 1.96 for a 95% confidence
+    :type z: float
+    :return: Lower and upper bounds of the proportion
+    :rtype: tuple[float, float]
+    """
+    if trials == 0:
+        return 0.0, 1.0
+
+    proportion: float = successes / trials
+    denominator: float = 1 + z * z / trials
+    center: float = (proportion + z * z / (2 * trials)) / denominator
+    margin: float = (
+        z * math.sqrt(proportion * (1 - proportion) / trials + z * z / (4 * trials * trials))
+    ) / denominator
+
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class SampleEstimate:
+    """
+    Estimation of the error rates of a csv from the validation of a sample of its rows.
+
+    :attribute rows: Rows of the sample
+    :type rows: int
+    :attribute rejected: Rows of the sample rejected by the cleaners
+    :type rejected: int
+    :attribute rows_with_errors: Rows of the sample with some error
+    :type rows_with_errors: int
+    :attribute rows_by_error: Rows of the sample with each type of error
+    :type rows_by_error: dict[ErrorTypes, int]
+    :attribute z: Quantile of the normal distribution of the intervals
+    :type z: float
+    """
+
+    def __init__(self, z: float = 1.96):
+        self.rows = 0
+        self.rejected = 0
+        self.rows_with_errors = 0
+        self.rows_by_error: dict[ErrorTypes, int] = {}
+        self.z = z
+
+    def add(self, errors: LineError, rejected: bool):
+        """
+        Count one sampled row.
+
+        :param errors: Errors detected in the row
+        :type errors: LineError
+        :param rejected: True if the cleaners rejected the row
+        :type rejected: bool
+        """
+        self.rows += 1
+        self.rejected += rejected
+        self.rows_with_errors += bool(errors)
+
+        for error in set(errors.values()):
+            self.rows_by_error[error] = self.rows_by_error.get(error, 0) + 1
+
+    def rates(self) -> dict[str, tuple[float, float, float]]:
+        """
+        Estimated fraction of rows of the csv rejected, with errors and with each type
+        of error, with their confidence intervals.
+
+        :return: Name of the rate and its estimation, lower and upper bounds
+        :rtype: dict[str, tuple[float, float, float]]
+        """
+        counts: dict[str, int] = {"rejected": self.rejected, "with_errors": self.rows_with_errors}
+        counts.update({error.name: count for error, count in self.rows_by_error.items()})
+
+        return {
+            name: (
+                count / self.rows if self.rows else 0.0,
+                *wilson_interval(count, self.rows, self.z),
+            )
+            for name, count in counts.items()
+        }
+
+    def format(self) -> str:
+        """
+        Text with the estimated rates.
+
+        :return: One line per rate
+        :rtype: str
+        """
+        lines: list[str] = [f"Sampled {self.rows} rows."]
+        lines.extend(
+            f"{name}: {rate:.2%} [{low:.2%}, {high:.2%}]"
+            for name, (rate, low, high) in self.rates().items()
+        )
+        return "\n".join(lines)
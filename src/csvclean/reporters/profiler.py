@@ -0,0 +1,205 @@
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+from csvclean.models.data_register import TYPE_MAP
+from csvclean.validators.memo import MemoCache
+from csvclean.validators.type_validator import TypeValidator
+
+from .sketches import HyperLogLog, KLLSketch, MisraGries, RunningStats
+
+QUANTILES = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+
+def _as_number(value: str) -> float | None:
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+class ColumnProfile:
+    """
+    Statistics of one column, kept in sketches of bounded memory.
+
+    :attribute name: Name of the column
+    :type name: str
+    :attribute count: Values seen
+    :type count: int
+    :attribute nulls: Empty values
+    :type nulls: int
+    :attribute type_matches: Not empty values that conform to each type of TYPE_MAP
+    :type type_matches: dict[str, int]
+    :attribute numbers: Statistics of the numeric values
+    :type numbers: RunningStats
+    :attribute distinct: Distinct not empty values
+    :type distinct: HyperLogLog
+    :attribute frequent: Most frequent not empty values
+    :type frequent: MisraGries
+    :attribute quantiles: Quantiles of the numeric values
+    :type quantiles: KLLSketch
+    :attribute type_memo: Memo of the types each value conforms to
+    :type type_memo: MemoCache
+    """
+
+    _type_validator = TypeValidator()
+
+    def __init__(self, name: str, top_k: int = 10, precision: int = 12, quantile_k: int = 200):
+        self.name = name
+        self.count = 0
+        self.nulls = 0
+        self.type_matches: dict[str, int] = dict.fromkeys(TYPE_MAP, 0)
+        self.numbers = RunningStats()
+        self.distinct = HyperLogLog(precision)
+        self.frequent = MisraGries(top_k)
+        self.quantiles = KLLSketch(quantile_k)
+        self.type_memo = MemoCache(self._matching_types)
+
+    def _matching_types(self, value: str) -> tuple[str, ...]:
+        return tuple(
+            type_name
+            for type_name, expected_type in TYPE_MAP.items()
+            if not self._type_validator.is_incorrect_type(value, expected_type)
+        )
+
+    def add(self, value: str):
+        """
+        Add a value of the column.
+
+        :param value: Value as it was read
+        :type value: str
+        """
+        self.count += 1
+
+        if value == "":
+            self.nulls += 1
+            return
+
+        for type_name in self.type_memo(value):
+            self.type_matches[type_name] += 1
+
+        self.distinct.add(value)
+        self.frequent.add(value)
+
+        number: float | None = _as_number(value)
+        if number is not None:
+            self.numbers.add(number)
+            self.quantiles.add(number)
+
+    def merge(self, other: "ColumnProfile"):
+        """
+        Add the statistics of the same column in another shard.
+
+        :param other: Profile of the other shard
+        :type other: ColumnProfile
+        """
+        self.count += other.count
+        self.nulls += other.nulls
+        for type_name, matches in other.type_matches.items():
+            self.type_matches[type_name] += matches
+
+        self.numbers.merge(other.numbers)
+        self.distinct.merge(other.distinct)
+        self.frequent.merge(other.frequent)
+        self.quantiles.merge(other.quantiles)
+        self.type_memo.hits += other.type_memo.hits
+        self.type_memo.misses += other.type_memo.misses
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summary of the column.
+
+        :return: Summary that can be saved as json
+        :rtype: dict[str, Any]
+        """
+        summary: dict[str, Any] = {
+            "count": self.count,
+            "nulls": self.nulls,
+            "type_matches": self.type_matches,
+            "distinct": self.distinct.cardinality(),
+            "top": self.frequent.top(),
+            "type_memo_hit_rate": round(self.type_memo.hit_rate, 4),
+        }
+
+        if self.numbers.count:
+            summary["numeric"] = {
+                "count": self.numbers.count,
+                "min": self.numbers.minimum,
+                "max": self.numbers.maximum,
+                "mean": self.numbers.mean,
+                "variance": self.numbers.variance,
+                "quantiles": {str(q): self.quantiles.quantile(q) for q in QUANTILES},
+            }
+
+        return summary
+
+
+class DataProfiler:
+    """
+    Profile of a csv in one streaming pass, with one ColumnProfile per column.
+    Profiles of shards of the same csv can be merged.
+
+    :attribute header: Names of the columns
+    :type header: list[str]
+    :attribute rows: Rows seen
+    :type rows: int
+    :attribute columns: Profile of each column
+    :type columns: list[ColumnProfile]
+    """
+
+    def __init__(self, header: list[str], **sketch_options: int):
+        """
+        :param header: Names of the columns
+        :type header: list[str]
+        :param sketch_options: Sizes of the sketches (top_k, precision and quantile_k)
+        :type sketch_options: int
+        """
+        self.header = header
+        self.rows = 0
+        self.columns = [ColumnProfile(name, **sketch_options) for name in header]
+
+    def add_row(self, row: list[str]):
+        """
+        Add a row of the csv.
+
+        :param row: Row as it was read
+        :type row: list[str]
+        """
+        self.rows += 1
+        for column, value in zip(self.columns, row, strict=False):
+            column.add(value)
+
+    def merge(self, other: "DataProfiler"):
+        """
+        Add the profile of another shard of the same csv.
+
+        :param other: Profile of the other shard
+        :type other: DataProfiler
+        """
+        if other.header != self.header:
+            raise ValueError("Only profiles with the same header can be merged.")
+
+        self.rows += other.rows
+        for column, other_column in zip(self.columns, other.columns, strict=True):
+            column.merge(other_column)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summary of the csv.
+
+        :return: Summary that can be saved as json
+        :rtype: dict[str, Any]
+        """
+        return {"rows": self.rows, "columns": {c.name: c.to_dict() for c in self.columns}}
+
+    def write(self, profile_path: str):
+        """
+        Save the summary as json.
+
+        :param profile_path: Path of the json
+        :type profile_path: str
+        """
+        with Path(profile_path).open("w", encoding="utf-8") as profile_file:
+            json.dump(self.to_dict(), profile_file, indent=2, ensure_ascii=False)
@@ -0,0 +1,249 @@
+import os
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TextIO
+
+from csvclean.models.options import ProgressOptions
+
+from .cleaning_report import Report
+
+PROMETHEUS_METRICS: list[tuple[str, str, str]] = [
+    ("input_bytes", "gauge", "Size of the input in bytes."),
+    ("bytes_read_total", "counter", "Bytes of the input consumed."),
+    ("rows_processed_total", "counter", "Rows read from the input."),
+    ("rows_written_total", "counter", "Rows sent to the clean output."),
+    ("rows_rejected_total", "counter", "Rows rejected by the cleaners."),
+    ("rows_per_second", "gauge", "Moving average of the processed rows per second."),
+    ("eta_seconds", "gauge", "Estimated seconds until the input is consumed."),
+]
+# Only written when a memory governor watches the run.
+MEMORY_METRIC: tuple[str, str, str] = ("memory_bytes", "gauge", "Memory used by the run.")
+
+
+def _format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "--:--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def _prometheus_value(value: float) -> str:
+    """Exact text of a sample: all the digits of the counters and the shortest float."""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class ProgressTracker:
+    """
+    Progress of a run: bytes consumed against the input size, rows processed, written
+    and rejected, moving average of the rates and ETA. The hot loop only increments
+    counters; the clock is read every sample_every rows and the outputs are updated
+    at most once per interval.
+
+    :attribute total_bytes: Size of the input in bytes
+    :type total_bytes: int
+    :attribute rows: Rows processed
+    :type rows: int
+    :attribute written: Rows sent to the clean output
+    :type written: int
+    :attribute rejected: Rows rejected by the cleaners
+    :type rejected: int
+    :attribute rows_per_second: Moving average of the processed rows per second
+    :type rows_per_second: float
+    :attribute bytes_per_second: Moving average of the consumed bytes per second
+    :type bytes_per_second: float
+    :attribute memory_usage: Function that returns the memory used by the run, if a
+        memory governor watches it
+    :type memory_usage: Callable[[], int] | None
+    """
+
+    def __init__(
+        self,
+        total_bytes: int,
+        bytes_read: Callable[[], int],
+        options: ProgressOptions,
+        stream: TextIO | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param total_bytes: Size of the input in bytes
+        :type total_bytes: int
+        :param bytes_read: Function that returns the bytes of the input consumed
+        :type bytes_read: Callable[[], int]
+        :param options: Options of the progress
+        :type options: ProgressOptions
+        :param stream: Stream of the progress lines, stderr if None
+        :type stream: TextIO | None
+        :param clock: Monotonic clock in seconds
+        :type clock: Callable[[], float]
+        """
+        self.total_bytes = total_bytes
+        self.bytes_read = bytes_read
+        self.options = options
+        self.stream: TextIO | None = (stream or sys.stderr) if options.stderr else None
+        self.clock = clock
+
+        self.rows = 0
+        self.written = 0
+        self.rejected = 0
+        self.rows_per_second = 0.0
+        self.bytes_per_second = 0.0
+        self.memory_usage: Callable[[], int] | None = None
+
+        self._next_sample: int = options.sample_every
+        self._start: float = clock()
+        self._last_time: float = self._start
+        self._last_rows = 0
+        self._last_bytes = 0
+        self._has_rates = False
+
+    def count(self, written: bool):
+        """
+        Count one processed row.
+
+        :param written: True if the row was sent to the clean output
+        :type written: bool
+        """
+        self.count_many(int(written), int(not written))
+
+    def count_many(self, written: int, rejected: int):
+        """
+        Count the processed rows of a batch.
+
+        :param written: Rows sent to the clean output
+        :type written: int
+        :param rejected: Rows rejected by the cleaners
+        :type rejected: int
+        """
+        self.rows += written + rejected
+        self.written += written
+        self.rejected += rejected
+
+        if self.rows >= self._next_sample:
+            self._next_sample = self.rows + self.options.sample_every
+            self.sample()
+
+    def sample(self, force: bool = False):
+        """
+        Update the rates and the outputs if the interval has passed.
+
+        :param force: Update even if the interval has not passed
+        :type force: bool
+        """
+        now: float = self.clock()
+        elapsed: float = now - self._last_time
+
+        if elapsed < self.options.interval and not force:
+            return
+
+        bytes_now: int = self.bytes_read()
+
+        if elapsed > 0:
+            self._update_rates(
+                (self.rows - self._last_rows) / elapsed, (bytes_now - self._last_bytes) / elapsed
+            )
+
+        self._last_time, self._last_rows, self._last_bytes = now, self.rows, bytes_now
+        self.emit()
+
+    def _update_rates(self, rows_rate: float, bytes_rate: float):
+        """Exponential moving average of the rates, started with the first sample."""
+        if not self._has_rates:
+            self.rows_per_second, self.bytes_per_second = rows_rate, bytes_rate
+            self._has_rates = True
+            return
+
+        weight: float = self.options.smoothing
+        self.rows_per_second += weight * (rows_rate - self.rows_per_second)
+        self.bytes_per_second += weight * (bytes_rate - self.bytes_per_second)
+
+    @property
+    def eta(self) -> float | None:
+        """Estimated seconds until the input is consumed, None without a rate."""
+        if self.bytes_per_second <= 0:
+            return None
+        return max(self.total_bytes - self._last_bytes, 0) / self.bytes_per_second
+
+    def format_line(self) -> str:
+        """
+        Human readable progress line.
+
+        :return: Progress line
+        :rtype: str
+        """
+        percent: float = 100 * self._last_bytes / self.total_bytes if self.total_bytes else 100.0
+        line: str = (
+            f"[csvclean] {percent:5.1f}% {self._last_bytes}/{self.total_bytes} bytes | "
+            f"{self.rows} rows ({self.written} written, {self.rejected} rejected) | "
+            f"{self.rows_per_second:.0f} rows/s | ETA {_format_duration(self.eta)}"
+        )
+
+        if self.memory_usage is not None:
+            line += f" | {self.memory_usage() / (1024 * 1024):.0f} MiB"
+        return line
+
+    def prometheus_text(self) -> str:
+        """
+        Metrics of the run in the Prometheus text format.
+
+        :return: Text of the metrics file
+        :rtype: str
+        """
+        eta: float | None = self.eta
+        values: dict[str, float] = {
+            "input_bytes": self.total_bytes,
+            "bytes_read_total": self._last_bytes,
+            "rows_processed_total": self.rows,
+            "rows_written_total": self.written,
+            "rows_rejected_total": self.rejected,
+            "rows_per_second": self.rows_per_second,
+            "eta_seconds": eta if eta is not None else float("nan"),
+        }
+        metrics: list[tuple[str, str, str]] = PROMETHEUS_METRICS
+        lines: list[str] = []
+
+        if self.memory_usage is not None:
+            values["memory_bytes"] = self.memory_usage()
+            metrics = [*metrics, MEMORY_METRIC]
+
+        for name, kind, description in metrics:
+            lines.append(f"# HELP csvclean_{name} {description}")
+            lines.append(f"# TYPE csvclean_{name} {kind}")
+            lines.append(f"csvclean_{name} {_prometheus_value(values[name])}")
+
+        return "\n".join(lines) + "\n"
+
+    def _write_prometheus(self, path: Path):
+        """Replace the metrics file atomically, so scrapers never read half a file."""
+        temporal_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporal_path.write_text(self.prometheus_text(), encoding="utf-8")
+        temporal_path.replace(path)
+
+    def emit(self):
+        """Write the progress to the enabled outputs."""
+        if self.stream is not None:
+            self.stream.write(self.format_line() + "\n")
+            self.stream.flush()
+
+        if self.options.prometheus_path is not None:
+            self._write_prometheus(Path(self.options.prometheus_path))
+
+    def finish(self, reporter: Report | None = None):
+        """
+        Emit the final progress and save the totals as metrics of the report.
+
+        :param reporter: Report of the run
+        :type reporter: Report | None
+        """
+        self.sample(force=True)
+
+        if reporter is None:
+            return
+
+        reporter.record_metric("progress_rows", self.rows)
+        reporter.record_metric("progress_bytes", self._last_bytes)
+        reporter.record_metric(
+            "progress_rows_per_second", round(self.rows / max(self._last_time - self._start, 1e-9))
+        )
@@ -0,0 +1,295 @@
+import hashlib
+import math
+import random
+from collections.abc import Iterator
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+class RunningStats:
+    """
+    Count, minimum, maximum, mean and variance of a stream of numbers, with the
+    Welford update and the parallel formula of Chan et al. to merge shards.
+
+    :attribute count: Numbers added
+    :type count: int
+    :attribute mean: Mean of the numbers
+    :type mean: float
+    :attribute minimum: Minimum of the numbers, None if empty
+    :type minimum: float | None
+    :attribute maximum: Maximum of the numbers, None if empty
+    :type maximum: float | None
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+
+    def add(self, value: float):
+        """
+        Add a number to the statistics.
+
+        :param value: Number to add
+        :type value: float
+        """
+        self.count += 1
+        delta: float = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, 0 with less than two numbers."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def merge(self, other: "RunningStats"):
+        """
+        Add the numbers of another shard.
+
+        :param other: Statistics of the other shard
+        :type other: RunningStats
+        """
+        if other.count == 0:
+            return
+
+        total: int = self.count + other.count
+        delta: float = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.minimum = min(v for v in (self.minimum, other.minimum) if v is not None)
+        self.maximum = max(v for v in (self.maximum, other.maximum) if v is not None)
+
+
+class HyperLogLog:
+    """
+    Approximate count of distinct values in 2**precision registers of one byte.
+    The standard error is about 1.04 / sqrt(2**precision).
+
+    :attribute precision: Bits of the hash that choose the register
+    :type precision: int
+    """
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("The precision of HyperLogLog must be between 4 and 16.")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str):
+        """
+        Add a value to the sketch.
+
+        :param value: Value to add
+        :type value: str
+        """
+        hashed: int = _hash64(value)
+        index: int = hashed >> (64 - self.precision)
+        rest: int = hashed & ((1 << (64 - self.precision)) - 1)
+        rank: int = 64 - self.precision - rest.bit_length() + 1
+
+        self.registers[index] = max(self.registers[index], rank)
+
+    def cardinality(self) -> int:
+        """
+        Estimated number of distinct values.
+
+        :return: Estimation
+        :rtype: int
+        """
+        size: int = len(self.registers)
+        alpha: float = 0.7213 / (1 + 1.079 / size)
+        estimate: float = alpha * size * size / sum(2.0**-register for register in self.registers)
+        zeros: int = self.registers.count(0)
+
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+
+        return round(estimate)
+
+    def merge(self, other: "HyperLogLog"):
+        """
+        Add the values of another shard.
+
+        :param other: Sketch of the other shard, with the same precision
+        :type other: HyperLogLog
+        """
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged.")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+
+class MisraGries:
+    """
+    Frequent values with k counters. Every value more frequent than count / (k + 1)
+    is kept, and each counter underestimates its value by at most that amount.
+
+    :attribute k: Number of counters
+    :type k: int
+    :attribute count: Values added
+    :type count: int
+    """
+
+    def __init__(self, k: int = 10):
+        self.k = k
+        self.count = 0
+        self.counters: dict[str, int] = {}
+
+    def add(self, value: str):
+        """
+        Add a value to the sketch.
+
+        :param value: Value to add
+        :type value: str
+        """
+        self.count += 1
+
+        if value in self.counters:
+            self.counters[value] += 1
+        elif len(self.counters) < self.k:
+            self.counters[value] = 1
+        else:
+            self.counters = {key: count - 1 for key, count in self.counters.items() if count > 1}
+
+    def merge(self, other: "MisraGries"):
+        """
+        Add the values of another shard, keeping k counters.
+
+        :param other: Sketch of the other shard
+        :type other: MisraGries
+        """
+        self.count += other.count
+        for value, count in other.counters.items():
+            self.counters[value] = self.counters.get(value, 0) + count
+
+        if len(self.counters) > self.k:
+            cut: int = sorted(self.counters.values(), reverse=True)[self.k]
+            self.counters = {
+                value: count - cut for value, count in self.counters.items() if count > cut
+            }
+
+    def top(self, n: int | None = None) -> list[tuple[str, int]]:
+        """
+        Most frequent values, with their estimated counts.
+
+        :param n: Number of values, all the counters if None
+        :type n: int | None
+        :return: Values and counts from the most frequent
+        :rtype: list[tuple[str, int]]
+        """
+        return sorted(self.counters.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+
+class KLLSketch:
+    """
+    Approximate quantiles with the KLL sketch: a hierarchy of compactors where the
+    items of level h weigh 2**h. When a compactor is full, its sorted items are
+    halved into the next level, taking the odd or even ones at random.
+
+    :attribute k: Capacity of the top compactor, higher is more precise
+    :type k: int
+    :attribute count: Numbers added
+    :type count: int
+    """
+
+    def __init__(self, k: int = 200, seed: int | None = None):
+        self.k = k
+        self.count = 0
+        self.compactors: list[list[float]] = [[]]
+        self._size = 0
+        self._max_size: int = self._capacity(0)
+        self._random = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth: int = len(self.compactors) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _add_level(self):
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def add(self, value: float):
+        """
+        Add a number to the sketch.
+
+        :param value: Number to add
+        :type value: float
+        """
+        self.count += 1
+        self.compactors[0].append(value)
+        self._size += 1
+
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compact(self, level: int):
+        """Halve one compactor into the next level, keeping one item back if odd."""
+        if level + 1 == len(self.compactors):
+            self._add_level()
+
+        items: list[float] = sorted(self.compactors[level])
+        kept: list[float] = items[-1:] if len(items) % 2 else []
+        paired: list[float] = items[: len(items) - len(kept)]
+        promoted: list[float] = paired[self._random.randint(0, 1) :: 2]
+
+        self.compactors[level] = kept
+        self.compactors[level + 1].extend(promoted)
+        self._size -= len(paired) - len(promoted)
+
+    def _compress(self):
+        while self._size >= self._max_size:
+            for level in range(len(self.compactors)):
+                if len(self.compactors[level]) >= self._capacity(level):
+                    self._compact(level)
+                    break
+
+    def merge(self, other: "KLLSketch"):
+        """
+        Add the numbers of another shard.
+
+        :param other: Sketch of the other shard
+        :type other: KLLSketch
+        """
+        while len(self.compactors) < len(other.compactors):
+            self._add_level()
+
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+
+        self.count += other.count
+        self._size += other._size
+        self._compress()
+
+    def _weighted_items(self) -> Iterator[tuple[float, int]]:
+        for level, items in enumerate(self.compactors):
+            yield from ((item, 1 << level) for item in items)
+
+    def quantile(self, fraction: float) -> float | None:
+        """
+        Approximate quantile of the numbers.
+
+        :param fraction: Quantile between 0 and 1, e.g. 0.5 for the median
+        :type fraction: float
+        :return: Number at that quantile, None if empty
+        :rtype: float | None
+        """
+        weighted: list[tuple[float, int]] = sorted(self._weighted_items())
+        if not weighted:
+            return None
+
+        target: float = fraction * sum(weight for _, weight in weighted)
+        accumulated: int = 0
+
+        for item, weight in weighted:
+            accumulated += weight
+            if accumulated >= target:
+                return item
+
+        return weighted[-1][0]
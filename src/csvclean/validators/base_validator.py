@@ -5,7 +5,5 @@ from csvclean.models.data_register import LineError
 
 
 class BaseValidator(ABC):
-
     @abstractmethod
     def validate_line(self, line: list[str], config: Configuration) -> LineError: ...
-
@@ -0,0 +1,191 @@
+from datetime import date, datetime
+from functools import lru_cache
+
+from csvclean.models.config import Configuration
+
+# Format of the date and datetime columns without a format in the config.
+DEFAULT_DATE_FORMATS: dict[type, str] = {date: "%Y-%m-%d", datetime: "%Y-%m-%d %H:%M:%S"}
+
+# Digits of each supported directive, all of them of fixed width.
+DIRECTIVE_WIDTHS: dict[str, int] = {"Y": 4, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2, "f": 6}
+TIME_LIMITS: dict[str, int] = {"H": 23, "M": 59, "S": 59}
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _is_real_date(year: int, month: int, day: int) -> bool:
+    """Check the day exists in the calendar, with the gregorian leap years."""
+    if year < 1 or not 1 <= month <= 12:
+        return False
+
+    leap: bool = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    days: int = 29 if month == 2 and leap else DAYS_IN_MONTH[month - 1]
+    return 1 <= day <= days
+
+
+class DateFormat:
+    """
+    Format of a date or datetime column made of fixed-width fields, like "%d/%m/%Y" or
+    "%Y-%m-%dT%H:%M:%S". The format is compiled once to the slices of its fields and the
+    positions of its literal characters, so a value is parsed by slicing and checked
+    against the calendar, without strptime.
+
+    :attribute pattern: Format as declared in the config
+    :type pattern: str
+    :attribute width: Number of characters of the values
+    :type width: int
+    :attribute fields: Directive and slice of each field
+    :type fields: list[tuple[str, slice]]
+    :attribute literals: Position and character of each literal
+    :type literals: list[tuple[int, str]]
+    """
+
+    __slots__ = ("fields", "has_time", "literals", "pattern", "width")
+
+    def __init__(self, pattern: str):
+        """
+        :param pattern: Format with the directives %Y, %m, %d, %H, %M, %S, %f and %%
+        :type pattern: str
+        :raises ValueError: If the format has other directives, or lacks %Y, %m or %d
+        """
+        self.pattern = pattern
+        self.fields: list[tuple[str, slice]] = []
+        self.literals: list[tuple[int, str]] = []
+        position: int = 0
+        characters = iter(pattern)
+
+        for character in characters:
+            directive: str | None = next(characters, "%") if character == "%" else None
+
+            if directive is None or directive == "%":
+                self.literals.append((position, character))
+                position += 1
+            elif directive in DIRECTIVE_WIDTHS:
+                width: int = DIRECTIVE_WIDTHS[directive]
+                self.fields.append((directive, slice(position, position + width)))
+                position += width
+            else:
+                raise ValueError(f"Not supported date directive: %{directive}")
+
+        directives: list[str] = [directive for directive, _ in self.fields]
+        if len(set(directives)) != len(directives) or not {"Y", "m", "d"} <= set(directives):
+            raise ValueError(f"The date format {pattern} needs %Y, %m and %d once each.")
+
+        self.width = position
+        self.has_time: bool = any(directive in TIME_LIMITS for directive in directives)
+
+    def _split(self, value: str) -> dict[str, int] | None:
+        """Numbers of the fields of a value, None if it doesn't have the format."""
+        if len(value) != self.width:
+            return None
+
+        if any(value[position] != character for position, character in self.literals):
+            return None
+
+        numbers: dict[str, int] = {}
+
+        for directive, part in self.fields:
+            digits: str = value[part]
+            if not (digits.isascii() and digits.isdigit()):
+                return None
+            numbers[directive] = int(digits)
+
+        return numbers
+
+    def parse(self, value: str) -> tuple[int, int, int, int, int, int, int] | None:
+        """
+        Parse a value of the column.
+
+        :param value: Value to parse
+        :type value: str
+        :return: Year, month, day, hour, minute, second and microsecond, None if the
+            value doesn't have the format or isn't a real date and time
+        :rtype: tuple[int, int, int, int, int, int, int] | None
+        """
+        numbers: dict[str, int] | None = self._split(value)
+
+        if numbers is None or not _is_real_date(numbers["Y"], numbers["m"], numbers["d"]):
+            return None
+
+        if any(numbers.get(directive, 0) > limit for directive, limit in TIME_LIMITS.items()):
+            return None
+
+        return (
+            numbers["Y"],
+            numbers["m"],
+            numbers["d"],
+            numbers.get("H", 0),
+            numbers.get("M", 0),
+            numbers.get("S", 0),
+            numbers.get("f", 0),
+        )
+
+    def is_incorrect(self, value: str) -> bool:
+        """
+        Check if a value is not a real date and time with the format.
+
+        :param value: Value to check
+        :type value: str
+        :return: True if the value can't be parsed
+        :rtype: bool
+        """
+        return self.parse(value) is None
+
+    def to_iso(self, value: str) -> str:
+        """
+        Write a value in ISO 8601, as "YYYY-MM-DD" or "YYYY-MM-DDTHH:MM:SS[.ffffff]" if
+        the format has a time.
+
+        :param value: Value of the column
+        :type value: str
+        :return: Value in ISO 8601, the value itself if it can't be parsed
+        :rtype: str
+        """
+        fields = self.parse(value)
+
+        if fields is None:
+            return value
+
+        year, month, day, hour, minute, second, microsecond = fields
+        iso: str = f"{year:04d}-{month:02d}-{day:02d}"
+
+        if self.has_time:
+            iso += f"T{hour:02d}:{minute:02d}:{second:02d}"
+        if any(directive == "f" for directive, _ in self.fields):
+            iso += f".{microsecond:06d}"
+
+        return iso
+
+
+@lru_cache(maxsize=64)
+def compile_date_format(pattern: str) -> DateFormat:
+    """
+    Compile a date format, once per pattern.
+
+    :param pattern: Format with fixed-width directives
+    :type pattern: str
+    :return: Compiled format
+    :rtype: DateFormat
+    :raises ValueError: If the format is not supported
+    """
+    return DateFormat(pattern)
+
+
+def column_date_format(config: Configuration, column_number: int) -> DateFormat | None:
+    """
+    Format of a date or datetime column, the one of the config or the default one.
+
+    :param config: Configuration with the types and the date formats
+    :type config: Configuration
+    :param column_number: Position of the column
+    :type column_number: int
+    :return: Compiled format, None if the column isn't a date or datetime column
+    :rtype: DateFormat | None
+    """
+    if column_number >= len(config.header_types):
+        return None
+
+    default: str | None = DEFAULT_DATE_FORMATS.get(config.header_types[column_number])
+    if default is None:
+        return None
+
+    return compile_date_format(config.date_formats.get(column_number, default))
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class MemoCache:
+    """
+    Bounded LRU memo of a function of one cell value, for the columns with few
+    distinct values (status, country, flags...), where a repeated value is resolved
+    with one dict lookup. After warmup lookups, the cache turns itself off if its
+    hit rate is below min_hit_rate, so high cardinality columns don't pay for it.
+
+    :attribute function: Memoized function
+    :type function: Callable[[Hashable], Any]
+    :attribute max_size: Maximum number of cached values
+    :type max_size: int
+    :attribute min_hit_rate: Hit rate needed to keep the cache on
+    :type min_hit_rate: float
+    :attribute warmup: Lookups before the hit rate is checked
+    :type warmup: int
+    :attribute enabled: False once the cache turned itself off
+    :type enabled: bool
+    :attribute hits: Lookups resolved by the cache
+    :type hits: int
+    :attribute misses: Lookups that called the function while the cache was on
+    :type misses: int
+    """
+
+    __slots__ = (
+        "_values",
+        "enabled",
+        "function",
+        "hits",
+        "max_size",
+        "min_hit_rate",
+        "misses",
+        "warmup",
+    )
+
+    def __init__(
+        self,
+        function: Callable[[Hashable], Any],
+        max_size: int = 1024,
+        min_hit_rate: float = 0.5,
+        warmup: int = 10000,
+    ):
+        self.function = function
+        self.max_size = max_size
+        self.min_hit_rate = min_hit_rate
+        self.warmup = warmup
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._values: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def __call__(self, value: Hashable) -> Any:
+        if not self.enabled:
+            return self.function(value)
+
+        result = self._values.get(value, _MISSING)
+
+        if result is not _MISSING:
+            self.hits += 1
+            self._values.move_to_end(value)
+            return result
+
+        self.misses += 1
+        result = self.function(value)
+        self._values[value] = result
+
+        if len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+        if self.hits + self.misses >= self.warmup and self.hit_rate < self.min_hit_rate:
+            self.enabled = False
+            self._values.clear()
+
+        return result
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the lookups resolved by the cache, 0 without lookups."""
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
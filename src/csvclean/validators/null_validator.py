@@ -36,3 +36,15 @@ class NullValidator(BaseValidator):
                 null_errors[column_number] = ErrorTypes.NULL
 
         return null_errors
+
+    def validate_column(self, values: list[str]) -> list[int]:
+        """
+        Find the null values of a column of a batch
+
+        :param values: Values of the column
+        :type values: list[str]
+        :return: Indexes of the rows with a null value
+        :rtype: list[int]
+        """
+
+        return [index for index, value in enumerate(values) if self.is_null(value)]
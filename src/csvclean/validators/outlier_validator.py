@@ -0,0 +1,240 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Iterable
+
+from csvclean.models.config import Configuration, OutlierSpec
+from csvclean.models.data_register import ErrorTypes, LineError
+from csvclean.reporters.sketches import KLLSketch, RunningStats
+
+from .base_validator import BaseValidator
+
+DEFAULT_THRESHOLDS: dict[str, float] = {"zscore": 3.0, "mad": 3.5, "iqr": 1.5}
+
+# Values seen by a streaming detector before it flags any value.
+MIN_VALUES = 30
+
+# Scale of the median absolute deviation to the standard deviation of a normal distribution.
+MAD_SCALE = 0.6745
+
+
+def _parse_number(value: str) -> float | None:
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+class OutlierDetector(ABC):
+    """Detector of the outliers of one numeric column, with constant memory."""
+
+    @abstractmethod
+    def is_outlier(self, value: float) -> bool:
+        """
+        Check a value of the column, adding it to the statistics of the detector.
+
+        :param value: Value of the column
+        :type value: float
+        :return: True if the value is an outlier
+        :rtype: bool
+        """
+
+
+class ZScoreDetector(OutlierDetector):
+    """
+    Flag the values further from the running mean than threshold standard deviations,
+    with the Welford mean and variance of the values seen so far.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.stats = RunningStats()
+
+    def is_outlier(self, value: float) -> bool:
+        stats: RunningStats = self.stats
+        outlier: bool = stats.count >= MIN_VALUES and abs(value - stats.mean) > (
+            self.threshold * math.sqrt(stats.variance)
+        )
+        stats.add(value)
+        return outlier
+
+
+class MADDetector(OutlierDetector):
+    """
+    Flag the values whose modified z-score, from the median and the median absolute
+    deviation of a sliding window, is above threshold. The median and the deviation
+    are recomputed every tenth of the window, so the cost per value is constant.
+    """
+
+    def __init__(self, threshold: float, window: int):
+        self.threshold = threshold
+        self.window: deque[float] = deque(maxlen=window)
+        self._refresh_every: int = max(1, window // 10)
+        self._pending = 0
+        self._median = 0.0
+        self._deviation = 0.0
+
+    def _refresh(self):
+        values: list[float] = sorted(self.window)
+        self._median = values[len(values) // 2]
+        deviations: list[float] = sorted(abs(value - self._median) for value in values)
+        self._deviation = deviations[len(deviations) // 2]
+        self._pending = 0
+
+    def is_outlier(self, value: float) -> bool:
+        outlier: bool = self._deviation > 0 and (
+            MAD_SCALE * abs(value - self._median) / self._deviation > self.threshold
+        )
+        self.window.append(value)
+        self._pending += 1
+
+        if self._pending >= self._refresh_every and len(self.window) >= MIN_VALUES:
+            self._refresh()
+
+        return outlier
+
+
+class FenceDetector(OutlierDetector):
+    """Flag the values out of fixed fences, computed in a first pass over the input."""
+
+    def __init__(self, low: float, high: float):
+        self.low = low
+        self.high = high
+
+    def is_outlier(self, value: float) -> bool:
+        return value < self.low or value > self.high
+
+
+def _streaming_detector(spec: OutlierSpec) -> OutlierDetector:
+    threshold: float = spec.threshold or DEFAULT_THRESHOLDS[spec.method]
+    if spec.method == "mad":
+        return MADDetector(threshold, spec.window)
+    return ZScoreDetector(threshold)
+
+
+class OutlierValidator(BaseValidator):
+    """
+    Validate the numeric columns of the outliers section of the config. The "zscore"
+    and "mad" detectors learn while the rows stream; the "iqr" ones need the fences
+    computed by fit in a first pass, and check nothing until then.
+
+    :attribute detectors: Detector of each checked column
+    :type detectors: dict[int, OutlierDetector]
+    """
+
+    def __init__(self):
+        self.detectors: dict[int, OutlierDetector] = {}
+        self._built_config: Configuration | None = None
+
+    def build(self, config: Configuration):
+        """
+        Create the streaming detectors of the config, once per configuration.
+
+        :param config: Configuration with the declared outlier detectors
+        :type config: Configuration
+        """
+        if self._built_config is config:
+            return
+
+        self.detectors = {
+            spec.column: _streaming_detector(spec)
+            for spec in config.outliers
+            if spec.method != "iqr"
+        }
+        self._built_config = config
+
+    def fit(self, rows: Iterable[list[str]], config: Configuration):
+        """
+        Compute the fences of the "iqr" detectors from the quartiles of their columns,
+        estimated with a KLL sketch in one pass over the rows.
+
+        :param rows: Rows of the input, in the order of the columns of the config
+        :type rows: Iterable[list[str]]
+        :param config: Configuration with the declared outlier detectors
+        :type config: Configuration
+        """
+        self.build(config)
+        specs: list[OutlierSpec] = [spec for spec in config.outliers if spec.method == "iqr"]
+        sketches: dict[int, KLLSketch] = {spec.column: KLLSketch() for spec in specs}
+
+        for row in rows:
+            for column_number, sketch in sketches.items():
+                if column_number < len(row):
+                    number: float | None = _parse_number(row[column_number])
+                    if number is not None:
+                        sketch.add(number)
+
+        for spec in specs:
+            sketch = sketches[spec.column]
+            if sketch.count == 0:
+                continue
+
+            low, high = sketch.quantile(0.25), sketch.quantile(0.75)
+            spread: float = (spec.threshold or DEFAULT_THRESHOLDS["iqr"]) * (high - low)
+            self.detectors[spec.column] = FenceDetector(low - spread, high + spread)
+
+    def needs_fit(self, config: Configuration) -> bool:
+        """
+        Check if some detector of the config needs a first pass over the input.
+
+        :param config: Configuration with the declared outlier detectors
+        :type config: Configuration
+        :return: True if some detector is "iqr"
+        :rtype: bool
+        """
+        return any(spec.method == "iqr" for spec in config.outliers)
+
+    def validate_line(self, line: list[str], config: Configuration) -> LineError:
+        """
+        Validate there is not outliers in line
+
+        :param line: Line to check
+        :type line: list[str]
+        :param config: Configuration of validator
+        :type config: Configuration
+        :return: List of outlier errors in line
+        :rtype: LineError
+        """
+        self.build(config)
+
+        outlier_errors: LineError = {}
+
+        for column_number, detector in self.detectors.items():
+            if column_number >= len(line):
+                continue
+
+            number: float | None = _parse_number(line[column_number])
+            if number is not None and detector.is_outlier(number):
+                outlier_errors[column_number] = ErrorTypes.OUTLIER
+
+        return outlier_errors
+
+    def validate_columns(
+        self, columns: list[list[str]], config: Configuration
+    ) -> dict[int, list[int]]:
+        """
+        Find the outliers of the columns of a batch, in the order of the rows.
+
+        :param columns: Values of each column of the batch
+        :type columns: list[list[str]]
+        :param config: Configuration of validator
+        :type config: Configuration
+        :return: Indexes of the rows with an outlier, by column number
+        :rtype: dict[int, list[int]]
+        """
+        self.build(config)
+
+        column_errors: dict[int, list[int]] = {}
+
+        for column_number, detector in self.detectors.items():
+            if column_number >= len(columns):
+                continue
+
+            column_errors[column_number] = [
+                row
+                for row, value in enumerate(columns[column_number])
+                if (number := _parse_number(value)) is not None and detector.is_outlier(number)
+            ]
+
+        return column_errors
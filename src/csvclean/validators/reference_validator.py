@@ -0,0 +1,357 @@
+import csv
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from hashlib import blake2b, sha256
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO
+
+from csvclean.models.config import Configuration, ReferenceSpec
+from csvclean.models.data_register import ErrorTypes, LineError
+
+from .base_validator import BaseValidator
+
+INDEX_MAGIC = b"CSVREF01"
+# Magic, size and mtime of the reference csv and number of hashes. 32 bytes keep
+# the hashes aligned to 8 bytes.
+INDEX_HEADER = struct.Struct("<8sqqq")
+# Hashes sorted in memory at once while building an index, and read at once from each
+# sorted run while merging them.
+BUILD_CHUNK = 1 << 18
+MERGE_BLOCK = 1 << 14
+
+
+def default_index_dir() -> Path:
+    """
+    Directory of the reference indexes in the local cache of csvclean, following
+    XDG_CACHE_HOME when it is defined.
+
+    :return: Path of the index directory
+    :rtype: Path
+    """
+    cache_home: str = os.environ.get("XDG_CACHE_HOME", "") or str(Path.home() / ".cache")
+    return Path(cache_home) / "csvclean" / "references"
+
+
+def index_path_for(spec: ReferenceSpec, index_dir: str | None = None) -> Path:
+    """
+    Path of the index of a reference, named after the reference csv and a hash of its
+    absolute path and column, so references with the same name don't share an index.
+
+    :param spec: Reference declared in the config
+    :type spec: ReferenceSpec
+    :param index_dir: Directory of the indexes, the user cache if None
+    :type index_dir: str | None
+    :return: Path of the index file
+    :rtype: Path
+    """
+    reference_path = Path(spec.path).resolve()
+    digest: str = sha256(f"{reference_path}\0{spec.reference_column}".encode()).hexdigest()
+    directory = Path(index_dir) if index_dir else default_index_dir()
+    return directory / f"{reference_path.stem}-{digest[:16]}.idx"
+
+
+def hash_value(value: str) -> int:
+    """
+    64 bits hash of a value. With tens of millions of values the chance of a
+    false positive is still negligible.
+
+    :param value: Value to hash
+    :type value: str
+    :return: Hash of the value
+    :rtype: int
+    """
+    return int.from_bytes(blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _read_reference_values(reference_path: Path, reference_column: str) -> Iterable[str]:
+    """
+    Read the values of one column of the reference csv.
+
+    :param reference_path: Path of the reference csv
+    :type reference_path: Path
+    :param reference_column: Column by name or index
+    :type reference_column: str
+    :return: Values of the column
+    :rtype: Iterable[str]
+    """
+    with reference_path.open(newline="", encoding="utf-8") as reference_file:
+        first_line: str = reference_file.readline()
+        reference_file.seek(0)
+        delimiter: str = next((d for d in ",;\t" if d in first_line), ",")
+        reader = csv.reader(reference_file, delimiter=delimiter)
+        header: list[str] = next(reader, [])
+
+        if reference_column in header:
+            column = header.index(reference_column)
+        elif reference_column.isdigit():
+            column = int(reference_column)
+        else:
+            raise ValueError(f"Reference column not found: {reference_column}")
+
+        yield from (row[column] for row in reader if column < len(row))
+
+
+def _sorted_runs(values: Iterable[str], directory: Path) -> list[BinaryIO]:
+    """
+    Hash the values in chunks of BUILD_CHUNK and write each chunk sorted and without
+    repetitions in a temporary file, so the memory of the build doesn't grow with the
+    size of the reference.
+
+    :param values: Values of the reference column
+    :type values: Iterable[str]
+    :param directory: Directory of the temporary files
+    :type directory: Path
+    :return: Sorted runs, positioned at their start
+    :rtype: list[BinaryIO]
+    """
+    runs: list[BinaryIO] = []
+    iterator: Iterator[str] = iter(values)
+
+    while chunk := list(islice(iterator, BUILD_CHUNK)):
+        run = tempfile.TemporaryFile(dir=directory)  # noqa: SIM115
+        array("Q", sorted({hash_value(value) for value in chunk})).tofile(run)
+        run.seek(0)
+        runs.append(run)
+
+    return runs
+
+
+def _read_run(run: BinaryIO) -> Iterator[int]:
+    """Hashes of a sorted run, read by blocks of MERGE_BLOCK."""
+    while block := run.read(MERGE_BLOCK * 8):
+        yield from array("Q", block)
+
+
+class ReferenceIndex:
+    """
+    On disk index of the values of a reference csv: a sorted array of 64 bits hashes
+    that is memory mapped, so it is built once and opened instantly in the next runs.
+
+    :attribute index_path: Path of the index file
+    :type index_path: Path
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path = index_path
+        self._file = index_path.open("rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._hashes = memoryview(self._mmap)[INDEX_HEADER.size :].cast("Q")
+
+    @staticmethod
+    def _is_current(index_path: Path, reference_path: Path) -> bool:
+        if not index_path.exists():
+            return False
+
+        with index_path.open("rb") as index_file:
+            header = index_file.read(INDEX_HEADER.size)
+
+        if len(header) != INDEX_HEADER.size:
+            return False
+
+        magic, size, mtime, _ = INDEX_HEADER.unpack(header)
+        stat = reference_path.stat()
+        return magic == INDEX_MAGIC and size == stat.st_size and mtime == stat.st_mtime_ns
+
+    @staticmethod
+    def build(reference_path: Path, reference_column: str, index_path: Path) -> None:
+        """
+        Hash, sort and write the values of the reference column. The hashes are sorted
+        by chunks in temporary runs that are merged into the index, so only one chunk
+        is in memory at a time.
+
+        :param reference_path: Path of the reference csv
+        :type reference_path: Path
+        :param reference_column: Column by name or index
+        :type reference_column: str
+        :param index_path: Path of the index file
+        :type index_path: Path
+        """
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        values: Iterable[str] = _read_reference_values(reference_path, reference_column)
+        stat = reference_path.stat()
+        temporal_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        runs: list[BinaryIO] = _sorted_runs(values, index_path.parent)
+        count: int = 0
+        previous: int | None = None
+        block = array("Q")
+
+        try:
+            with temporal_path.open("wb") as index_file:
+                index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, 0, 0, 0))
+
+                for value_hash in heapq.merge(*map(_read_run, runs)):
+                    if value_hash == previous:
+                        continue
+                    block.append(value_hash)
+                    previous = value_hash
+
+                    if len(block) >= MERGE_BLOCK:
+                        count += len(block)
+                        block.tofile(index_file)
+                        block = array("Q")
+
+                count += len(block)
+                block.tofile(index_file)
+                index_file.seek(0)
+                index_file.write(
+                    INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, count)
+                )
+        finally:
+            for run in runs:
+                run.close()
+
+        temporal_path.replace(index_path)
+
+    @classmethod
+    def open(cls, spec: ReferenceSpec, index_dir: str | None = None) -> "ReferenceIndex":
+        """
+        Open the index of a reference, building it only if the reference csv changed.
+        The indexes are kept in their own directory, so the directory of the reference
+        csv may be read only or shared.
+
+        :param spec: Reference declared in the config
+        :type spec: ReferenceSpec
+        :param index_dir: Directory of the indexes, the user cache if None
+        :type index_dir: str | None
+        :return: Opened index
+        :rtype: ReferenceIndex
+        """
+        reference_path = Path(spec.path)
+        index_path: Path = index_path_for(spec, index_dir)
+
+        if not cls._is_current(index_path, reference_path):
+            cls.build(reference_path, spec.reference_column, index_path)
+
+        return cls(index_path)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def _contains_hash(self, value_hash: int, low: int = 0) -> tuple[bool, int]:
+        position = bisect_left(self._hashes, value_hash, low)
+        return position < len(self._hashes) and self._hashes[position] == value_hash, position
+
+    def __contains__(self, value: str) -> bool:
+        return self._contains_hash(hash_value(value))[0]
+
+    def contains_many(self, values: Iterable[str]) -> dict[str, bool]:
+        """
+        Check many values at once. The distinct hashes are searched in order, so
+        each search starts where the previous one ended.
+
+        :param values: Values to check
+        :type values: Iterable[str]
+        :return: Membership of each distinct value
+        :rtype: dict[str, bool]
+        """
+        hashed = sorted((hash_value(value), value) for value in set(values))
+        membership: dict[str, bool] = {}
+        low = 0
+
+        for value_hash, value in hashed:
+            membership[value], low = self._contains_hash(value_hash, low)
+
+        return membership
+
+    def close(self):
+        """Release the memory map of the index."""
+        self._hashes.release()
+        self._mmap.close()
+        self._file.close()
+
+
+class ReferenceValidator(BaseValidator):
+    """
+    Validate that the values of some columns are in a reference list.
+
+    :attribute index_dir: Directory of the indexes, the user cache if None
+    :type index_dir: str | None
+    :attribute indexes: Opened index of each checked column
+    :type indexes: dict[int, ReferenceIndex]
+    """
+
+    def __init__(self, index_dir: str | None = None):
+        self.index_dir = index_dir
+        self.indexes: dict[int, ReferenceIndex] = {}
+        self._opened_config: Configuration | None = None
+
+    def open_indexes(self, config: Configuration):
+        """
+        Open the indexes of the references of the config, once per configuration.
+
+        :param config: Configuration with the declared references
+        :type config: Configuration
+        """
+        if self._opened_config is config:
+            return
+
+        self.close()
+        self.indexes = {
+            spec.column: ReferenceIndex.open(spec, self.index_dir) for spec in config.references
+        }
+        self._opened_config = config
+
+    def validate_line(self, line: list[str], config: Configuration) -> LineError:
+        """
+        Validate there is not reference errors in line
+
+        :param line: Line to check
+        :type line: list[str]
+        :param config: Configuration of validator
+        :type config: Configuration
+        :return: List of reference errors in line
+        :rtype: LineError
+        """
+        self.open_indexes(config)
+
+        reference_errors: LineError = {}
+
+        for column_number, index in self.indexes.items():
+            if column_number < len(line) and line[column_number] not in index:
+                reference_errors[column_number] = ErrorTypes.REFERENCE
+
+        return reference_errors
+
+    def validate_columns(
+        self, columns: list[list[str]], config: Configuration
+    ) -> dict[int, list[int]]:
+        """
+        Find the values of the columns of a batch missing in their reference lists,
+        checking each distinct value only once.
+
+        :param columns: Values of each column of the batch
+        :type columns: list[list[str]]
+        :param config: Configuration of validator
+        :type config: Configuration
+        :return: Indexes of the rows with a reference error, by column number
+        :rtype: dict[int, list[int]]
+        """
+        self.open_indexes(config)
+
+        column_errors: dict[int, list[int]] = {}
+
+        for column_number, index in self.indexes.items():
+            if column_number >= len(columns):
+                continue
+
+            values: list[str] = columns[column_number]
+            membership = index.contains_many(values)
+            column_errors[column_number] = [
+                row for row, value in enumerate(values) if not membership[value]
+            ]
+
+        return column_errors
+
+    def close(self):
+        """Close the opened indexes."""
+        for index in self.indexes.values():
+            index.close()
+        self.indexes = {}
+        self._opened_config = None
@@ -0,0 +1,127 @@
+from collections.abc import Callable
+
+from csvclean.models.config import Configuration
+from csvclean.models.data_register import ErrorTypes, LineError
+
+from .base_validator import BaseValidator
+from .rules import Rule, build_rule
+
+ColumnCheck = Callable[[str, list[str]], bool]
+ColumnKeep = Callable[[str, list[str]], None]
+
+
+class RuleChain:
+    """
+    Fused check of all the rules of one column. It stops at the first broken rule.
+
+    :attribute rules: Rules of the column, in the order of the config
+    :type rules: tuple[Rule, ...]
+    :attribute checks: Check functions of the rules, in the order of the config
+    :type checks: tuple[ColumnCheck, ...]
+    """
+
+    __slots__ = ("checks", "rules")
+
+    def __init__(self, rules: list[Rule]):
+        self.rules: tuple[Rule, ...] = tuple(rules)
+        self.checks: tuple[ColumnCheck, ...] = tuple(rule.check for rule in rules)
+
+    def __call__(self, value: str, row: list[str]) -> bool:
+        return all(check(value, row) for check in self.checks)
+
+
+def compile_rules(config: Configuration) -> list[tuple[int, ColumnCheck]]:
+    """
+    Compile the rules of the config into one check function per column.
+
+    :param config: Configuration with the declared rules
+    :type config: Configuration
+    :return: Column index and check function, sorted by column
+    :rtype: list[tuple[int, ColumnCheck]]
+    """
+    rules_by_column: dict[int, list[Rule]] = {}
+
+    for spec in config.rules:
+        rule: Rule = build_rule(spec.name, spec.column, spec.args)
+        rules_by_column.setdefault(spec.column, []).append(rule)
+
+    return [
+        (column, rules[0].check if len(rules) == 1 else RuleChain(rules))
+        for column, rules in sorted(rules_by_column.items())
+    ]
+
+
+def _keepers(compiled: list[tuple[int, ColumnCheck]]) -> list[tuple[int, ColumnKeep]]:
+    """Column and keep method of the compiled rules that record the kept rows."""
+    keepers: list[tuple[int, ColumnKeep]] = []
+
+    for column, check in compiled:
+        rules = check.rules if isinstance(check, RuleChain) else [getattr(check, "__self__", None)]
+        keepers.extend(
+            (column, rule.keep)
+            for rule in rules
+            if isinstance(rule, Rule) and type(rule).keep is not Rule.keep
+        )
+
+    return keepers
+
+
+class RuleValidator(BaseValidator):
+    """
+    Validate the rules declared in the config with one pass over the row.
+
+    :attribute compiled: Column index and check function of each ruled column
+    :type compiled: list[tuple[int, ColumnCheck]]
+    """
+
+    def __init__(self):
+        self.compiled: list[tuple[int, ColumnCheck]] = []
+        self._keepers: list[tuple[int, ColumnKeep]] = []
+        self._compiled_config: Configuration | None = None
+
+    def compile(self, config: Configuration, compiled: list[tuple[int, ColumnCheck]] | None = None):
+        """
+        Compile the rules of the config, once per configuration.
+
+        :param config: Configuration with the declared rules
+        :type config: Configuration
+        :param compiled: Rules of config already compiled, e.g. loaded from a cache
+        :type compiled: list[tuple[int, ColumnCheck]] | None
+        """
+        if self._compiled_config is not config:
+            self.compiled = compiled if compiled is not None else compile_rules(config)
+            self._keepers = _keepers(self.compiled)
+            self._compiled_config = config
+
+    def keep(self, line: list[str]):
+        """
+        Record a line that passed every validation and is kept, in the stateful rules
+        like unique, after validate_line.
+
+        :param line: Kept line
+        :type line: list[str]
+        """
+        for column_number, keep in self._keepers:
+            if column_number < len(line):
+                keep(line[column_number], line)
+
+    def validate_line(self, line: list[str], config: Configuration) -> LineError:
+        """
+        Validate there is not rule errors in line
+
+        :param line: Line to check
+        :type line: list[str]
+        :param config: Configuration of validator
+        :type config: Configuration
+        :return: List of rule errors in line
+        :rtype: LineError
+        """
+        self.compile(config)
+
+        rule_errors: LineError = {}
+
+        for column_number, check in self.compiled:
+            if column_number < len(line) and not check(line[column_number], line):
+                rule_errors[column_number] = ErrorTypes.RULE
+
+        return rule_errors
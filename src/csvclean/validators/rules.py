@@ -0,0 +1,284 @@
+import operator
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from importlib.metadata import entry_points
+
+from csvclean.models.config import Configuration
+
+from .data_validator import DataValidator
+
+ENTRY_POINT_GROUP = "csvclean.rules"
+
+
+class Rule(ABC):
+    """
+    Check of the value of one column, declared in the rules line of the config.
+
+    :attribute column: Index of the checked column
+    :type column: int
+    :attribute args: Arguments of the rule
+    :type args: list[str]
+    :attribute stateful: True if the result depends on the previous rows, so the rows
+        must be checked in order by one instance
+    :type stateful: bool
+    :attribute byte_safe: True if the result is the same for the utf-8 bytes of the value
+        read one by one as characters, so the rule can run on passthrough
+    :type byte_safe: bool
+    """
+
+    stateful: bool = False
+    byte_safe: bool = False
+
+    def __init__(self, column: int, args: list[str]):
+        self.column = column
+        self.args = args
+
+    @abstractmethod
+    def check(self, value: str, row: list[str]) -> bool:
+        """
+        Check a value of the column.
+
+        :param value: Value of the column
+        :type value: str
+        :param row: Whole row, for the rules that compare columns
+        :type row: list[str]
+        :return: True if the value follows the rule
+        :rtype: bool
+        """
+
+    def keep(self, value: str, row: list[str]):  # noqa: B027
+        """
+        Record the value of a row that passed every validation and is kept, for the
+        stateful rules. Nothing by default.
+
+        :param value: Value of the column
+        :type value: str
+        :param row: Whole row
+        :type row: list[str]
+        """
+
+
+class RuleRegistry:
+    """
+    Registry of the rules that can be used in the config. Other packages can add
+    rules with entry points in the "csvclean.rules" group.
+
+    :attribute rules: Rule classes by name
+    :type rules: dict[str, type[Rule]]
+    """
+
+    def __init__(self):
+        self.rules: dict[str, type[Rule]] = {}
+        self._entry_points_loaded = False
+
+    def register(self, name: str) -> Callable[[type[Rule]], type[Rule]]:
+        """
+        Decorator to register a rule class with the name used in the config.
+
+        :param name: Name of the rule in the config
+        :type name: str
+        :return: Decorator that registers the class
+        :rtype: Callable
+        """
+
+        def decorator(rule_class: type[Rule]) -> type[Rule]:
+            self.rules[name] = rule_class
+            return rule_class
+
+        return decorator
+
+    def _load_entry_points(self):
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            self.rules.setdefault(entry_point.name, entry_point.load())
+        self._entry_points_loaded = True
+
+    def get(self, name: str) -> type[Rule]:
+        """
+        Find a rule class by its name.
+
+        :param name: Name of the rule in the config
+        :type name: str
+        :return: Rule class
+        :rtype: type[Rule]
+        :raises ValueError: If there is no rule with the name
+        """
+        if name not in self.rules and not self._entry_points_loaded:
+            self._load_entry_points()
+
+        if name not in self.rules:
+            raise ValueError(f"Not soported rule: {name}")
+
+        return self.rules[name]
+
+
+RULES = RuleRegistry()
+register_rule = RULES.register
+
+
+def _parse_bound(text: str) -> float | None:
+    return float(text) if text.strip() else None
+
+
+@register_rule("range")
+class RangeRule(Rule):
+    """Numeric value between a minimum and a maximum, e.g. range(0,120) or range(0,)."""
+
+    byte_safe = True
+
+    def __init__(self, column: int, args: list[str]):
+        super().__init__(column, args)
+        padded_args: list[str] = [*args, "", ""]
+        self.minimum = _parse_bound(padded_args[0])
+        self.maximum = _parse_bound(padded_args[1])
+
+    def check(self, value: str, row: list[str]) -> bool:
+        try:
+            number = float(value)
+        except ValueError:
+            return False
+
+        if self.minimum is not None and number < self.minimum:
+            return False
+
+        return self.maximum is None or number <= self.maximum
+
+
+@register_rule("regex")
+class RegexRule(Rule):
+    """Value that fully matches a regular expression, e.g. regex([A-Z]{2}\\d+)."""
+
+    def __init__(self, column: int, args: list[str]):
+        super().__init__(column, args)
+        self.fullmatch = re.compile(",".join(args)).fullmatch
+
+    def check(self, value: str, row: list[str]) -> bool:
+        return self.fullmatch(value) is not None
+
+
+@register_rule("enum")
+class EnumRule(Rule):
+    """Value inside an allowed set, separated by '|', e.g. enum(Madrid|Bilbao)."""
+
+    def __init__(self, column: int, args: list[str]):
+        super().__init__(column, args)
+        self.allowed = frozenset(",".join(args).split("|"))
+
+    def check(self, value: str, row: list[str]) -> bool:
+        return value in self.allowed
+
+
+@register_rule("length")
+class LengthRule(Rule):
+    """Number of characters between a minimum and a maximum, e.g. length(1,20)."""
+
+    def __init__(self, column: int, args: list[str]):
+        super().__init__(column, args)
+        padded_args: list[str] = [*args, "", ""]
+        self.minimum = int(padded_args[0]) if padded_args[0].strip() else 0
+        self.maximum = int(padded_args[1]) if padded_args[1].strip() else None
+
+    def check(self, value: str, row: list[str]) -> bool:
+        return self.minimum <= len(value) and (self.maximum is None or len(value) <= self.maximum)
+
+
+COMPARISONS: dict[str, Callable[[object, object], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+@register_rule("compare")
+class CompareRule(Rule):
+    """
+    Comparison with another column of the row, e.g. compare(<=,3). Both values
+    are compared as numbers when they can be converted, as text otherwise. The utf-8
+    bytes keep the order of the characters, so it is byte safe.
+    """
+
+    byte_safe = True
+
+    def __init__(self, column: int, args: list[str]):
+        super().__init__(column, args)
+        if len(args) != 2 or args[0].strip() not in COMPARISONS:
+            raise ValueError(f"compare needs an operator and a column, got {args}")
+        self.compare = COMPARISONS[args[0].strip()]
+        self.other_column = int(args[1])
+
+    def check(self, value: str, row: list[str]) -> bool:
+        if self.other_column >= len(row):
+            return False
+
+        other: str = row[self.other_column]
+        try:
+            return self.compare(float(value), float(other))
+        except ValueError:
+            return self.compare(value, other)
+
+
+@register_rule("unique")
+class UniqueRule(Rule):
+    """
+    Value not repeated in the kept rows before it. Only the values of the kept rows are
+    recorded, so a row rejected by another validator doesn't make a later valid row
+    with the same value a repetition. It keeps every recorded value in memory.
+    """
+
+    stateful = True
+    byte_safe = True
+
+    def __init__(self, column: int, args: list[str]):
+        super().__init__(column, args)
+        self.seen: set[str] = set()
+
+    def check(self, value: str, row: list[str]) -> bool:
+        return value not in self.seen
+
+    def keep(self, value: str, row: list[str]):
+        self.seen.add(value)
+
+
+def build_rule(name: str, column: int, args: list[str]) -> Rule:
+    """
+    Create the rule declared in the config.
+
+    :param name: Name of the rule
+    :type name: str
+    :param column: Index of the checked column
+    :type column: int
+    :param args: Arguments of the rule
+    :type args: list[str]
+    :return: Rule instance
+    :rtype: Rule
+    """
+    DataValidator.require_list_str(args, "rules.build_rule.args")
+    return RULES.get(name)(column, args)
+
+
+def has_stateful_rules(config: Configuration) -> bool:
+    """
+    Check if some rule of the config depends on the previous rows.
+
+    :param config: Configuration with the rules
+    :type config: Configuration
+    :return: True if some rule is stateful
+    :rtype: bool
+    """
+    return any(RULES.get(spec.name).stateful for spec in config.rules)
+
+
+def has_text_rules(config: Configuration) -> bool:
+    """
+    Check if some rule of the config depends on the characters of the values, like
+    regex, enum or length, so it can't run on the raw bytes of a passthrough.
+
+    :param config: Configuration with the rules
+    :type config: Configuration
+    :return: True if some rule isn't byte safe
+    :rtype: bool
+    """
+    return any(not RULES.get(spec.name).byte_safe for spec in config.rules)
@@ -0,0 +1,91 @@
+from collections.abc import Callable
+from operator import itemgetter
+
+from csvclean.models.config import Configuration
+from csvclean.models.data_register import ErrorTypes, LineError
+
+from .base_validator import BaseValidator
+
+
+class StructureValidator(BaseValidator):
+    """
+    Structural stage in front of the per-cell validators. The header is checked once
+    against the config, and each row only has its number of values compared with the
+    header, so a ragged row is rejected without indexing its cells.
+
+    :attribute width: Number of values of the rows, the ones of the input header
+    :type width: int | None
+    :attribute header: Header of the rows after the mapping of the columns
+    :type header: list[str]
+    """
+
+    def __init__(self):
+        self.width: int | None = None
+        self.header: list[str] = []
+        self._getter: Callable[[list[str]], tuple[str, ...]] | None = None
+
+    def check_header(self, header: list[str], config: Configuration) -> list[str]:
+        """
+        Check the input header against the config. If the config names its columns,
+        they are found in the header by name, so the input can have them in another
+        order or have extra columns; otherwise the header must have one column per type.
+
+        :param header: Header of the input
+        :type header: list[str]
+        :param config: Configuration of validator
+        :type config: Configuration
+        :return: Header of the rows after the mapping of the columns
+        :rtype: list[str]
+        :raises ValueError: If the header doesn't match the config
+        """
+        self.width = len(header)
+        self.header = list(header)
+        self._getter = None
+
+        if config.columns:
+            missing: list[str] = [name for name in config.columns if name not in header]
+            if missing:
+                raise ValueError(f"The header doesn't have the columns of the config: {missing}")
+
+            if config.columns != header:
+                self._getter = itemgetter(*(header.index(name) for name in config.columns))
+                self.header = list(config.columns)
+
+        elif config.header_types and len(header) != len(config.header_types):
+            raise ValueError(
+                f"The header has {len(header)} columns and the config "
+                f"declares {len(config.header_types)} types."
+            )
+
+        return self.header
+
+    def validate_line(self, line: list[str], config: Configuration) -> LineError:
+        """
+        Validate the line has as many values as the header
+
+        :param line: Line to check
+        :type line: list[str]
+        :param config: Configuration of validator
+        :type config: Configuration
+        :return: Structure error in the first missing or extra column, if any
+        :rtype: LineError
+        """
+        if self.width is None or len(line) == self.width:
+            return {}
+
+        return {min(len(line), self.width): ErrorTypes.STRUCTURE}
+
+    def remap(self, line: list[str]) -> list[str]:
+        """
+        Put the values of a valid line in the order of the columns of the config.
+
+        :param line: Line with as many values as the header
+        :type line: list[str]
+        :return: Values in the order of the config
+        :rtype: list[str]
+        """
+        if self._getter is None:
+            return line
+
+        values = self._getter(line)
+        return list(values) if isinstance(values, tuple) else [values]
@@ -1,13 +1,71 @@
 import re
+from collections.abc import Callable
+from functools import partial
 
 from csvclean.models.config import Configuration
 from csvclean.models.data_register import ErrorTypes, LineError
 
 from .base_validator import BaseValidator
 from .data_validator import DataValidator
+from .dates import DEFAULT_DATE_FORMATS, DateFormat, column_date_format, compile_date_format
+from .memo import MemoCache
 
 
 class TypeValidator(BaseValidator):
+    """
+    Validate the values of each column have the type of the config. The checks of
+    each column are memoized, so the repeated values of low cardinality columns
+    are resolved with a dict lookup. The date and datetime columns are checked with
+    the fixed-position parser of their format.
+
+    :attribute memo_size: Maximum number of values memoized per column
+    :type memo_size: int
+    :attribute memos: Memo of the check of each column and expected type
+    :type memos: dict[tuple[int, type], MemoCache]
+    """
+
+    def __init__(self, memo_size: int = 1024):
+        self.memo_size = memo_size
+        self.memos: dict[tuple[int, type], MemoCache] = {}
+
+    def _memo(self, column_number: int, config: Configuration) -> MemoCache:
+        """Memoized check of a column, created the first time it is used."""
+        expected_type: type = config.header_types[column_number]
+        memo: MemoCache | None = self.memos.get((column_number, expected_type))
+
+        if memo is None:
+            date_format: DateFormat | None = column_date_format(config, column_number)
+            check: Callable[[str], bool] = (
+                partial(self.is_incorrect_type, expected_type=expected_type)
+                if date_format is None
+                else date_format.is_incorrect
+            )
+            memo = MemoCache(check, self.memo_size)
+            self.memos[column_number, expected_type] = memo
+
+        return memo
+
+    def hit_rates(self) -> dict[int, float]:
+        """
+        Hit rate of the memo of each checked column.
+
+        :return: Hit rate by column index
+        :rtype: dict[int, float]
+        """
+        return {column_number: memo.hit_rate for (column_number, _), memo in self.memos.items()}
+
+    def memo_counts(self) -> dict[int, tuple[int, int]]:
+        """
+        Hits and misses of the memo of each checked column, since it was created.
+
+        :return: Hits and misses by column index
+        :rtype: dict[int, tuple[int, int]]
+        """
+        return {
+            column_number: (memo.hits, memo.misses)
+            for (column_number, _), memo in self.memos.items()
+        }
+
     def is_incorrect_type(self, value: str, expected_type: type) -> bool:
         """
         Check of "value" has the same type than expected_type
@@ -21,12 +79,14 @@ class TypeValidator(BaseValidator):
         """
         DataValidator.require_type(expected_type, "null_validator.is_incorrect_type.expected_type")
 
+        if expected_type in DEFAULT_DATE_FORMATS:
+            return compile_date_format(DEFAULT_DATE_FORMATS[expected_type]).is_incorrect(value)
+
         knonw_types: dict[str, str] = {
             "int": r"^-?\d+$",
             "float": r"^-?\d+\.\d+$",
             "str": r".+",
-            "bool": r"^(?i)(true|false|1|0|yes|no)$",
-            "datetime": r"^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}:\d{2})?$",
+            "bool": r"(?i)^(true|false|1|0|yes|no)$",
         }
 
         return not bool(re.fullmatch(knonw_types[expected_type.__name__], value))
@@ -49,7 +109,30 @@ class TypeValidator(BaseValidator):
         type_errors: LineError = {}
 
         for column_number, element in enumerate(line):
-            if self.is_incorrect_type(element, config.header_types[column_number]):
+            if self._memo(column_number, config)(element):
                 type_errors[column_number] = ErrorTypes.TYPE
 
         return type_errors
+
+    def validate_column(
+        self, values: list[str], column_number: int, config: Configuration
+    ) -> list[int]:
+        """
+        Find the values of a column of a batch that don't have its type
+
+        :param values: Values of the column
+        :type values: list[str]
+        :param column_number: Position of the column
+        :type column_number: int
+        :param config: Configuration of validator
+        :type config: Configuration
+        :return: Indexes of the rows with a type error
+        :rtype: list[int]
+        """
+        DataValidator.require_configuration__header_types(
+            config, "type_validator.validate_column.config"
+        )
+
+        is_incorrect = self._memo(column_number, config)
+
+        return [index for index, value in enumerate(values) if is_incorrect(value)]
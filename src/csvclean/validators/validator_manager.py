@@ -1,24 +1,79 @@
-from csvclean.models import Configuration, LineError
+from csvclean.models import Configuration, ErrorTypes, LineError, RowBatch
 
+from .base_validator import BaseValidator
 from .data_validator import DataValidator
 from .null_validator import NullValidator
+from .outlier_validator import OutlierValidator
+from .reference_validator import ReferenceValidator
+from .rule_validator import ColumnCheck, RuleValidator
 from .type_validator import TypeValidator
 
 
 class ValidatorManager:
     """
-    Manage the validation of the input line, using the Nullvalidator and TypeValidator
+    Manage the validation of the input line, using the Nullvalidator, TypeValidator
+    and the RuleValidator, ReferenceValidator and OutlierValidator of the rules,
+    references and outliers declared in the config.
 
     :atribute null_validator: Instance of NullValidator
     :type null_validator: NullValidator
     :atribute type_validator: Instance of TypeValidator
     :type type_validator: TypeValidator
+    :atribute rule_validator: Instance of RuleValidator
+    :type rule_validator: RuleValidator
+    :atribute reference_validator: Instance of ReferenceValidator
+    :type reference_validator: ReferenceValidator
+    :atribute outlier_validator: Instance of OutlierValidator
+    :type outlier_validator: OutlierValidator
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        config: Configuration | None = None,
+        compiled_rules: list[tuple[int, ColumnCheck]] | None = None,
+        index_dir: str | None = None,
+    ):
+        """
+        Create the validators, compiling the rules and opening the reference indexes
+        of config at startup if it is given.
+
+        :param config: Configuration that will be validated
+        :type config: Configuration | None
+        :param compiled_rules: Rules of config already compiled, e.g. loaded from a cache
+        :type compiled_rules: list[tuple[int, ColumnCheck]] | None
+        :param index_dir: Directory of the reference indexes, the user cache if None
+        :type index_dir: str | None
+        """
         self.null_validator = NullValidator()
         self.type_validator = TypeValidator()
+        self.rule_validator = RuleValidator()
+        self.reference_validator = ReferenceValidator(index_dir)
+        self.outlier_validator = OutlierValidator()
+        self._enabled: list[BaseValidator] = []
+        self._enabled_config: Configuration | None = None
+
+        if config is not None and config.rules:
+            self.rule_validator.compile(config, compiled_rules)
+
+        if config is not None and config.references:
+            self.reference_validator.open_indexes(config)
+
+    def memo_counts(self) -> dict[str, int]:
+        """
+        Hits and misses of the memoized validations since they were created, named as
+        report counters, so the reports of several validators can be added up and the
+        hit rates computed from the totals.
+
+        :return: Count by metric name
+        :rtype: dict[str, int]
+        """
+        counts: dict[str, int] = {}
+
+        for column_number, (hits, misses) in self.type_validator.memo_counts().items():
+            counts[f"type_memo_hits_{column_number}"] = hits
+            counts[f"type_memo_misses_{column_number}"] = misses
 
+        return counts
 
     def _join_validation_errors(
         self, current_errors: LineError, added_errors: LineError
@@ -43,6 +98,28 @@ class ValidatorManager:
 
         return new_errors
 
+    def _enabled_validators(self, config: Configuration) -> list[BaseValidator]:
+        """
+        Validators enabled in the config, in order of priority of their errors, kept
+        while the same configuration is validated.
+
+        :param config: Configuration of validator
+        :type config: Configuration
+        :return: Enabled validators
+        :rtype: list[BaseValidator]
+        """
+        if self._enabled_config is not config:
+            enabled: list[tuple[bool, BaseValidator]] = [
+                (config.trate_nullerror, self.null_validator),
+                (config.trate_typeerror, self.type_validator),
+                (bool(config.rules), self.rule_validator),
+                (bool(config.references), self.reference_validator),
+                (bool(config.outliers), self.outlier_validator),
+            ]
+            self._enabled = [validator for is_enabled, validator in enabled if is_enabled]
+            self._enabled_config = config
+
+        return self._enabled
 
     def validate(self, data: list[str], config: Configuration) -> LineError:
         """
@@ -61,15 +138,80 @@ class ValidatorManager:
 
         validation_errors: LineError = {}
 
-        if config.trate_nullerror:
-            null_errors: LineError = self.null_validator.validate_line(data, config)
-            if len(null_errors.keys()) > 0:
-                validation_errors = self._join_validation_errors(validation_errors, null_errors)
-
-        if config.trate_typeerror:
-            type_errors: LineError = self.type_validator.validate_line(data, config)
-            if len(type_errors.keys()) > 0:
-                validation_errors = self._join_validation_errors(validation_errors, type_errors)
+        for validator in self._enabled_validators(config):
+            errors: LineError = validator.validate_line(data, config)
+            if len(errors.keys()) > 0:
+                validation_errors = self._join_validation_errors(validation_errors, errors)
 
         return validation_errors
 
+    def keep(self, data: list[str]):
+        """
+        Record a row written to the output in the stateful rules, like unique. The rows
+        are only known to be written after the cleaners, so it's not done by validate.
+
+        :param data: Row as it was validated
+        :type data: list[str]
+        """
+        self.rule_validator.keep(data)
+
+    @staticmethod
+    def _add_column_errors(batch: RowBatch, column_errors: list[tuple[int, list[int], ErrorTypes]]):
+        """Save in the batch the errors found in its columns."""
+        for column_number, indexes, error in column_errors:
+            for index in indexes:
+                batch.add_error(index, column_number, error)
+
+    def _validate_batch_rules(self, batch: RowBatch, config: Configuration):
+        """Check the rules of the config row by row, as they compare values of a row."""
+        for index in range(batch.length):
+            rule_errors: LineError = self.rule_validator.validate_line(batch.row(index), config)
+            for column_number, error in rule_errors.items():
+                batch.add_error(index, column_number, error)
+
+    def validate_batch(self, batch: RowBatch, config: Configuration):
+        """
+        Validate a batch column by column, saving the errors of each row in the batch
+        with the same priority as validate.
+
+        :param batch: Rows to check, stored by columns
+        :type batch: RowBatch
+        :param config: Configuration of validator
+        :type config: Configuration
+        """
+
+        DataValidator.require_configuration(config, "validator_manager.validate_batch.config")
+
+        column_errors: list[tuple[int, list[int], ErrorTypes]] = []
+
+        for column_number, values in enumerate(batch.columns):
+            if config.trate_nullerror:
+                nulls: list[int] = self.null_validator.validate_column(values)
+                column_errors.append((column_number, nulls, ErrorTypes.NULL))
+
+            if config.trate_typeerror:
+                wrong_types = self.type_validator.validate_column(values, column_number, config)
+                column_errors.append((column_number, wrong_types, ErrorTypes.TYPE))
+
+        self._add_column_errors(batch, column_errors)
+
+        if config.rules:
+            self._validate_batch_rules(batch, config)
+
+        if config.references:
+            references = self.reference_validator.validate_columns(batch.columns, config)
+            self._add_column_errors(
+                batch,
+                [(column, indexes, ErrorTypes.REFERENCE) for column, indexes in references.items()],
+            )
+
+        if config.outliers:
+            outliers = self.outlier_validator.validate_columns(batch.columns, config)
+            self._add_column_errors(
+                batch,
+                [(column, indexes, ErrorTypes.OUTLIER) for column, indexes in outliers.items()],
+            )
+
+    def close(self):
+        """Close the reference indexes."""
+        self.reference_validator.close()
@@ -1,5 +1,6 @@
 # --- Fixtures: Reusable setups for tests ---
 from dataclasses import dataclass
+from datetime import date
 
 import pytest
 
@@ -7,9 +8,10 @@ import pytest
 from csvclean.cleaners import (
     LineOrchestrator,
     NullCleaner,
+    RuleCleaner,
     TypeCleaner,
 )
-from csvclean.models import ErrorTypes
+from csvclean.models import Configuration, ErrorTypes, RowBatch, RuleSpec
 
 
 @dataclass
@@ -131,3 +133,68 @@ def test_orchestrator_returns_original_errors(orchestrator: LineOrchestrator):
     _, returned_errors = orchestrator.process(row, errors)
     assert returned_errors == errors
     assert id(returned_errors) == id(errors)  # Should be the same object or identical
+
+
+def test_rule_cleaner_removes_row():
+    """Check if RuleCleaner returns an empty list when a RULE error is present."""
+    cleaner = RuleCleaner()
+    row = ["1", "Paris"]
+    errors = {1: ErrorTypes.RULE}
+
+    result_row, _ = cleaner.clean(row, errors)
+    assert result_row == []
+
+
+def test_orchestrator_applies_rules_of_config():
+    """Ensure the orchestrator removes rows with RULE errors when the config has rules."""
+    config = Configuration(rules=[RuleSpec(column=1, name="enum", args=["Madrid"])])
+    orchestrator = LineOrchestrator(config)
+
+    clean_row, _ = orchestrator.process(["1", "Paris"], {1: ErrorTypes.RULE})
+    assert clean_row == []
+
+
+def test_orchestrator_process_batch_drops_rejected_rows(orchestrator: LineOrchestrator):
+    """Ensure a batch keeps the rows that process would keep, without copying them."""
+    rows = [["1", "a"], ["", "b"], ["x", "c"], ["4", "d"]]
+    batch = RowBatch.from_rows(rows)
+    batch.errors = {1: {0: ErrorTypes.NULL}, 2: {0: ErrorTypes.TYPE}, 3: {1: ErrorTypes.RULE}}
+
+    orchestrator.process_batch(batch)
+
+    expected = [
+        row for index, row in enumerate(rows)
+        if orchestrator.process(row, batch.errors.get(index, {}))[0]
+    ]
+    assert batch.selection == [0, 3]
+    assert list(batch.selected_rows()) == expected
+
+
+def test_orchestrator_drops_outliers_only_if_asked():
+    """Ensure outliers are only flagged unless the config asks to drop them."""
+    row = ["1", "1000"]
+    errors = {1: ErrorTypes.OUTLIER}
+
+    flagged, _ = LineOrchestrator(Configuration()).process(row, errors)
+    dropped, _ = LineOrchestrator(Configuration(trate_outliererror=True)).process(row, errors)
+
+    assert flagged == row
+    assert dropped == []
+
+
+def test_orchestrator_normalizes_dates_if_asked():
+    """Ensure the dates of the kept rows are written in ISO 8601 when asked."""
+    config = Configuration(
+        header_types=[int, date],
+        trate_typeerror=True,
+        date_formats={1: "%d/%m/%Y"},
+        normalize_dates=True,
+    )
+    orchestrator = LineOrchestrator(config)
+    batch = RowBatch.from_rows([["1", "05/03/2024"], ["2", "31/12/1999"]])
+
+    row_clean, _ = orchestrator.process(["1", "05/03/2024"], {})
+    orchestrator.process_batch(batch)
+
+    assert row_clean == ["1", "2024-03-05"]
+    assert list(batch.selected_rows()) == [["1", "2024-03-05"], ["2", "1999-12-31"]]
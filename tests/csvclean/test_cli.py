@@ -0,0 +1,359 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from csvclean.cli import base_process, fanout_process, follow_process, watch_process
+from csvclean.models import (
+    BranchOptions,
+    FollowOptions,
+    PartitionOptions,
+    ProcessOptions,
+    ProgressOptions,
+    SinkOptions,
+)
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    """Configuration of the dirty csv used in the process tests"""
+    path = tmp_path / "config.txt"
+    path.write_text("headers:{int,str,str}\nvalidator:{Null Errors, Type Errors}\n")
+    return path
+
+
+DIRTY_LINES = ["id,name,city", "1,José,Logroño", "x,Bob,Madrid", "3,,Bilbao", "4,Zoë,Málaga"]
+
+
+def test_base_process(tmp_path: Path, config_path: Path):
+    input_path = tmp_path / "dirty.csv"
+    output_path = tmp_path / "clean.csv"
+    input_path.write_text("\n".join(DIRTY_LINES) + "\n", encoding="utf-8")
+
+    options = ProcessOptions(config_path=str(config_path), config_cache_dir=str(tmp_path / "cache"))
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "id;name;city",
+        "1;José;Logroño",
+        "4;Zoë;Málaga",
+    ]
+
+
+@pytest.mark.parametrize(
+    "passthrough, output_encoding",
+    argvalues=[(True, "cp1252"), (False, "utf-8")],
+    ids=["passthrough", "transcoded"],
+)
+def test_base_process_latin_input(
+    tmp_path: Path, config_path: Path, passthrough: bool, output_encoding: str
+):
+    input_path = tmp_path / "dirty.csv"
+    output_path = tmp_path / "clean.csv"
+    input_path.write_bytes(("\n".join(DIRTY_LINES) + "\n").encode("cp1252"))
+    options = ProcessOptions(
+        config_path=str(config_path),
+        config_cache=False,
+        passthrough=passthrough,
+        sink=SinkOptions(encoding="utf-8"),
+    )
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    assert output_path.read_bytes().decode(output_encoding).splitlines() == [
+        "id;name;city",
+        "1;José;Logroño",
+        "4;Zoë;Málaga",
+    ]
+
+
+@pytest.mark.parametrize(
+    "rules, output_name",
+    argvalues=[("rules:{1: enum(José|Zoë)}\n", "clean.csv"), ("", "clean.parquet")],
+    ids=["text_rule", "parquet"],
+)
+def test_passthrough_transcodes_when_not_byte_safe(tmp_path: Path, rules: str, output_name: str):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text(
+        "headers:{int,str,str}\nvalidator:{Null Errors, Type Errors}\n" + rules
+    )
+    input_path = tmp_path / "dirty.csv"
+    output_path = tmp_path / output_name
+    input_path.write_text("\n".join(DIRTY_LINES) + "\n", encoding="utf-8")
+    options = ProcessOptions(config_path=str(config_path), config_cache=False, passthrough=True)
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    if output_name.endswith(".parquet"):
+        pq = pytest.importorskip("pyarrow.parquet")
+        assert pq.read_table(output_path).column("name").to_pylist() == ["José", "Zoë"]
+    else:
+        assert output_path.read_text(encoding="utf-8").splitlines()[1:] == [
+            "1;José;Logroño",
+            "4;Zoë;Málaga",
+        ]
+
+
+def test_base_process_quarantine(tmp_path: Path, config_path: Path):
+    input_path = tmp_path / "dirty.csv"
+    output_path = tmp_path / "clean.csv"
+    quarantine_path = tmp_path / "rejected.csv"
+    content = "\n".join(DIRTY_LINES) + "\n"
+    input_path.write_text(content, encoding="utf-8")
+    options = ProcessOptions(
+        config_path=str(config_path), config_cache=False, quarantine_path=str(quarantine_path)
+    )
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    offsets = [len(content[: content.index(line)].encode()) for line in DIRTY_LINES[2:4]]
+    assert quarantine_path.read_text(encoding="utf-8").splitlines() == [
+        "line_number;byte_offset;errors;id;name;city",
+        f"3;{offsets[0]};0:TYPE;x;Bob;Madrid",
+        f"4;{offsets[1]};1:NULL;3;;Bilbao",
+    ]
+
+
+def test_base_process_progress(
+    tmp_path: Path, config_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    input_path = tmp_path / "dirty.csv"
+    input_path.write_text("\n".join(DIRTY_LINES) + "\n", encoding="utf-8")
+    options = ProcessOptions(
+        config_path=str(config_path),
+        config_cache=False,
+        progress=ProgressOptions(sample_every=1, interval=0),
+    )
+
+    base_process(str(input_path), str(tmp_path / "clean.csv"), False, options)
+
+    last_line = capsys.readouterr().err.splitlines()[-1]
+    assert "100.0%" in last_line
+    assert "4 rows (2 written, 2 rejected)" in last_line
+
+
+def test_base_process_ragged_rows(tmp_path: Path, config_path: Path):
+    input_path = tmp_path / "dirty.csv"
+    output_path = tmp_path / "clean.csv"
+    input_path.write_text("\n".join([*DIRTY_LINES, "5,Ann", "6,Eve,Vigo"]) + "\n")
+    options = ProcessOptions(
+        config_path=str(config_path), config_cache=False, sink=SinkOptions(batch_size=2)
+    )
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "id;name;city",
+        "1;José;Logroño",
+        "4;Zoë;Málaga",
+        "6;Eve;Vigo",
+    ]
+
+
+def test_base_process_partitioned(tmp_path: Path, config_path: Path):
+    input_path = tmp_path / "dirty.csv"
+    output_path = tmp_path / "clean"
+    input_path.write_text("\n".join(DIRTY_LINES) + "\n", encoding="utf-8")
+    options = ProcessOptions(
+        config_path=str(config_path), config_cache=False, partition=PartitionOptions(column="city")
+    )
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    assert sorted(path.parent.name for path in output_path.glob("*/part-0001.csv")) == [
+        "city=Logroño",
+        "city=Málaga",
+    ]
+
+
+def test_base_process_structure(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text("headers:{str,int}\nvalidator:{Type Errors}\ncolumns:{city; id}\n")
+    input_path = tmp_path / "dirty.csv"
+    output_path = tmp_path / "clean.csv"
+    quarantine_path = tmp_path / "rejected.csv"
+    content = "\n".join([*DIRTY_LINES, "5,Ann", "6,Eve,Vigo"]) + "\n"
+    input_path.write_text(content, encoding="utf-8")
+    options = ProcessOptions(
+        config_path=str(config_path), config_cache=False, quarantine_path=str(quarantine_path)
+    )
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "city;id",
+        "Logroño;1",
+        "Bilbao;3",
+        "Málaga;4",
+        "Vigo;6",
+    ]
+    offsets = [len(content[: content.index(line)].encode()) for line in ["x,Bob", "5,Ann"]]
+    assert quarantine_path.read_text(encoding="utf-8").splitlines()[1:] == [
+        f"3;{offsets[0]};1:TYPE;Madrid;x",
+        f"6;{offsets[1]};2:STRUCTURE;5;Ann",
+    ]
+
+
+def test_base_process_outliers(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text(
+        "headers:{int,float}\nvalidator:{Type Errors, Outlier Errors}\noutliers:{1:iqr}\n"
+    )
+    input_path = tmp_path / "dirty.csv"
+    output_path = tmp_path / "clean.csv"
+    amounts = [f"{10 + row % 5}.5" for row in range(40)]
+    amounts[20] = "9000.5"
+    input_path.write_text(
+        "id,amount\n" + "".join(f"{row},{amount}\n" for row, amount in enumerate(amounts))
+    )
+    options = ProcessOptions(config_path=str(config_path), config_cache=False)
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    written = output_path.read_text(encoding="utf-8").splitlines()
+    assert len(written) == len(amounts)
+    assert "20;9000.5" not in written
+
+
+def test_unique_records_written_outliers(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text(
+        "headers:{str,float}\nvalidator:{Type Errors}\n"
+        "rules:{0:unique}\noutliers:{1:zscore(1)}\n"
+    )
+    input_path = tmp_path / "dirty.csv"
+    output_path = tmp_path / "clean.csv"
+    rows = [f"r{row},{10 + row % 5}.5" for row in range(40)]
+    input_path.write_text("id,amount\n" + "\n".join([*rows, "dup,1000.5", "dup,10.5"]) + "\n")
+    options = ProcessOptions(config_path=str(config_path), config_cache=False)
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    # The outlier is only flagged, so it's written and its id is no longer unique
+    written = output_path.read_text(encoding="utf-8").splitlines()
+    assert [line for line in written if line.startswith("dup")] == ["dup;1000.5"]
+
+
+def test_fanout_process(tmp_path: Path, config_path: Path):
+    input_path = tmp_path / "dirty.csv"
+    input_path.write_text("\n".join(DIRTY_LINES) + "\n", encoding="utf-8")
+    lenient_path = tmp_path / "lenient.txt"
+    lenient_path.write_text("headers:{str,str,str}\nvalidator:{Null Errors, Type Errors}\n")
+    options = ProcessOptions(config_cache=False)
+    branches = [
+        BranchOptions(config_path=str(config_path), output_path=str(tmp_path / "strict.csv")),
+        BranchOptions(
+            config_path=str(lenient_path),
+            output_path=str(tmp_path / "lenient.csv"),
+            report_path=str(tmp_path / "lenient.txt.report"),
+        ),
+    ]
+
+    reports = fanout_process(str(input_path), branches, str(tmp_path / "profile.json"), options)
+
+    # Each branch writes what its own run would write
+    for branch in branches:
+        expected_path = tmp_path / f"expected_{Path(branch.output_path).name}"
+        base_process(
+            str(input_path),
+            str(expected_path),
+            False,
+            options.model_copy(update={"config_path": branch.config_path}),
+        )
+        assert Path(branch.output_path).read_text(encoding="utf-8") == expected_path.read_text(
+            encoding="utf-8"
+        )
+
+    assert len(reports) == 2
+    assert (tmp_path / "strict.csv").read_text(encoding="utf-8") != (
+        tmp_path / "lenient.csv"
+    ).read_text(encoding="utf-8")
+    assert (tmp_path / "lenient.txt.report").exists()
+    assert (tmp_path / "profile.json").exists()
+
+
+def test_follow_process(tmp_path: Path, config_path: Path):
+    input_path = tmp_path / "log.csv"
+    output_path = tmp_path / "clean.csv"
+    input_path.write_text("\n".join(DIRTY_LINES[:3]) + "\n", encoding="utf-8")
+    follow = FollowOptions(
+        poll_interval=0.02, idle_timeout=0.5, state_path=str(tmp_path / "state.json")
+    )
+    options = ProcessOptions(
+        config_path=str(config_path),
+        config_cache=False,
+        quarantine_path=str(tmp_path / "rejected.csv"),
+        follow=follow,
+    )
+
+    def append_rows():
+        time.sleep(0.1)
+        with input_path.open("a", encoding="utf-8") as input_file:
+            input_file.write(DIRTY_LINES[3] + "\n4,Zo")
+            input_file.flush()
+            time.sleep(0.1)
+            input_file.write("ë,Málaga\n")
+
+    writer = threading.Thread(target=append_rows)
+    writer.start()
+    report = follow_process(str(input_path), str(output_path), False, options)
+    writer.join()
+
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "id;name;city",
+        "1;José;Logroño",
+        "4;Zoë;Málaga",
+    ]
+    assert report.total_errors == 2
+
+    # A restart goes on after the last row and appends to the outputs
+    with input_path.open("a", encoding="utf-8") as input_file:
+        input_file.write("5,Ana,Soria\n")
+
+    follow_process(str(input_path), str(output_path), False, options)
+
+    assert output_path.read_text(encoding="utf-8").splitlines()[1:] == [
+        "1;José;Logroño",
+        "4;Zoë;Málaga",
+        "5;Ana;Soria",
+    ]
+    rejected = (tmp_path / "rejected.csv").read_text(encoding="utf-8").splitlines()
+    assert [line.split(";")[0] for line in rejected] == ["line_number", "3", "4"]
+
+
+@pytest.mark.parametrize("output_name", ["clean.parquet", "clean.sqlite"])
+def test_follow_process_needs_csv_output(tmp_path: Path, config_path: Path, output_name: str):
+    input_path = tmp_path / "log.csv"
+    input_path.write_text("\n".join(DIRTY_LINES) + "\n", encoding="utf-8")
+    follow = FollowOptions(idle_timeout=0.1, state_path=str(tmp_path / "state.json"))
+    options = ProcessOptions(config_path=str(config_path), config_cache=False, follow=follow)
+
+    # A restart appends to the output, so it's rejected before the first run
+    with pytest.raises(ValueError):
+        follow_process(str(input_path), str(tmp_path / output_name), False, options)
+
+    assert not (tmp_path / output_name).exists()
+    assert not (tmp_path / "state.json").exists()
+
+
+def test_watch_process(tmp_path: Path, config_path: Path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    for name in ["a.csv", "b.csv"]:
+        (inbox / name).write_text("\n".join(DIRTY_LINES) + "\n", encoding="utf-8")
+    follow = FollowOptions(
+        poll_interval=0.05, idle_timeout=0.5, state_path=str(tmp_path / "state.json"), workers=2
+    )
+    options = ProcessOptions(config_path=str(config_path), config_cache=False, follow=follow)
+
+    cleaned = watch_process(str(inbox), str(tmp_path / "clean"), options)
+
+    assert sorted(cleaned) == [str(inbox / "a.csv"), str(inbox / "b.csv")]
+    assert (tmp_path / "clean" / "b.csv").read_text(encoding="utf-8").splitlines() == [
+        "id;name;city",
+        "1;José;Logroño",
+        "4;Zoë;Málaga",
+    ]
+    assert watch_process(str(inbox), str(tmp_path / "clean"), options) == []
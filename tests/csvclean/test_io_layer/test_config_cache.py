@@ -0,0 +1,101 @@
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+
+from csvclean.IO_layer.config_cache import CompiledConfiguration, ConfigCache
+from csvclean.IO_layer.csv_io_layout import CSVIOlayer
+from csvclean.models.config import Configuration
+
+CONFIG_LINES = [
+    "headers:{int,str,int}",
+    "validator:{Null Errors, Type Errors}",
+    "rules:{2:range(0,120); 1:regex([A-Z].*); 1:length(1,10)}",
+]
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    """Config file with compiled rules"""
+    path = tmp_path / "config.txt"
+    path.write_text("\n".join(CONFIG_LINES) + "\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def io_layer(tmp_path: Path) -> CSVIOlayer:
+    return CSVIOlayer(str(tmp_path / "output.csv"))
+
+
+def test_load_hits_cache(tmp_path: Path, config_path: Path, io_layer: CSVIOlayer, monkeypatch):
+    cache = ConfigCache(str(tmp_path / "cache"))
+    first = cache.load(io_layer, str(config_path))
+
+    def fail_parse(config_path: str):
+        raise AssertionError("The config should come from the cache")
+
+    monkeypatch.setattr(io_layer, "parse_config", fail_parse)
+    second = cache.load(io_layer, str(config_path))
+
+    assert second.config == first.config
+    assert [column for column, _ in second.compiled_rules] == [1, 2]
+    assert not second.compiled_rules[1][1]("130", ["1", "Ana", "130"])
+    assert second.compiled_rules[0][1]("Ana", ["1", "Ana", "30"])
+
+
+def test_changed_config_misses_cache(tmp_path: Path, config_path: Path, io_layer: CSVIOlayer):
+    cache = ConfigCache(str(tmp_path / "cache"))
+    cache.load(io_layer, str(config_path))
+
+    config_path.write_text("headers:{}\nvalidator:{Null Errors}\n", encoding="utf-8")
+    compiled = cache.load(io_layer, str(config_path))
+
+    assert compiled.config.header_types == []
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 2
+
+
+def test_corrupted_entry_is_discarded(tmp_path: Path, config_path: Path, io_layer: CSVIOlayer):
+    cache = ConfigCache(str(tmp_path / "cache"))
+    key = cache.key(config_path.read_bytes())
+    cache.cache_dir.mkdir(parents=True)
+    (cache.cache_dir / f"{key}.pickle").write_bytes(b"not a pickle")
+
+    assert cache.get(key) is None
+    assert cache.load(io_layer, str(config_path)).config.header_types == [int, str, int]
+
+
+class _BrokenEntry:
+    """Object whose pickle fails to load, like the ones of an incompatible version"""
+
+    def __reduce__(self):
+        return (int, ("not a number",))
+
+
+@pytest.mark.parametrize("entry", [_BrokenEntry(), {"not": "compiled"}], ids=["error", "other"])
+def test_unloadable_entry_is_parsed_again(
+    tmp_path: Path, config_path: Path, io_layer: CSVIOlayer, entry: object
+):
+    cache = ConfigCache(str(tmp_path / "cache"))
+    key = cache.key(config_path.read_bytes())
+    cache.cache_dir.mkdir(parents=True)
+    entry_path = cache.cache_dir / f"{key}.pickle"
+    entry_path.write_bytes(pickle.dumps(entry))
+
+    assert cache.get(key) is None
+    assert not entry_path.exists()
+    assert cache.load(io_layer, str(config_path)).config.header_types == [int, str, int]
+
+
+def test_lru_eviction(tmp_path: Path):
+    cache = ConfigCache(str(tmp_path / "cache"), max_entries=2)
+    entry = CompiledConfiguration(Configuration(), [])
+
+    cache.put("a", entry)
+    cache.put("b", entry)
+    os.utime(cache.cache_dir / "a.pickle", ns=(0, 0))
+    os.utime(cache.cache_dir / "b.pickle", ns=(1, 1))
+    assert cache.get("a") is not None  # "a" is now the most recently used
+    cache.put("c", entry)
+
+    assert sorted(path.stem for path in cache.cache_dir.glob("*.pickle")) == ["a", "c"]
@@ -1,3 +1,4 @@
+from datetime import date, datetime
 from pathlib import Path
 
 import pytest
@@ -293,3 +294,117 @@ def test_empty_validator(tmp_path: Path):
 
     with pytest.raises(ValueError):
         io_layer.parse_config(str(config_path))
+
+
+def test_rules_section(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    output_path = tmp_path / "output.csv"
+    lines = [
+        "headers:{str,int,str}",
+        "validator:{Null Errors, Type Errors}",
+        "rules:{1:range(0,120); 2:enum(Madrid|Bilbao); 0:unique}",
+    ]
+
+    config_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    io_layer = CSVIOlayer(str(output_path))
+
+    configure = io_layer.parse_config(str(config_path))
+
+    assert [(rule.column, rule.name, rule.args) for rule in configure.rules] == [
+        (1, "range", ["0", "120"]),
+        (2, "enum", ["Madrid|Bilbao"]),
+        (0, "unique", []),
+    ]
+
+
+def test_bad_rules_section(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    output_path = tmp_path / "output.csv"
+    lines = ["headers:{str,int,str}", "validator:{Null Errors, Type Errors}", "rules:{range}"]
+
+    config_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    io_layer = CSVIOlayer(str(output_path))
+
+    with pytest.raises(ValueError):
+        io_layer.parse_config(str(config_path))
+
+
+def test_references_section(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    output_path = tmp_path / "output.csv"
+    lines = [
+        "headers:{str,int,str}",
+        "validator:{Null Errors, Type Errors}",
+        "references:{2:refs/cities.csv; 0:refs/names.csv@name}",
+    ]
+
+    config_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    io_layer = CSVIOlayer(str(output_path))
+
+    configure = io_layer.parse_config(str(config_path))
+
+    assert [(ref.column, ref.path, ref.reference_column) for ref in configure.references] == [
+        (2, "refs/cities.csv", "0"),
+        (0, "refs/names.csv", "name"),
+    ]
+
+
+def test_parse_columns(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    lines = ["headers:{int,str}", "validator:{Type Errors}", "columns:{id; name}"]
+    config_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    configure = CSVIOlayer(None).parse_config(str(config_path))
+
+    assert configure.columns == ["id", "name"]
+
+
+def test_parse_outliers(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    lines = [
+        "headers:{int,float,float}",
+        "validator:{Type Errors, Outlier Errors}",
+        "outliers:{1:zscore(4); 2:mad(3.5,500); 0:iqr}",
+    ]
+    config_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    configure = CSVIOlayer(None).parse_config(str(config_path))
+
+    assert configure.trate_outliererror
+    assert [(spec.column, spec.method, spec.threshold) for spec in configure.outliers] == [
+        (1, "zscore", 4.0),
+        (2, "mad", 3.5),
+        (0, "iqr", None),
+    ]
+    assert configure.outliers[1].window == 500
+
+
+def test_parse_dates(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    lines = [
+        "headers:{int,date,datetime}",
+        "validator:{Type Errors, Normalize Dates}",
+        "dates:{1:%d/%m/%Y; 2:%Y-%m-%dT%H:%M:%S}",
+    ]
+    config_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    configure = CSVIOlayer(None).parse_config(str(config_path))
+
+    assert configure.header_types == [int, date, datetime]
+    assert configure.date_formats == {1: "%d/%m/%Y", 2: "%Y-%m-%dT%H:%M:%S"}
+    assert configure.normalize_dates
+
+
+@pytest.mark.parametrize(
+    "dates", ["1:%d/%b/%Y", "0:%Y-%m-%d"], ids=["not_supported_format", "not_a_date_column"]
+)
+def test_parse_dates_errors(tmp_path: Path, dates: str):
+    config_path = tmp_path / "config.txt"
+    lines = ["headers:{int,date}", "validator:{Type Errors}", f"dates:{{{dates}}}"]
+    config_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        CSVIOlayer(None).parse_config(str(config_path))
@@ -0,0 +1,61 @@
+import codecs
+from pathlib import Path
+
+import pytest
+
+from csvclean.IO_layer.csv_io_layout import CSVIOlayer
+from csvclean.IO_layer.encoding import detect_encoding, is_ascii_compatible
+
+TEXT = "name;city\nJosé;Logroño\nZoë;Málaga\n"
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    argvalues=[
+        (codecs.BOM_UTF8 + TEXT.encode("utf-8"), "utf-8-sig"),
+        (TEXT.encode("utf-16"), "utf-16"),
+        (codecs.BOM_UTF32_LE + TEXT.encode("utf-32-le"), "utf-32"),
+        (TEXT.encode("utf-16-le"), "utf-16-le"),
+        (TEXT.encode("utf-16-be"), "utf-16-be"),
+        (TEXT.encode("utf-8"), "utf-8"),
+        (TEXT.encode("cp1252"), "cp1252"),
+        (b"name;city\nA;\x81\n", "latin-1"),
+    ],
+    ids=["utf8_bom", "utf16_bom", "utf32_bom", "utf16le", "utf16be", "utf8", "cp1252", "latin1"],
+)
+def test_detect_encoding(tmp_path: Path, content: bytes, expected: str):
+    input_path = tmp_path / "input.csv"
+    input_path.write_bytes(content)
+
+    assert detect_encoding(str(input_path)) == expected
+
+
+def test_detect_utf8_cut_in_sample(tmp_path: Path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_bytes("ñ".encode() * 10)
+
+    assert detect_encoding(str(input_path), sample_size=5) == "utf-8"
+
+
+@pytest.mark.parametrize(
+    "encoding",
+    argvalues=["latin-1", "utf-16", "utf-8-sig"],
+    ids=["latin1", "utf16", "utf8_bom"],
+)
+def test_read_csv_detected_encoding(tmp_path: Path, encoding: str):
+    input_path = tmp_path / "input.csv"
+    input_path.write_bytes(TEXT.encode(encoding))
+
+    io_layer = CSVIOlayer(str(tmp_path / "output.csv"))
+
+    assert list(io_layer.read_csv(str(input_path))) == [
+        ("__header__", ["name", "city"]),
+        ("__row__", ["José", "Logroño"]),
+        ("__row__", ["Zoë", "Málaga"]),
+    ]
+
+
+def test_is_ascii_compatible():
+    assert is_ascii_compatible("UTF8")
+    assert is_ascii_compatible("cp1252")
+    assert not is_ascii_compatible("utf-16")
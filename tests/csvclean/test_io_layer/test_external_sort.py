@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+
+from csvclean.IO_layer.external_sort import ExternalSortSink
+from csvclean.IO_layer.sinks import CSVSink
+from csvclean.models.config import Configuration
+from csvclean.models.options import SinkOptions, SortOptions
+from csvclean.reporters.cleaning_report import Report
+
+HEADER = ["id", "name"]
+ROWS = [
+    ["10", "Eve"],
+    ["2", "Bob"],
+    ["7", "Alice"],
+    ["2", "Bobby"],
+    ["1", "Carl"],
+    ["10", "Dan"],
+]
+
+
+@pytest.fixture
+def config() -> Configuration:
+    """Configuration with a numeric key column"""
+    return Configuration(header_types=[int, str], trate_nullerror=True, trate_typeerror=True)
+
+
+def sort_rows(
+    tmp_path: Path,
+    config: Configuration,
+    sort_options: SortOptions,
+    report: Report,
+    rows: list[list[str]] = ROWS,
+):
+    output_path = tmp_path / "sorted.csv"
+    inner = CSVSink(str(output_path), config, SinkOptions(batch_size=2))
+
+    with ExternalSortSink(inner, config, sort_options, report) as sink:
+        sink.write_header(HEADER)
+        sink.write_rows(rows)
+
+    return output_path.read_text(encoding="utf-8").splitlines()
+
+
+def test_sort_in_memory(tmp_path: Path, config: Configuration):
+    report = Report()
+
+    content = sort_rows(tmp_path, config, SortOptions(keys=["id"]), report)
+
+    assert content == ["id;name", "1;Carl", "2;Bob", "2;Bobby", "7;Alice", "10;Eve", "10;Dan"]
+    assert "sort_spilled_runs" not in report.metrics
+
+
+@pytest.mark.parametrize(
+    "max_fan_in",
+    argvalues=[64, 2],
+    ids=["single_merge", "multi_level_merge"],
+)
+def test_sort_spilling_runs(tmp_path: Path, config: Configuration, max_fan_in: int):
+    report = Report()
+    sort_options = SortOptions(
+        keys=["id"], memory_budget=1, temp_dir=str(tmp_path), max_fan_in=max_fan_in
+    )
+
+    content = sort_rows(tmp_path, config, sort_options, report)
+
+    assert content == ["id;name", "1;Carl", "2;Bob", "2;Bobby", "7;Alice", "10;Eve", "10;Dan"]
+    assert report.metrics["sort_spilled_runs"] == 3
+    assert report.metrics["sort_written_rows"] == 6
+    assert list(tmp_path.glob("csvclean-sort-*")) == []
+
+
+def test_sort_dedupe(tmp_path: Path, config: Configuration):
+    report = Report()
+    sort_options = SortOptions(keys=["0"], dedupe=True, memory_budget=1)
+
+    content = sort_rows(tmp_path, config, sort_options, report)
+
+    assert content == ["id;name", "1;Carl", "2;Bob", "7;Alice", "10;Eve"]
+    # The dropped duplicates are not errors of fixed rows
+    assert report.metrics["sort_duplicate_rows"] == 2
+    assert (report.total_errors, report.fixed_rows) == (0, 0)
+
+
+def test_sort_dedupe_big_integers(tmp_path: Path, config: Configuration):
+    # Both keys are the same float, 2**53
+    rows = [["9007199254740993", "a"], ["9007199254740992", "b"]]
+
+    content = sort_rows(tmp_path, config, SortOptions(keys=["id"], dedupe=True), Report(), rows)
+
+    assert content == ["id;name", "9007199254740992;b", "9007199254740993;a"]
+
+
+def test_sort_bad_key(tmp_path: Path, config: Configuration):
+    inner = CSVSink(str(tmp_path / "sorted.csv"), config, SinkOptions())
+
+    with (
+        pytest.raises(ValueError),
+        ExternalSortSink(inner, config, SortOptions(keys=["x"])) as sink,
+    ):
+        sink.write_header(HEADER)
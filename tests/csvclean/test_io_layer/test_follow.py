@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from csvclean.IO_layer.follow import DirectoryWatcher, FollowedLines, FollowState
+
+
+def test_followed_lines_complete_records(tmp_path: Path):
+    input_path = tmp_path / "log.csv"
+    input_path.write_bytes(b'id,note\n1,a\n2,"two\n')
+    lines = FollowedLines(str(input_path), "utf-8")
+
+    assert list(lines) == ["id,note\n", "1,a\n"]
+    assert lines.offset == 12
+
+    # The quoted note ends in this write, the third row is not complete yet
+    with input_path.open("ab") as input_file:
+        input_file.write(b'lines"\n3,c')
+
+    assert list(lines) == ['2,"two\n', 'lines"\n']
+    assert list(lines) == []
+
+    with input_path.open("ab") as input_file:
+        input_file.write(b"\n")
+
+    assert list(lines) == ["3,c\n"]
+    assert lines.offset == input_path.stat().st_size
+    lines.close()
+
+
+def test_followed_lines_truncated(tmp_path: Path):
+    input_path = tmp_path / "log.csv"
+    input_path.write_bytes(b"id,note\n1,a\n")
+    lines = FollowedLines(str(input_path), "utf-8")
+    list(lines)
+
+    input_path.write_bytes(b"id,note\n")
+
+    with pytest.raises(ValueError):
+        list(lines)
+    lines.close()
+
+
+def test_followed_lines_encoding(tmp_path: Path):
+    input_path = tmp_path / "log.csv"
+    input_path.write_text("id\n", encoding="utf-16")
+
+    with pytest.raises(ValueError):
+        FollowedLines(str(input_path), "utf-16")
+
+
+def test_follow_state(tmp_path: Path):
+    input_path = tmp_path / "log.csv"
+    input_path.write_text("id\n1\n2\n")
+    state_path = str(tmp_path / "state.json")
+
+    FollowState(state_path, str(input_path)).save((3, 5))
+    assert FollowState(state_path, str(input_path)).load() == (3, 5)
+    assert FollowState(None, str(input_path)).load() is None
+
+    # A new file at the same path, after a rotation, is read from the start
+    input_path.rename(tmp_path / "log.1.csv")
+    input_path.write_text("id\n1\n2\n")
+    assert FollowState(state_path, str(input_path)).load() is None
+
+
+def test_directory_watcher(tmp_path: Path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    state_path = str(tmp_path / "state.json")
+    watcher = DirectoryWatcher(str(inbox), "*.csv", state_path)
+    (inbox / "a.csv").write_text("id\n1\n")
+    (inbox / "notes.txt").write_text("skipped")
+
+    assert watcher.poll() == []
+    assert watcher.waiting
+    assert watcher.poll() == [inbox / "a.csv"]
+    assert watcher.poll() == []
+    assert not watcher.waiting
+
+    watcher.done(inbox / "a.csv")
+    (inbox / "b.csv").write_text("id\n2\n")
+    restarted = DirectoryWatcher(str(inbox), "*.csv", state_path)
+    restarted.poll()
+
+    assert restarted.poll() == [inbox / "b.csv"]
@@ -0,0 +1,157 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from csvclean.cli import base_process, verify_process
+from csvclean.IO_layer.manifest import HASH_MASK, HashStream, hash_rows, row_hash
+from csvclean.models import PartitionOptions, ProcessOptions, SortOptions
+
+DIRTY_LINES = [
+    "id,name,city",
+    "1,José,Logroño",
+    "x,Bob,Madrid",
+    "3,,Bilbao",
+    "4,Zoë,Málaga",
+    "5,Al,Soria",
+]
+
+
+@pytest.fixture
+def manifest_run(tmp_path: Path) -> tuple[Path, Path]:
+    config_path = tmp_path / "config.txt"
+    config_path.write_text("headers:{int,str,str}\nvalidator:{Null Errors, Type Errors}\n")
+    input_path = tmp_path / "dirty.csv"
+    input_path.write_text("\n".join(DIRTY_LINES) + "\n", encoding="utf-8")
+    output_path = tmp_path / "clean.csv"
+    manifest_path = tmp_path / "manifest.json"
+    options = ProcessOptions(
+        config_path=str(config_path),
+        config_cache=False,
+        manifest_path=str(manifest_path),
+        manifest_chunk_size=2,
+        sort=SortOptions(keys=["city"]),
+    )
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    return manifest_path, output_path
+
+
+def test_row_hash_separates_values():
+    assert row_hash(["ab", "c"]) != row_hash(["a", "bc"])
+
+
+def test_hash_stream_chunks():
+    stream = HashStream(chunk_size=2)
+    rows = [["1"], ["2"], ["3"]]
+
+    for row in rows:
+        stream.add(row)
+    summary = stream.to_dict()
+
+    assert [chunk["rows"] for chunk in summary["chunks"]] == [2, 1]
+    assert summary["chunks"][0]["hash"] == hash_rows(rows[:2])[1]
+    assert summary["hash"] == f"{sum(map(row_hash, rows)) & HASH_MASK:032x}"
+
+
+def test_chunk_hash_is_rolling():
+    assert hash_rows([["1"], ["2"]]) != hash_rows([["2"], ["1"]])
+
+
+def test_manifest_balance(manifest_run: tuple[Path, Path]):
+    manifest_path, _ = manifest_run
+
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    assert (
+        manifest["input"]["rows"],
+        manifest["rejected"]["rows"],
+        manifest["kept"]["rows"],
+        manifest["output"]["rows"],
+    ) == (5, 2, 3, 3)
+    assert len(manifest["input"]["chunks"]) == 3
+    balance = int(manifest["rejected"]["hash"], 16) + int(manifest["kept"]["hash"], 16)
+    assert balance & HASH_MASK == int(manifest["input"]["hash"], 16)
+
+
+def test_verify_output(manifest_run: tuple[Path, Path]):
+    manifest_path, output_path = manifest_run
+
+    assert verify_process(str(manifest_path)) == []
+
+    lines = output_path.read_text(encoding="utf-8").splitlines()
+    output_path.write_text("\n".join([*lines[:-1], "5;Al;Sevilla"]) + "\n", encoding="utf-8")
+
+    assert verify_process(str(manifest_path)) == [
+        "Chunk 1 of the output doesn't match the manifest."
+    ]
+
+    # The rows of a chunk written in another order don't match either
+    lines[1], lines[2] = lines[2], lines[1]
+    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    assert verify_process(str(manifest_path)) == [
+        "Chunk 0 of the output doesn't match the manifest."
+    ]
+
+
+@pytest.mark.parametrize(
+    ("config", "lines", "sort"),
+    [
+        (
+            "headers:{int,str,str}\nvalidator:{Null Errors, Type Errors}\n",
+            [*DIRTY_LINES, "1,Ana,Soria"],
+            SortOptions(keys=["id"], dedupe=True),
+        ),
+        (
+            "headers:{int,str,date}\nvalidator:{Type Errors, Normalize Dates}\n"
+            "dates:{2:%d/%m/%Y}\n",
+            ["id,name,day", "1,José,31/12/2024", "x,Bob,01/01/2025", "3,Al,15/06/2025"],
+            None,
+        ),
+    ],
+    ids=["dedupe", "normalize_dates"],
+)
+def test_verify_rewritten_and_dropped_rows(
+    tmp_path: Path, config: str, lines: list[str], sort: SortOptions | None
+):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text(config, encoding="utf-8")
+    input_path = tmp_path / "dirty.csv"
+    input_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    manifest_path = tmp_path / "manifest.json"
+    options = ProcessOptions(
+        config_path=str(config_path),
+        config_cache=False,
+        manifest_path=str(manifest_path),
+        manifest_chunk_size=2,
+        sort=sort,
+    )
+
+    base_process(str(input_path), str(tmp_path / "clean.csv"), False, options)
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    assert verify_process(str(manifest_path)) == []
+    assert manifest["kept"]["rows"] == manifest["output"]["rows"] + manifest["dropped"]["rows"]
+    assert manifest["dropped"]["rows"] == (1 if sort else 0)
+
+
+@pytest.mark.parametrize(
+    ("output_name", "partition"),
+    [("clean.parquet", None), ("clean", PartitionOptions(column="city"))],
+    ids=["parquet", "partitioned"],
+)
+def test_manifest_needs_csv_output(
+    tmp_path: Path, output_name: str, partition: PartitionOptions | None
+):
+    input_path = tmp_path / "dirty.csv"
+    input_path.write_text("\n".join(DIRTY_LINES) + "\n", encoding="utf-8")
+    options = ProcessOptions(
+        manifest_path=str(tmp_path / "manifest.json"), partition=partition, config_cache=False
+    )
+
+    with pytest.raises(ValueError):
+        base_process(str(input_path), str(tmp_path / output_name), False, options)
+
+    assert not (tmp_path / "manifest.json").exists()
@@ -0,0 +1,138 @@
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from csvclean.IO_layer import object_store
+from csvclean.IO_layer.object_store import (
+    MultipartWriter,
+    is_s3_url,
+    open_binary,
+    open_text,
+    split_s3_url,
+)
+from csvclean.IO_layer.sinks import CSVSink, build_sink
+from csvclean.models import Configuration, S3Options, SinkOptions
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("s3://bucket/input.csv", ("bucket", "input.csv")),
+        ("s3://bucket/dir/input.csv", ("bucket", "dir/input.csv")),
+    ],
+    ids=["key", "nested_key"],
+)
+def test_split_s3_url(url: str, expected: tuple[str, str]):
+    assert is_s3_url(url)
+    assert split_s3_url(url) == expected
+
+
+@pytest.mark.parametrize("url", ["s3://bucket", "s3:///input.csv"], ids=["no_key", "no_bucket"])
+def test_split_s3_url_incomplete(url: str):
+    with pytest.raises(ValueError):
+        split_s3_url(url)
+
+
+def test_build_sink_s3_only_csv():
+    with pytest.raises(ValueError):
+        build_sink("s3://bucket/out.parquet", Configuration(), SinkOptions())
+
+
+def test_part_size_at_least_5_mib():
+    with pytest.raises(ValidationError):
+        S3Options(part_size=1024 * 1024)
+
+
+class FailingClient:
+    """Stand-in of an S3 client whose upload of the part failing_part fails"""
+
+    def __init__(self, failing_part: int | None = None):
+        self.failing_part = failing_part
+        self.calls: list[str] = []
+
+    def create_multipart_upload(self, **_: Any) -> dict[str, str]:
+        self.calls.append("create")
+        return {"UploadId": "upload"}
+
+    def upload_part(self, PartNumber: int, **_: Any) -> dict[str, str]:  # noqa: N803
+        if PartNumber == self.failing_part:
+            raise ConnectionError("The part failed")
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, **_: Any):
+        self.calls.append("complete")
+
+    def abort_multipart_upload(self, **_: Any):
+        self.calls.append("abort")
+
+    def put_object(self, **_: Any):
+        self.calls.append("put")
+
+
+def test_failed_part_aborts_upload():
+    client = FailingClient(failing_part=2)
+    options = S3Options(part_size=5 * 1024 * 1024, concurrency=1)
+    writer = MultipartWriter(client, "s3://data/output.csv", options)
+
+    # The failure of the second part is raised by a later write or by the close
+    with pytest.raises(ConnectionError):
+        for _ in range(4):
+            writer.write(b"x" * options.part_size)
+        writer.close()
+    writer.close()
+
+    assert client.calls == ["create", "abort"]
+
+
+@pytest.mark.parametrize("rows", [1, 2000000], ids=["single_put", "multipart"])
+def test_failed_run_doesnt_publish_object(monkeypatch: pytest.MonkeyPatch, rows: int):
+    client = FailingClient()
+    monkeypatch.setattr(object_store, "_client", lambda _: client)
+
+    output_url = "s3://data/output.csv"
+    with pytest.raises(RuntimeError), CSVSink(output_url, Configuration(), SinkOptions()) as sink:
+        sink.write_header(["id", "name"])
+        sink.write_rows([["1", "José"]] * rows)
+        raise RuntimeError("The run failed")
+
+    assert "complete" not in client.calls
+    assert "put" not in client.calls
+    assert client.calls[-1:] == (["abort"] if rows > 1 else [])
+
+
+@pytest.fixture
+def bucket():
+    """Bucket of a moto stand-in of S3"""
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="data")
+        yield client
+
+
+def test_ranged_read(bucket):
+    # Three range requests of 5 MiB, the smallest part size
+    content = b"".join(b"%d;value %d\n" % (number, number) for number in range(600000))
+    bucket.put_object(Bucket="data", Key="input.csv", Body=content)
+    options = S3Options(part_size=5 * 1024 * 1024, concurrency=3)
+
+    with open_binary("s3://data/input.csv", "rb", options) as binary_file:
+        lines = list(binary_file)
+
+    assert b"".join(lines) == content
+
+
+def test_multipart_write(bucket):
+    # Parts of 5 MiB, the smallest ones S3 accepts, so the text needs two parts
+    options = S3Options(part_size=5 * 1024 * 1024, concurrency=2)
+    text = "id;name\n" + "1;José\n" * 1000000
+
+    with open_text("s3://data/output.csv", "w", "utf-8", options) as text_file:
+        text_file.write(text)
+
+    body = bucket.get_object(Bucket="data", Key="output.csv")["Body"].read()
+
+    assert body.decode("utf-8") == text
@@ -0,0 +1,72 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from csvclean.IO_layer import PartitionedSink
+from csvclean.IO_layer.partitioned import PARTITIONS_MANIFEST, partition_directory
+from csvclean.models import Configuration, PartitionOptions, SinkOptions
+
+ROWS = [
+    ["1", "2026-10-17", "a"],
+    ["2", "2026-10-18", "b"],
+    ["3", "2026-10-17", "c"],
+    ["4", "", "d"],
+    ["5", "2026-10-19", "e"],
+    ["6", "2026-10-18", "f"],
+]
+
+
+def _read_rows(path: Path) -> list[str]:
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_partition_directory():
+    assert partition_directory("date", "2026-10-17") == "date=2026-10-17"
+    assert partition_directory("city", "a/b") == "city=a%2Fb"
+    assert partition_directory("city", "") == "city=__empty__"
+
+
+@pytest.mark.parametrize("max_open_files", [1, 64], ids=["evicting", "all_open"])
+def test_partitioned_sink_splits_by_column(tmp_path: Path, max_open_files: int):
+    options = PartitionOptions(column="date", max_open_files=max_open_files)
+    sink = PartitionedSink(str(tmp_path), Configuration(), SinkOptions(batch_size=1), options)
+
+    with sink:
+        sink.write_header(["id", "date", "name"])
+        sink.write_rows(ROWS)
+
+    assert _read_rows(tmp_path / "date=2026-10-17" / "part-0001.csv") == [
+        "id;date;name",
+        "1;2026-10-17;a",
+        "3;2026-10-17;c",
+    ]
+    assert _read_rows(tmp_path / "date=__empty__" / "part-0001.csv") == ["id;date;name", "4;;d"]
+
+    manifest = json.loads((tmp_path / PARTITIONS_MANIFEST).read_text(encoding="utf-8"))
+    assert manifest["column"] == "date"
+    assert sum(file["rows"] for file in manifest["files"]) == len(ROWS)
+    assert {file["partition"] for file in manifest["files"]} == {row[1] for row in ROWS}
+
+
+def test_partitioned_sink_rolls_files(tmp_path: Path):
+    options = PartitionOptions(max_file_bytes=30)
+    sink = PartitionedSink(str(tmp_path), Configuration(), SinkOptions(batch_size=2), options)
+
+    with sink:
+        sink.write_header(["id", "date", "name"])
+        sink.write_rows(ROWS)
+
+    parts = sorted(tmp_path.glob("part-*.csv"))
+    assert len(parts) > 1
+    assert all(_read_rows(part)[0] == "id;date;name" for part in parts)
+    assert sum(len(_read_rows(part)) - 1 for part in parts) == len(ROWS)
+
+
+def test_partitioned_sink_unknown_column(tmp_path: Path):
+    sink = PartitionedSink(
+        str(tmp_path), Configuration(), SinkOptions(), PartitionOptions(column="missing")
+    )
+
+    with pytest.raises(ValueError, match="Partition column not found"):
+        sink.write_header(["id", "date", "name"])
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+
+from csvclean.IO_layer import CSVIOlayer, QuarantineSink
+from csvclean.IO_layer.quarantine import format_errors
+from csvclean.models import Configuration, SinkOptions
+from csvclean.models.data_register import ErrorTypes
+
+
+def test_format_errors():
+    errors = {3: ErrorTypes.TYPE, 1: ErrorTypes.NULL}
+
+    assert format_errors(errors) == "1:NULL|3:TYPE"
+
+
+def test_quarantine_rows(tmp_path: Path):
+    path = tmp_path / "rejected.csv"
+    config = Configuration(header_types=[], trate_nullerror=True)
+
+    with QuarantineSink(str(path), config, SinkOptions()) as sink:
+        sink.write_header(["id", "name"])
+        sink.write_rejected(["x", "Bob"], {0: ErrorTypes.TYPE}, 3, 25)
+
+    assert path.read_text(encoding="utf-8").splitlines() == [
+        "line_number;byte_offset;errors;id;name",
+        "3;25;0:TYPE;x;Bob",
+    ]
+
+
+def test_quarantine_not_csv(tmp_path: Path):
+    config = Configuration(header_types=[], trate_nullerror=True)
+
+    with pytest.raises(ValueError):
+        QuarantineSink(str(tmp_path / "rejected.parquet"), config, SinkOptions())
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16"], ids=["utf8", "utf16"])
+def test_read_csv_positions(tmp_path: Path, encoding: str):
+    path = tmp_path / "input.csv"
+    lines = ["id,name", "1,José", '2,"Zoë\nMálaga"', "3,Bob"]
+    content = "\n".join(lines) + "\n"
+    path.write_bytes(content.encode(encoding))
+    io_layer = CSVIOlayer(output_path=str(tmp_path / "out.csv"))
+
+    positions = [io_layer.position for _ in io_layer.read_csv(str(path), encoding)]
+
+    starts = [content.index(record) for record in ["1,", "2,", "3,"]]
+    assert [line for line, _ in positions] == [1, 2, 3, 5]
+    assert [offset for _, offset in positions[1:]] == [
+        len(content[:start].encode(encoding)) for start in starts
+    ]
+    assert io_layer.bytes_read == path.stat().st_size
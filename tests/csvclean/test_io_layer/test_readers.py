@@ -0,0 +1,242 @@
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from csvclean.cli import base_process, profile_process, sample_process
+from csvclean.IO_layer import CSVIOlayer
+from csvclean.IO_layer.readers import FixedWidthReader, NDJSONReader, QueryReader, build_reader
+from csvclean.models import FieldSpec, ProcessOptions, QueryOptions
+
+LAYOUT = [
+    FieldSpec(name="id", width=3),
+    FieldSpec(name="name", width=6),
+    FieldSpec(name="city", width=8),
+]
+
+
+def test_fixed_width_reader(tmp_path: Path):
+    path = tmp_path / "input.txt"
+    path.write_text("1  José  Logroño \n\n22 Bob   Madrid  \n", encoding="utf-8")
+    reader = FixedWidthReader(LAYOUT)
+
+    records = []
+    for record in reader.read(str(path), "utf-8"):
+        records.append((record, reader.position))
+
+    assert records == [
+        (("__header__", ["id", "name", "city"]), (0, 0)),
+        (("__row__", ["1", "José", "Logroño"]), (1, 0)),
+        (("__row__", ["22", "Bob", "Madrid"]), (3, 21)),
+    ]
+
+
+def test_fixed_width_single_column():
+    assert FixedWidthReader([FieldSpec(name="id", width=3)]).split("12 ") == ["12"]
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("1  José  Logr", ["1", "José"]),
+        ("1  José  Logroño xyz", ["1", "José", "Logroño", "xyz"]),
+        ("", []),
+    ],
+    ids=["short", "long", "empty"],
+)
+def test_fixed_width_wrong_width(line: str, expected: list[str]):
+    assert FixedWidthReader(LAYOUT).split(line) == expected
+
+
+def test_fixed_width_without_layout():
+    with pytest.raises(ValueError):
+        FixedWidthReader([])
+
+
+def test_ndjson_reader(tmp_path: Path):
+    path = tmp_path / "input.jsonl"
+    path.write_text(
+        '{"id": 1, "name": "José", "ok": true}\n\n'
+        '{"id": 2, "ok": null, "tags": ["a"], "extra": 1}\n',
+        encoding="utf-8",
+    )
+
+    records = list(NDJSONReader().read(str(path), "utf-8"))
+
+    assert records == [
+        ("__header__", ["id", "name", "ok"]),
+        ("__row__", ["1", "José", "true"]),
+        ("__row__", ["2", "", ""]),
+    ]
+
+
+def test_ndjson_reader_with_layout(tmp_path: Path):
+    path = tmp_path / "input.ndjson"
+    path.write_text('{"id": 1, "tags": {"a": 1}}\n', encoding="utf-8")
+
+    records = list(NDJSONReader([FieldSpec(name="tags", width=1)]).read(str(path), "utf-8"))
+
+    assert records == [("__header__", ["tags"]), ("__row__", ['{"a":1}'])]
+
+
+def test_ndjson_not_object(tmp_path: Path):
+    path = tmp_path / "input.jsonl"
+    path.write_text("[1, 2]\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(NDJSONReader().read(str(path), "utf-8"))
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("input.csv", type(None)),
+        ("input.DAT", FixedWidthReader),
+        ("input.jsonl", NDJSONReader),
+    ],
+    ids=["csv", "fixed_width", "json_lines"],
+)
+def test_build_reader(name: str, expected: type):
+    assert isinstance(build_reader(name, LAYOUT), expected)
+
+
+def test_parse_layout(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text(
+        "headers:{int,str}\nvalidator:{Type Errors}\nlayout:{id:5; full name:20}\n"
+    )
+
+    config = CSVIOlayer(output_path=None).parse_config(str(config_path))
+
+    assert config.layout == [FieldSpec(name="id", width=5), FieldSpec(name="full name", width=20)]
+
+
+def test_base_process_fixed_width(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text(
+        "headers:{int,str,str}\n"
+        "validator:{Null Errors, Type Errors}\n"
+        "layout:{id:3; name:6; city:8}\n"
+    )
+    input_path = tmp_path / "input.fwf"
+    input_path.write_text(
+        "1  José  Logroño \nx  Bob   Madrid  \n3        Bilbao  \n", encoding="utf-8"
+    )
+    output_path = tmp_path / "clean.csv"
+    options = ProcessOptions(config_path=str(config_path), config_cache=False)
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "id;name;city",
+        "1;José;Logroño",
+    ]
+
+
+def test_profile_and_sample_fixed_width(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text(
+        "headers:{int,str,str}\n"
+        "validator:{Null Errors, Type Errors}\n"
+        "layout:{id:3; name:6; city:8}\n"
+    )
+    input_path = tmp_path / "input.fwf"
+    input_path.write_text("1  José  Logroño \nx  Bob   Madrid  \n", encoding="utf-8")
+    profile_path = tmp_path / "profile.json"
+    options = ProcessOptions(config_path=str(config_path), config_cache=False)
+
+    profile_process(str(input_path), str(profile_path), options)
+    estimate = sample_process(str(input_path), 10, options, seed=1)
+
+    profile = json.loads(profile_path.read_text(encoding="utf-8"))
+    assert sorted(profile["columns"]) == ["city", "id", "name"]
+    assert profile["rows"] == 2
+    assert estimate.rows == 2
+    assert estimate.rates()["TYPE"][0] == 0.5
+
+
+@pytest.fixture
+def database_path(tmp_path: Path) -> Path:
+    """SQLite database with a dirty people table"""
+    path = tmp_path / "input.sqlite"
+    with closing(sqlite3.connect(path)) as connection, connection:
+        connection.execute("CREATE TABLE people (id, name, city)")
+        connection.executemany(
+            "INSERT INTO people VALUES (?, ?, ?)",
+            [
+                (1, "José", "Logroño"),
+                ("x", "Bob", "Madrid"),
+                (3, None, "Bilbao"),
+                (4, "Zoë", b"\x01"),
+            ],
+        )
+    return path
+
+
+def test_query_reader(database_path: Path):
+    reader = QueryReader(fetch_size=3)
+
+    with closing(sqlite3.connect(database_path)) as connection:
+        records = list(reader.read(connection, "SELECT * FROM people WHERE id != ?", ["x"]))
+
+    assert records == [
+        ("__header__", ["id", "name", "city"]),
+        ("__row__", ["1", "José", "Logroño"]),
+        ("__row__", ["3", "", "Bilbao"]),
+        ("__row__", ["4", "Zoë", "01"]),
+    ]
+    assert reader.position == (3, 0)
+
+
+def test_query_reader_without_rows(database_path: Path):
+    with closing(sqlite3.connect(database_path)) as connection, pytest.raises(ValueError):
+        list(QueryReader().read(connection, "UPDATE people SET city = ''"))
+
+
+def test_base_process_query(tmp_path: Path, database_path: Path):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text("headers:{int,str,str}\nvalidator:{Null Errors, Type Errors}\n")
+    output_path = tmp_path / "clean.csv"
+    options = ProcessOptions(
+        config_path=str(config_path),
+        config_cache=False,
+        query=QueryOptions(sql="SELECT id, name, city FROM people ORDER BY rowid", fetch_size=2),
+    )
+
+    base_process(str(database_path), str(output_path), False, options)
+
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "id;name;city",
+        "1;José;Logroño",
+        "4;Zoë;01",
+    ]
+
+
+def test_base_process_fixed_width_wrong_width(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text(
+        "headers:{int,str,str}\n"
+        "validator:{Null Errors, Type Errors}\n"
+        "layout:{id:3; name:6; city:8}\n"
+    )
+    input_path = tmp_path / "input.fwf"
+    input_path.write_text(
+        "1  José  Logroño \n2  Bob   Mad\n3  Ana   Bilbao  xyz\n", encoding="utf-8"
+    )
+    output_path = tmp_path / "clean.csv"
+    quarantine_path = tmp_path / "rejected.csv"
+    options = ProcessOptions(
+        config_path=str(config_path), config_cache=False, quarantine_path=str(quarantine_path)
+    )
+
+    base_process(str(input_path), str(output_path), False, options)
+
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "id;name;city",
+        "1;José;Logroño",
+    ]
+    assert [
+        line.split(";")[2] for line in quarantine_path.read_text(encoding="utf-8").splitlines()
+    ] == ["errors", "2:STRUCTURE", "3:STRUCTURE"]
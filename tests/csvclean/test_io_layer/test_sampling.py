@@ -0,0 +1,45 @@
+import random
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from csvclean.IO_layer import CSVIOlayer, csv_io_layout
+from csvclean.IO_layer.sampling import reservoir_sample, seek_sample
+
+
+def test_reservoir_shorter_stream():
+    assert reservoir_sample(range(3), 5, random.Random(0)) == [0, 1, 2]
+
+
+def test_reservoir_uniform():
+    rng = random.Random(3)
+    counts = Counter()
+
+    for _ in range(2000):
+        counts.update(reservoir_sample(range(100), 10, rng))
+
+    assert len(counts) == 100
+    assert all(abs(count - 200) < 70 for count in counts.values())
+
+
+def test_seek_sample_reaches_every_row(tmp_path: Path):
+    path = tmp_path / "input.csv"
+    path.write_text("id,name\n1,a\n2,b\n3,c\n")
+
+    rows = seek_sample(str(path), "utf-8", ",", 200, rng=random.Random(1), data_start=8)
+
+    assert {tuple(row) for row in rows} == {("1", "a"), ("2", "b"), ("3", "c")}
+
+
+@pytest.mark.parametrize("full_scan_bytes", [0, 10**9], ids=["seek", "reservoir"])
+def test_sample_csv(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, full_scan_bytes: int):
+    monkeypatch.setattr(csv_io_layout, "FULL_SCAN_BYTES", full_scan_bytes)
+    path = tmp_path / "input.csv"
+    path.write_text("id,name\n" + "".join(f"{i},n{i}\n" for i in range(1000)))
+
+    records = list(CSVIOlayer(output_path=None).sample_csv(str(path), 50, seed=4))
+
+    assert records[0] == ("__header__", ["id", "name"])
+    assert len(records) == 51
+    assert all(row == [row[0], f"n{row[0]}"] for _, row in records[1:])
@@ -0,0 +1,305 @@
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+from csvclean.IO_layer import CSVIOlayer
+from csvclean.IO_layer.sinks import ArrowIPCSink, CSVSink, ParquetSink, SQLiteSink, build_sink
+from csvclean.models.config import Configuration
+from csvclean.models.options import SinkOptions
+from csvclean.models.row_batch import RowBatch
+from csvclean.reporters.cleaning_report import Report
+
+
+@pytest.fixture
+def typed_config() -> Configuration:
+    """Configuration with the types of the sample rows"""
+    return Configuration(
+        header_types=[int, str, float, bool], trate_nullerror=True, trate_typeerror=True
+    )
+
+
+HEADER = ["id", "name", "score", "active"]
+ROWS = [
+    ["1", "Alice", "7.5", "true"],
+    ["2", "Bob", "8.25", "no"],
+    ["3", "Alice", "9.0", "1"],
+]
+
+
+@pytest.mark.parametrize(
+    "file_name, expected",
+    argvalues=[
+        ("out.csv", CSVSink),
+        ("out.parquet", ParquetSink),
+        ("out.arrow", ArrowIPCSink),
+        ("out.sqlite", SQLiteSink),
+    ],
+    ids=["csv", "parquet", "arrow", "sqlite"],
+)
+def test_build_sink(tmp_path: Path, typed_config: Configuration, file_name: str, expected: type):
+    sink = build_sink(str(tmp_path / file_name), typed_config, SinkOptions())
+    sink.close()
+
+    assert isinstance(sink, expected)
+
+
+def test_build_sink_bad_format(tmp_path: Path, typed_config: Configuration):
+    with pytest.raises(ValueError):
+        build_sink(str(tmp_path / "out.txt"), typed_config, SinkOptions())
+
+
+def test_csv_sink_writes_in_batches(tmp_path: Path, typed_config: Configuration):
+    output_path = tmp_path / "out.csv"
+
+    with CSVSink(str(output_path), typed_config, SinkOptions(batch_size=2)) as sink:
+        sink.write_header(HEADER)
+        sink.write_rows(ROWS)
+
+        # Only the row out of the full batch is still buffered
+        assert len(sink._buffer) == 1
+
+    content = output_path.read_text(encoding="utf-8").splitlines()
+
+    assert content == [";".join(row) for row in [HEADER, *ROWS]]
+
+
+def test_csv_sink_append(tmp_path: Path, typed_config: Configuration):
+    output_path = tmp_path / "out.csv"
+    options = SinkOptions(append=True)
+
+    for rows in [ROWS[:1], ROWS[1:]]:
+        with CSVSink(str(output_path), typed_config, options) as sink:
+            sink.write_header(HEADER)
+            sink.write_rows(rows)
+
+    content = output_path.read_text(encoding="utf-8").splitlines()
+
+    # The header is only written to the empty file
+    assert content == [";".join(row) for row in [HEADER, *ROWS]]
+
+
+def test_parquet_sink_types_and_row_groups(tmp_path: Path, typed_config: Configuration):
+    pq = pytest.importorskip("pyarrow.parquet")
+    output_path = tmp_path / "out.parquet"
+
+    with ParquetSink(str(output_path), typed_config, SinkOptions(row_group_size=2)) as sink:
+        sink.write_header(HEADER)
+        sink.write_rows(ROWS)
+
+    parquet_file = pq.ParquetFile(output_path)
+    table = parquet_file.read()
+
+    assert parquet_file.num_row_groups == 2
+    assert table.column_names == HEADER
+    assert table.to_pydict() == {
+        "id": [1, 2, 3],
+        "name": ["Alice", "Bob", "Alice"],
+        "score": [7.5, 8.25, 9.0],
+        "active": [True, False, True],
+    }
+
+
+def test_parquet_sink_writes_batch_columns(tmp_path: Path, typed_config: Configuration):
+    pq = pytest.importorskip("pyarrow.parquet")
+    output_path = tmp_path / "out.parquet"
+    batch = RowBatch.from_rows(ROWS * 2)
+    batch.drop([1])
+
+    with ParquetSink(str(output_path), typed_config, SinkOptions(row_group_size=2)) as sink:
+        sink.write_header(HEADER)
+        sink.write_batch(batch)
+
+        # The columns of the batch are buffered as they are, only the rest of a group
+        assert sink._columns[0] == ["3"]
+
+    parquet_file = pq.ParquetFile(output_path)
+
+    assert [parquet_file.metadata.row_group(i).num_rows for i in range(3)] == [2, 2, 1]
+    assert parquet_file.read().column("id").to_pylist() == [1, 3, 1, 2, 3]
+
+
+def test_parquet_sink_untyped_columns(tmp_path: Path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    output_path = tmp_path / "out.parquet"
+    config = Configuration(header_types=[], trate_nullerror=True, trate_typeerror=False)
+
+    with ParquetSink(str(output_path), config, SinkOptions(compression=None)) as sink:
+        sink.write_header(HEADER)
+        sink.write_rows(ROWS)
+
+    assert pq.read_table(output_path).column("id").to_pylist() == ["1", "2", "3"]
+
+
+@pytest.mark.parametrize("normalized", [False, True], ids=["raw", "normalized"])
+def test_parquet_sink_date_columns(tmp_path: Path, normalized: bool):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    config = Configuration(
+        header_types=[date, datetime],
+        trate_typeerror=True,
+        date_formats={0: "%d/%m/%Y"},
+        normalize_dates=normalized,
+    )
+    rows = [["31/12/2024", "2024-12-31 23:59:58"], ["bad", "2025-01-01 00:00:00"]]
+    if normalized:
+        rows = [["2024-12-31", "2024-12-31T23:59:58"], ["bad", "2025-01-01T00:00:00"]]
+    output_path = tmp_path / "out.parquet"
+
+    with ParquetSink(str(output_path), config, SinkOptions()) as sink:
+        sink.write_header(["d", "t"])
+        sink.write_rows(rows)
+
+    table = pq.read_table(output_path)
+
+    assert table.schema.field("d").type == pa.date32()
+    assert table.schema.field("t").type == pa.timestamp("us")
+    assert table.to_pydict() == {
+        "d": [date(2024, 12, 31), None],
+        "t": [datetime(2024, 12, 31, 23, 59, 58), datetime(2025, 1, 1)],
+    }
+
+
+def test_sqlite_sink_date_columns(tmp_path: Path):
+    config = Configuration(
+        header_types=[date, datetime], trate_typeerror=True, date_formats={0: "%d/%m/%Y"}
+    )
+    output_path = tmp_path / "out.sqlite"
+
+    with SQLiteSink(str(output_path), config, SinkOptions()) as sink:
+        sink.write_header(["d", "t"])
+        sink.write_rows([["31/12/2024", "2024-12-31 23:59:58"]])
+
+    with sqlite3.connect(output_path) as connection:
+        columns = connection.execute("PRAGMA table_info(clean_data)").fetchall()
+        rows = connection.execute("SELECT * FROM clean_data").fetchall()
+
+    assert [column[2] for column in columns] == ["TEXT", "TEXT"]
+    assert rows == [("2024-12-31", "2024-12-31T23:59:58")]
+
+
+def test_arrow_sink_dictionary_deltas(tmp_path: Path, typed_config: Configuration):
+    pa = pytest.importorskip("pyarrow")
+    output_path = tmp_path / "out.arrow"
+
+    with ArrowIPCSink(str(output_path), typed_config, SinkOptions(batch_size=1)) as sink:
+        sink.write_header(HEADER)
+        sink.write_rows(ROWS)
+
+    table = pa.ipc.open_file(str(output_path)).read_all()
+
+    assert pa.types.is_dictionary(table.schema.field("name").type)
+    assert table.column("name").to_pylist() == ["Alice", "Bob", "Alice"]
+    assert table.column("id").to_pylist() == [1, 2, 3]
+
+
+def test_arrow_sink_distinct_column_as_string(tmp_path: Path, typed_config: Configuration):
+    pa = pytest.importorskip("pyarrow")
+    output_path = tmp_path / "out.arrow"
+    rows = [[str(i), f"name{i}", "1.0", "true"] for i in range(300)]
+
+    with ArrowIPCSink(str(output_path), typed_config, SinkOptions(batch_size=100)) as sink:
+        sink.write_header(["id", "name", "city", "active"])
+        sink.write_rows(rows)
+
+    table = pa.ipc.open_file(str(output_path)).read_all()
+
+    # Every name is distinct, so the column isn't dictionary encoded
+    assert table.schema.field("name").type == pa.string()
+    assert table.column("name").to_pylist() == [row[1] for row in rows]
+
+
+def test_sqlite_sink_typed_table(tmp_path: Path, typed_config: Configuration):
+    output_path = tmp_path / "out.sqlite"
+    options = SinkOptions(batch_size=2, transaction_rows=2, index_columns=["name", "0"])
+
+    with SQLiteSink(str(output_path), typed_config, options) as sink:
+        sink.write_header(HEADER)
+        sink.write_rows(ROWS)
+
+    reporter = Report()
+    sink.record_metrics(reporter)
+
+    with sqlite3.connect(output_path) as connection:
+        columns = connection.execute("PRAGMA table_info(clean_data)").fetchall()
+        rows = connection.execute("SELECT * FROM clean_data ORDER BY id").fetchall()
+        indexes = connection.execute("PRAGMA index_list(clean_data)").fetchall()
+
+    assert [(column[1], column[2]) for column in columns] == [
+        ("id", "INTEGER"),
+        ("name", "TEXT"),
+        ("score", "REAL"),
+        ("active", "INTEGER"),
+    ]
+    assert rows == [(1, "Alice", 7.5, 1), (2, "Bob", 8.25, 0), (3, "Alice", 9.0, 1)]
+    assert len(indexes) == 2
+    assert reporter.metrics["sqlite_rows"] == 3
+
+
+def test_sqlite_sink_keeps_other_tables(tmp_path: Path, typed_config: Configuration):
+    output_path = tmp_path / "analytics.db"
+    with sqlite3.connect(output_path) as connection:
+        connection.execute("CREATE TABLE other (value TEXT)")
+        connection.execute("INSERT INTO other VALUES ('kept')")
+        connection.execute("CREATE TABLE people (old TEXT)")
+
+    # Preparing the output doesn't truncate the database, the sink only replaces its table
+    CSVIOlayer(str(output_path))
+    with SQLiteSink(str(output_path), typed_config, SinkOptions(table="people")) as sink:
+        sink.write_header(HEADER)
+        sink.write_rows(ROWS)
+
+    with sqlite3.connect(output_path) as connection:
+        tables = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        other = connection.execute("SELECT * FROM other").fetchall()
+        people = connection.execute("SELECT id FROM people ORDER BY id").fetchall()
+
+    assert sorted(name for (name,) in tables) == ["other", "people"]
+    assert other == [("kept",)]
+    assert people == [(1,), (2,), (3,)]
+
+
+def test_sqlite_sink_failed_load_keeps_table(tmp_path: Path, typed_config: Configuration):
+    output_path = tmp_path / "analytics.db"
+    with sqlite3.connect(output_path) as connection:
+        connection.execute("CREATE TABLE people (id INTEGER)")
+        connection.execute("INSERT INTO people VALUES (7)")
+
+    options = SinkOptions(table="people", batch_size=1, transaction_rows=1)
+    with pytest.raises(RuntimeError), SQLiteSink(str(output_path), typed_config, options) as sink:
+        sink.write_header(HEADER)
+        sink.write_rows(ROWS)
+        raise RuntimeError("The run failed")
+
+    with sqlite3.connect(output_path) as connection:
+        tables = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        people = connection.execute("SELECT * FROM people").fetchall()
+        journal_mode = connection.execute("PRAGMA journal_mode").fetchone()
+
+    # The committed batches only reached the load table, that is dropped
+    assert [name for (name,) in tables] == ["people"]
+    assert people == [(7,)]
+    assert journal_mode == ("wal",)
+
+
+def test_sqlite_sink_failed_load_removes_new_database(tmp_path: Path, typed_config: Configuration):
+    output_path = tmp_path / "out.sqlite"
+
+    with (
+        pytest.raises(RuntimeError),
+        SQLiteSink(str(output_path), typed_config, SinkOptions()) as sink,
+    ):
+        sink.write_header(HEADER)
+        sink.write_rows(ROWS)
+        raise RuntimeError("The run failed")
+
+    assert not output_path.exists()
+
+
+def test_sqlite_sink_unknown_index_column(tmp_path: Path, typed_config: Configuration):
+    sink = SQLiteSink(str(tmp_path / "out.db"), typed_config, SinkOptions(index_columns=["age"]))
+    sink.write_header(HEADER)
+
+    with pytest.raises(ValueError):
+        sink.close()
@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pytest
+
+from csvclean.cli import base_process, fanout_process
+from csvclean.memory import MemoryGovernor, row_bytes
+from csvclean.models import (
+    BranchOptions,
+    MemoryOptions,
+    ParallelOptions,
+    ProcessOptions,
+    SortOptions,
+)
+from csvclean.parallel import positioned_batches
+
+MIB = 1024 * 1024
+
+
+def test_batch_size_follows_pressure():
+    rss = [10 * MIB]
+    governor = MemoryGovernor(MemoryOptions(limit=100 * MIB), 1000, lambda: rss[0])
+    rows = [["1", "name"]] * 10
+
+    governor.observe(rows)
+    assert governor.batch_size == 1250
+
+    rss[0] = 95 * MIB
+    governor.observe(rows)
+    governor.observe(rows)
+    assert governor.batch_size == 312
+    assert (governor.grows, governor.shrinks) == (1, 2)
+    assert governor.peak_rss == 95 * MIB
+
+
+def test_wide_rows_get_small_batches():
+    options = MemoryOptions(limit=100 * MIB, min_batch_size=8)
+    governor = MemoryGovernor(options, 1000, lambda: None)
+    wide_row = ["x" * 1000] * 500
+
+    governor.observe([wide_row] * 4)
+
+    assert governor.batch_size == int(100 * MIB * options.batch_share / row_bytes(wide_row))
+    assert governor.batch_size < 1000
+
+
+def test_room_and_queue_depth():
+    governor = MemoryGovernor(MemoryOptions(limit=1000 * MIB), 100, lambda: None)
+    # Rows of 1 MiB, so a batch can take 50 of them, 5% of the budget
+    governor.observe([["x" * (MIB - 113)]] * 100)
+    assert governor.batch_size == 50
+
+    governor.hold("sort", 600 * MIB)
+    assert governor.room("sort") == 900 * MIB
+    assert governor.room("pending") == 300 * MIB
+    assert governor.queue_depth("pending", 8) == 6
+
+    governor.hold("sort", 900 * MIB)
+    assert governor.queue_depth("pending", 8) == 1
+
+    governor.release("sort")
+    assert governor.queue_depth("pending", 8) == 8
+    assert governor.peak_held == 900 * MIB
+
+
+def test_governed_batches():
+    governor = MemoryGovernor(MemoryOptions(limit=MIB, min_batch_size=4), 4, lambda: None)
+    records = [("__row__", ["y" * 100]) for _ in range(100)]
+
+    batches = list(positioned_batches(records, lambda: (0, 0), governor))
+
+    assert sum(map(len, batches)) == 100
+    assert len(batches[-2]) > len(batches[0])
+    assert governor.held == 0
+
+
+@pytest.mark.parametrize(
+    "parallel",
+    [None, ParallelOptions(backend="thread", workers=2, batch_size=32)],
+    ids=["sequential", "parallel"],
+)
+def test_base_process_under_limit(tmp_path: Path, parallel: ParallelOptions | None):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text("headers:{int,str}\nvalidator:{Null Errors, Type Errors}\n")
+    input_path = tmp_path / "input.csv"
+    input_path.write_text(
+        "id,name\n" + "".join(f"{(i * 37) % 500 if i % 9 else 'x'},n{i}\n" for i in range(500))
+    )
+    outputs = {}
+
+    # A budget under the memory of the interpreter keeps the batches at their minimum
+    # and spills a sorted run on each batch.
+    for name, memory in [("free", None), ("limited", MemoryOptions(limit=MIB))]:
+        outputs[name] = tmp_path / f"{name}.csv"
+        options = ProcessOptions(
+            config_path=str(config_path),
+            config_cache=False,
+            parallel=parallel,
+            sort=SortOptions(keys=["id"], temp_dir=str(tmp_path)),
+            memory=memory,
+        )
+        base_process(str(input_path), str(outputs[name]), False, options)
+
+    assert outputs["limited"].read_text() == outputs["free"].read_text()
+
+
+def test_fanout_memory_metrics(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text("headers:{int,str}\nvalidator:{Null Errors, Type Errors}\n")
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("id,name\n" + "".join(f"{i},n{i}\n" for i in range(50)))
+    options = ProcessOptions(config_cache=False, memory=MemoryOptions(limit=4096 * MIB))
+
+    [report] = fanout_process(
+        str(input_path),
+        [BranchOptions(config_path=str(config_path), output_path=str(tmp_path / "out.csv"))],
+        options=options,
+    )
+
+    assert report.metrics["memory_limit_bytes"] == 4096 * MIB
+    assert report.metrics["memory_peak_held_bytes"] > 0
+    assert report.metrics["memory_batch_size"] >= 16
@@ -0,0 +1,35 @@
+import pytest
+
+from csvclean.models import ErrorTypes, RowBatch
+
+
+def test_row_batch_stores_columns():
+    batch = RowBatch.from_rows([["1", "a"], ["2", "b"], ["3", "c"]])
+
+    assert batch.columns == [["1", "2", "3"], ["a", "b", "c"]]
+    assert batch.width == 2
+    assert batch.row(1) == ["2", "b"]
+    assert batch.selected_columns() is batch.columns
+
+
+def test_row_batch_selection():
+    batch = RowBatch.from_rows([["1", "a"], ["2", "b"], ["3", "c"]])
+    batch.add_error(1, 0, ErrorTypes.NULL)
+    batch.add_error(1, 0, ErrorTypes.TYPE)
+
+    batch.drop([1])
+
+    assert len(batch) == 2
+    assert batch.errors == {1: {0: ErrorTypes.NULL}}
+    assert batch.rejected() == [1]
+    assert list(batch.selected_rows()) == [["1", "a"], ["3", "c"]]
+
+
+@pytest.mark.parametrize(
+    "rows",
+    argvalues=[[["1", "a"], ["2"]], [[], []]],
+    ids=["ragged", "empty_rows"],
+)
+def test_row_batch_rejects_rows_without_columns(rows: list[list[str]]):
+    with pytest.raises(ValueError):
+        RowBatch.from_rows(rows)
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from csvclean.cli import base_process
+from csvclean.IO_layer import CompiledConfiguration
+from csvclean.models import Configuration, ParallelOptions, ProcessOptions
+from csvclean.models.data_register import ErrorTypes
+from csvclean.parallel import ParallelCleaner, positioned_batches, resolve_backend
+from csvclean.reporters import Report
+
+
+def test_resolve_backend(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    assert resolve_backend("auto") == "thread"
+
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: True, raising=False)
+    assert resolve_backend("auto") == "process"
+    assert resolve_backend("thread") == "thread"
+
+
+def test_positioned_batches():
+    records = [("__row__", [str(i)]) for i in range(5)]
+    positions = iter(range(5))
+
+    batches = list(positioned_batches(records, lambda: next(positions), 2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[2] == [(["4"], 4)]
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_parallel_cleaner_order(backend: str):
+    config = Configuration(header_types=[int], trate_nullerror=True, trate_typeerror=True)
+    compiled = CompiledConfiguration(config, [])
+    rows = [[str(i) if i % 3 else "x"] for i in range(50)]
+    batches = [
+        [(row, (i, 0)) for i, row in enumerate(rows)][start : start + 7]
+        for start in range(0, 50, 7)
+    ]
+    options = ParallelOptions(backend=backend, workers=2, max_pending=1)
+
+    with ParallelCleaner(compiled, options) as pool:
+        results = list(pool.map(batches))
+
+    cleaned = [row_clean for _, (batch, _) in results for row_clean, _ in batch]
+    assert [batch for batch, _ in results] == batches
+    assert cleaned == [row if i % 3 else [] for i, row in enumerate(rows)]
+    assert sum(report.count_errors_by_type[ErrorTypes.TYPE] for _, (_, report) in results) == 17
+
+    # Each batch counts only its own memo lookups, so the merged counts cover every row
+    total = Report()
+    for _, (_, report) in results:
+        total.merge(report)
+    hits, misses = total.metrics["type_memo_hits_0"], total.metrics["type_memo_misses_0"]
+    assert hits + misses == 50
+    assert total.metrics["type_memo_hit_rate_0"] == round(hits / 50, 4)
+
+
+@pytest.mark.parametrize(
+    "rules",
+    ["", "rules:{0: range(0,100)}\n", "rules:{1: unique}\n"],
+    ids=["types", "stateless_rule", "stateful_rule"],
+)
+def test_base_process_parallel(tmp_path: Path, rules: str):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text("headers:{int,str}\nvalidator:{Null Errors, Type Errors}\n" + rules)
+    input_path = tmp_path / "input.csv"
+    input_path.write_text(
+        "id,name\n" + "".join(f"{i if i % 5 else 'x'},n{i % 7}\n" for i in range(300))
+    )
+    outputs = {}
+
+    for name, parallel in [
+        ("sequential", None),
+        ("parallel", ParallelOptions(backend="thread", workers=3, batch_size=16)),
+    ]:
+        outputs[name] = tmp_path / f"{name}.csv"
+        options = ProcessOptions(
+            config_path=str(config_path), config_cache=False, parallel=parallel
+        )
+        base_process(str(input_path), str(outputs[name]), False, options)
+
+    assert outputs["parallel"].read_text() == outputs["sequential"].read_text()
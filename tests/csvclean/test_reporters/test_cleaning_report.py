@@ -55,3 +55,54 @@ def test_correct_report(tmp_path: Path):
     ]
 
     assert content == expected
+
+
+def test_report_metrics(tmp_path: Path):
+    report = Report()
+
+    report.count_errors({0: ErrorTypes.DUPLICATE})
+    report.record_metric("sort_spilled_runs", 3)
+
+    report_path = tmp_path / "report.txt"
+
+    report.do_report(str(report_path))
+
+    content = report_path.read_text(encoding="utf-8").splitlines()
+
+    assert f"There are 1 of {ErrorTypes.DUPLICATE}." in content
+    assert content[-1] == "sort_spilled_runs: 3"
+
+
+def test_merge_reports():
+    report, other = Report(), Report()
+
+    report.count_errors({0: ErrorTypes.NULL})
+    other.count_errors({0: ErrorTypes.TYPE, 1: ErrorTypes.RULE})
+    report.merge(other)
+
+    assert report.count_errors_by_type[ErrorTypes.RULE] == 1
+    assert report.total_errors == 3
+    assert report.fixed_rows == 2
+
+
+def test_merge_metrics():
+    report, other = Report(), Report()
+    report.metrics = {"sort_spilled_rows": 10, "memory_peak_rss_bytes": 50, "type_memo_hits_0": 3}
+    other.metrics = {
+        "sort_spilled_rows": 5,
+        "memory_peak_rss_bytes": 20,
+        "memory_batch_size": 64,
+        "type_memo_hits_0": 5,
+        "type_memo_misses_0": 2,
+    }
+
+    report.merge(other)
+
+    assert report.metrics == {
+        "sort_spilled_rows": 15,
+        "memory_peak_rss_bytes": 50,
+        "memory_batch_size": 64,
+        "type_memo_hits_0": 8,
+        "type_memo_misses_0": 2,
+        "type_memo_hit_rate_0": 0.8,
+    }
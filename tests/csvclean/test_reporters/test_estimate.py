@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from csvclean.cli import sample_process
+from csvclean.models import ProcessOptions
+from csvclean.models.data_register import ErrorTypes
+from csvclean.reporters.estimate import SampleEstimate, wilson_interval
+
+
+@pytest.mark.parametrize(
+    "successes, trials, expected",
+    argvalues=[(0, 10, (0.0, 0.2775)), (5, 10, (0.2366, 0.7634)), (0, 0, (0.0, 1.0))],
+    ids=["no_successes", "half", "no_trials"],
+)
+def test_wilson_interval(successes: int, trials: int, expected: tuple[float, float]):
+    assert wilson_interval(successes, trials) == pytest.approx(expected, abs=1e-4)
+
+
+def test_sample_estimate():
+    estimate = SampleEstimate()
+
+    estimate.add({0: ErrorTypes.NULL, 1: ErrorTypes.NULL}, rejected=True)
+    estimate.add({}, rejected=False)
+
+    rates = estimate.rates()
+    assert rates["rejected"][0] == 0.5
+    assert rates["NULL"][0] == 0.5
+    assert "rejected: 50.00%" in estimate.format()
+
+
+def test_sample_process(tmp_path: Path):
+    config_path = tmp_path / "config.txt"
+    config_path.write_text("headers:{int,str}\nvalidator:{Null Errors, Type Errors}\n")
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("id,name\n" + "".join(f"{i if i % 4 else 'x'},a\n" for i in range(400)))
+    options = ProcessOptions(config_path=str(config_path), config_cache=False)
+
+    estimate = sample_process(str(input_path), 100, options, seed=2)
+
+    rate, low, high = estimate.rates()["TYPE"]
+    assert estimate.rows == 100
+    assert low <= 0.25 <= high
+    assert estimate.rates()["rejected"][0] == rate
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from csvclean.cli import profile_process
+from csvclean.reporters.profiler import DataProfiler
+
+ROWS = [["1", "true", "Madrid"], ["2", "", "Bilbao"], ["x", "no", "Madrid"], ["4.5", "1", "Madrid"]]
+
+
+def test_profiler_columns():
+    profiler = DataProfiler(["id", "flag", "city"])
+
+    for row in ROWS:
+        profiler.add_row(row)
+    summary = profiler.to_dict()["columns"]
+
+    assert summary["id"]["type_matches"] == {
+        "str": 4,
+        "int": 2,
+        "float": 1,
+        "bool": 1,
+        "date": 0,
+        "datetime": 0,
+    }
+    assert summary["id"]["numeric"]["mean"] == 2.5
+    assert summary["flag"]["nulls"] == 1
+    assert summary["city"]["distinct"] == 2
+    assert summary["city"]["top"][0] == ("Madrid", 3)
+    assert "numeric" not in summary["city"]
+    assert summary["city"]["type_memo_hit_rate"] == 0.5
+
+
+def test_profiler_merge():
+    whole, first, second = (DataProfiler(["id", "flag", "city"]) for _ in range(3))
+
+    for index, row in enumerate(ROWS):
+        whole.add_row(row)
+        (first if index < 2 else second).add_row(row)
+    first.merge(second)
+
+    merged, expected = first.to_dict(), whole.to_dict()
+    for summary in [merged, expected]:
+        for column in summary["columns"].values():
+            del column["type_memo_hit_rate"]
+    assert merged == expected
+
+
+def test_profile_process(tmp_path: Path):
+    input_path = tmp_path / "input.csv"
+    profile_path = tmp_path / "profile.json"
+    input_path.write_text("\n".join(",".join(row) for row in [["id", "flag", "city"], *ROWS]))
+
+    profile_process(str(input_path), str(profile_path))
+
+    profile = json.loads(profile_path.read_text(encoding="utf-8"))
+    assert profile["rows"] == 4
+    assert profile["columns"]["city"]["top"][0] == ["Madrid", 3]
@@ -0,0 +1,94 @@
+import io
+from pathlib import Path
+
+from csvclean.models import ProgressOptions
+from csvclean.reporters import ProgressTracker, Report
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_tracker(options: ProgressOptions, stream: io.StringIO | None = None):
+    clock = FakeClock()
+    consumed = {"bytes": 0}
+    tracker = ProgressTracker(1000, lambda: consumed["bytes"], options, stream, clock)
+    return tracker, clock, consumed
+
+
+def test_sampled_every_n_rows():
+    stream = io.StringIO()
+    tracker, clock, consumed = make_tracker(ProgressOptions(sample_every=10, interval=0), stream)
+
+    for row in range(25):
+        clock.now += 0.1
+        consumed["bytes"] += 10
+        tracker.count(written=row % 5 != 0)
+
+    assert len(stream.getvalue().splitlines()) == 2
+    assert (tracker.rows, tracker.written, tracker.rejected) == (25, 20, 5)
+    assert tracker.rows_per_second == 10
+
+
+def test_throttled_by_interval():
+    stream = io.StringIO()
+    tracker, clock, _ = make_tracker(ProgressOptions(sample_every=1, interval=5), stream)
+
+    for _ in range(20):
+        clock.now += 1
+        tracker.count(written=True)
+
+    assert len(stream.getvalue().splitlines()) == 4
+
+
+def test_moving_average_and_eta():
+    tracker, clock, consumed = make_tracker(
+        ProgressOptions(interval=0, smoothing=0.5, stderr=False)
+    )
+
+    clock.now, consumed["bytes"], tracker.rows = 1, 100, 10
+    tracker.sample()
+    clock.now, consumed["bytes"], tracker.rows = 2, 400, 40
+    tracker.sample()
+
+    assert tracker.rows_per_second == 20
+    assert tracker.bytes_per_second == 200
+    assert tracker.eta == 3
+    assert "40.0%" in tracker.format_line()
+
+
+def test_prometheus_file(tmp_path: Path):
+    metrics_path = tmp_path / "metrics.prom"
+    options = ProgressOptions(stderr=False, prometheus_path=str(metrics_path))
+    tracker, clock, consumed = make_tracker(options)
+    report = Report()
+
+    clock.now, consumed["bytes"] = 2, 1000
+    tracker.count(written=False)
+    tracker.finish(report)
+
+    content = metrics_path.read_text(encoding="utf-8")
+    assert "# TYPE csvclean_rows_processed_total counter" in content
+    assert "csvclean_rows_rejected_total 1\n" in content
+    assert "csvclean_eta_seconds 0.0\n" in content
+    assert list(tmp_path.iterdir()) == [metrics_path]
+    assert report.metrics["progress_bytes"] == 1000
+
+    # Counters keep all their digits
+    tracker.rows = 12345678
+    assert "csvclean_rows_processed_total 12345678\n" in tracker.prometheus_text()
+
+
+def test_memory_usage():
+    tracker, _, _ = make_tracker(ProgressOptions(stderr=False))
+    assert "MiB" not in tracker.format_line()
+    assert "memory_bytes" not in tracker.prometheus_text()
+
+    tracker.memory_usage = lambda: 300 * 1024 * 1024
+
+    assert tracker.format_line().endswith("| 300 MiB")
+    assert "csvclean_memory_bytes 314572800\n" in tracker.prometheus_text()
@@ -0,0 +1,64 @@
+import random
+import statistics
+
+import pytest
+
+from csvclean.reporters.sketches import HyperLogLog, KLLSketch, MisraGries, RunningStats
+
+
+def test_running_stats_merge():
+    values = [random.Random(1).uniform(-50, 50) for _ in range(10)] + [3.5, 7.25, -1.0, 12.0]
+    left, right = RunningStats(), RunningStats()
+
+    for value in values[:6]:
+        left.add(value)
+    for value in values[6:]:
+        right.add(value)
+    left.merge(right)
+
+    assert left.count == len(values)
+    assert left.mean == pytest.approx(statistics.mean(values))
+    assert left.variance == pytest.approx(statistics.variance(values))
+    assert (left.minimum, left.maximum) == (min(values), max(values))
+
+
+@pytest.mark.parametrize("distinct", [100, 50000], ids=["small_range", "large_range"])
+def test_hyperloglog_cardinality(distinct: int):
+    left, right = HyperLogLog(), HyperLogLog()
+
+    for value in range(distinct):
+        (left if value % 2 else right).add(str(value))
+        left.add(str(value % 10))
+    left.merge(right)
+
+    assert left.cardinality() == pytest.approx(distinct, rel=0.05)
+
+
+def test_misra_gries_top():
+    stream = ["a"] * 50 + ["b"] * 30 + [str(value) for value in range(100)] + ["c"] * 20
+    left, right = MisraGries(k=5), MisraGries(k=5)
+
+    for index, value in enumerate(stream):
+        (left if index % 2 else right).add(value)
+    left.merge(right)
+
+    top = dict(left.top(3))
+    assert set(top) == {"a", "b", "c"}
+    assert all(stream.count(value) - len(stream) / 6 <= top[value] for value in top)
+
+
+def test_kll_quantiles():
+    values = list(range(100000))
+    random.Random(7).shuffle(values)
+    left, right = KLLSketch(seed=1), KLLSketch(seed=2)
+
+    for value in values[:60000]:
+        left.add(value)
+    for value in values[60000:]:
+        right.add(value)
+    left.merge(right)
+
+    assert left.count == len(values)
+    assert sum(len(items) for items in left.compactors) < 1000
+    for fraction in [0.1, 0.5, 0.9]:
+        assert left.quantile(fraction) == pytest.approx(fraction * len(values), abs=2000)
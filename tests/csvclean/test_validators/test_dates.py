@@ -0,0 +1,65 @@
+from datetime import date, datetime
+
+import pytest
+
+from csvclean.models import Configuration
+from csvclean.validators.dates import DateFormat, column_date_format
+
+
+@pytest.mark.parametrize(
+    "pattern, value, expected",
+    [
+        ("%Y-%m-%d", "2024-02-29", (2024, 2, 29, 0, 0, 0, 0)),
+        ("%d/%m/%Y", "31/12/1999", (1999, 12, 31, 0, 0, 0, 0)),
+        ("%Y%m%d%H%M%S", "20240101235959", (2024, 1, 1, 23, 59, 59, 0)),
+        ("%Y-%m-%dT%H:%M:%S.%f", "2024-05-01T08:30:00.000250", (2024, 5, 1, 8, 30, 0, 250)),
+        ("%Y-%m-%d", "2024-13-45", None),
+        ("%Y-%m-%d", "2023-02-29", None),
+        ("%Y-%m-%d", "1900-02-29", None),
+        ("%Y-%m-%d", "2024-04-31", None),
+        ("%Y-%m-%d %H:%M:%S", "2024-01-01 24:00:00", None),
+        ("%Y-%m-%d", "2024/01/01", None),
+        ("%Y-%m-%d", "2024-1-01", None),
+        ("%Y-%m-%d", "\uff12\uff10\uff12\uff14-01-01", None),
+    ],
+    ids=[
+        "leap_day",
+        "day_first",
+        "without_separators",
+        "microseconds",
+        "impossible_month_and_day",
+        "not_leap_year",
+        "not_leap_century",
+        "day_out_of_month",
+        "impossible_hour",
+        "wrong_separator",
+        "short_field",
+        "not_ascii_digits",
+    ],
+)
+def test_parse(pattern: str, value: str, expected: tuple | None):
+    assert DateFormat(pattern).parse(value) == expected
+
+
+@pytest.mark.parametrize(
+    "pattern", ["%Y-%b-%d", "%H:%M", "%Y-%m-%d-%d"], ids=["month_name", "no_date", "repeated"]
+)
+def test_not_supported_format(pattern: str):
+    with pytest.raises(ValueError):
+        DateFormat(pattern)
+
+
+def test_to_iso():
+    assert DateFormat("%d/%m/%Y").to_iso("05/03/2024") == "2024-03-05"
+    assert DateFormat("%Y%m%d %H%M%S").to_iso("20240305 101500") == "2024-03-05T10:15:00"
+    assert DateFormat("%d/%m/%Y").to_iso("32/03/2024") == "32/03/2024"
+
+
+def test_column_date_format():
+    config = Configuration(
+        header_types=[int, date, datetime], trate_typeerror=True, date_formats={1: "%d/%m/%Y"}
+    )
+
+    assert column_date_format(config, 0) is None
+    assert column_date_format(config, 1).pattern == "%d/%m/%Y"
+    assert column_date_format(config, 2).pattern == "%Y-%m-%d %H:%M:%S"
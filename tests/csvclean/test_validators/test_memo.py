@@ -0,0 +1,34 @@
+from csvclean.validators.memo import MemoCache
+
+
+def test_memo_hits():
+    calls = []
+    memo = MemoCache(lambda value: calls.append(value) or value.upper(), max_size=2)
+
+    results = [memo(value) for value in ["a", "b", "a", "c", "b", "a"]]
+
+    assert results == ["A", "B", "A", "C", "B", "A"]
+    assert calls == ["a", "b", "c", "b", "a"]
+    assert memo.hits == 1
+    assert memo.hit_rate == 1 / 6
+
+
+def test_memo_turns_off_on_low_hit_rate():
+    memo = MemoCache(str.upper, max_size=10, min_hit_rate=0.5, warmup=20)
+
+    for value in range(30):
+        memo(str(value))
+
+    assert not memo.enabled
+    assert memo.hits + memo.misses == 20
+    assert memo("x") == "X"
+
+
+def test_memo_stays_on_low_cardinality():
+    memo = MemoCache(str.upper, warmup=20)
+
+    for value in range(1000):
+        memo(["OK", "KO", "PENDING"][value % 3])
+
+    assert memo.enabled
+    assert memo.hit_rate > 0.99
@@ -0,0 +1,68 @@
+import pytest
+
+from csvclean.models import Configuration, ErrorTypes, OutlierSpec
+from csvclean.validators.outlier_validator import (
+    MIN_VALUES,
+    MADDetector,
+    OutlierValidator,
+    ZScoreDetector,
+)
+
+VALUES = [float(10 + value % 7) for value in range(MIN_VALUES * 2)]
+
+
+@pytest.mark.parametrize(
+    "detector",
+    argvalues=[ZScoreDetector(3.0), MADDetector(3.5, window=100)],
+    ids=["zscore", "mad"],
+)
+def test_streaming_detectors(detector: ZScoreDetector | MADDetector):
+    assert not any(detector.is_outlier(value) for value in VALUES)
+    assert detector.is_outlier(1000.0)
+    assert not detector.is_outlier(12.0)
+
+
+def test_no_outliers_before_min_values():
+    detector = ZScoreDetector(3.0)
+    detector.is_outlier(10.0)
+
+    assert not detector.is_outlier(1000.0)
+
+
+def test_validate_line_skips_not_numeric_values():
+    config = Configuration(outliers=[OutlierSpec(column=1, method="zscore")])
+    validator = OutlierValidator()
+
+    for value in VALUES:
+        validator.validate_line(["a", str(value)], config)
+
+    assert validator.validate_line(["a", "x"], config) == {}
+    assert validator.validate_line(["a", ""], config) == {}
+    assert validator.validate_line(["a", "1e9"], config) == {1: ErrorTypes.OUTLIER}
+
+
+def test_iqr_needs_fit():
+    config = Configuration(outliers=[OutlierSpec(column=0, method="iqr")])
+    validator = OutlierValidator()
+    rows = [[str(value)] for value in VALUES]
+
+    assert validator.needs_fit(config)
+    assert validator.validate_line(["1000"], config) == {}
+
+    validator.fit(rows, config)
+
+    assert validator.validate_line(["1000"], config) == {0: ErrorTypes.OUTLIER}
+    assert validator.validate_line(["-1000"], config) == {0: ErrorTypes.OUTLIER}
+    assert validator.validate_line(["13"], config) == {}
+
+
+def test_validate_columns_matches_validate_line():
+    config = Configuration(outliers=[OutlierSpec(column=0, method="mad", window=50)])
+    column = [str(value) for value in [*VALUES, 500.0, 11.0, -300.0]]
+    by_line = OutlierValidator()
+    by_column = OutlierValidator()
+
+    expected = [row for row, value in enumerate(column) if by_line.validate_line([value], config)]
+
+    assert by_column.validate_columns([column], config) == {0: expected}
+    assert expected == [len(VALUES), len(VALUES) + 2]
@@ -0,0 +1,126 @@
+from pathlib import Path
+
+import pytest
+
+from csvclean.models.config import Configuration, ReferenceSpec
+from csvclean.models.data_register import ErrorTypes
+from csvclean.validators import reference_validator
+from csvclean.validators.reference_validator import (
+    ReferenceIndex,
+    ReferenceValidator,
+    index_path_for,
+)
+from csvclean.validators.validator_manager import ValidatorManager
+
+
+@pytest.fixture
+def reference_path(tmp_path: Path) -> Path:
+    """Reference csv with country codes"""
+    path = tmp_path / "countries.csv"
+    path.write_text("name,code\nSpain,ES\nFrance,FR\nPortugal,PT\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def index_dir(tmp_path: Path) -> str:
+    """Directory of the indexes, outside the user cache"""
+    return str(tmp_path / "indexes")
+
+
+def test_index_membership(reference_path: Path, index_dir: str):
+    index = ReferenceIndex.open(
+        ReferenceSpec(column=0, path=str(reference_path), reference_column="code"), index_dir
+    )
+
+    try:
+        assert len(index) == 3
+        assert "ES" in index
+        assert "Spain" not in index
+        assert index.contains_many(["PT", "XX", "PT", "FR"]) == {
+            "PT": True,
+            "XX": False,
+            "FR": True,
+        }
+    finally:
+        index.close()
+
+
+def test_index_is_reused(reference_path: Path, index_dir: str):
+    spec = ReferenceSpec(column=0, path=str(reference_path), reference_column="1")
+    ReferenceIndex.open(spec, index_dir).close()
+    index_path = index_path_for(spec, index_dir)
+    built_at = index_path.stat().st_mtime_ns
+
+    ReferenceIndex.open(spec, index_dir).close()
+
+    assert index_path.stat().st_mtime_ns == built_at
+    # Nothing is written next to the reference csv
+    assert [path.name for path in reference_path.parent.glob("countries*")] == ["countries.csv"]
+
+
+def test_index_built_by_chunks(tmp_path: Path, index_dir: str, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(reference_validator, "BUILD_CHUNK", 7)
+    monkeypatch.setattr(reference_validator, "MERGE_BLOCK", 3)
+    reference_path = tmp_path / "codes.csv"
+    codes = [f"C{i % 40}" for i in range(100)]
+    reference_path.write_text("code\n" + "\n".join(codes) + "\n", encoding="utf-8")
+
+    index = ReferenceIndex.open(
+        ReferenceSpec(column=0, path=str(reference_path), reference_column="code"), index_dir
+    )
+
+    try:
+        assert len(index) == 40
+        assert list(index._hashes) == sorted({reference_validator.hash_value(c) for c in codes})
+        assert "C39" in index
+        assert "C40" not in index
+    finally:
+        index.close()
+
+
+def test_index_is_rebuilt_when_reference_changes(reference_path: Path, index_dir: str):
+    spec = ReferenceSpec(column=0, path=str(reference_path), reference_column="code")
+    ReferenceIndex.open(spec, index_dir).close()
+
+    reference_path.write_text("name,code\nItaly,IT\n", encoding="utf-8")
+    index = ReferenceIndex.open(spec, index_dir)
+
+    try:
+        assert "IT" in index
+        assert "ES" not in index
+    finally:
+        index.close()
+
+
+def test_bad_reference_column(reference_path: Path, index_dir: str):
+    with pytest.raises(ValueError):
+        ReferenceIndex.open(
+            ReferenceSpec(column=0, path=str(reference_path), reference_column="x"), index_dir
+        )
+
+
+def test_validate_line_and_columns(reference_path: Path, index_dir: str):
+    config = Configuration(
+        references=[ReferenceSpec(column=1, path=str(reference_path), reference_column="code")]
+    )
+    lines = [["Ana", "ES"], ["Luc", "BE"], ["Rui", "PT"]]
+    validator = ReferenceValidator(index_dir)
+
+    try:
+        assert validator.validate_line(lines[1], config) == {1: ErrorTypes.REFERENCE}
+        columns = [["Ana", "Luc", "Rui"], ["ES", "BE", "PT"]]
+        assert validator.validate_columns(columns, config) == {1: [1]}
+    finally:
+        validator.close()
+
+
+def test_manager_reference_errors(reference_path: Path, index_dir: str):
+    config = Configuration(
+        references=[ReferenceSpec(column=1, path=str(reference_path), reference_column="code")]
+    )
+    manager = ValidatorManager(config, index_dir=index_dir)
+
+    assert manager.validate(["Luc", "BE"], config) == {1: ErrorTypes.REFERENCE}
+
+    manager.close()
+    assert manager.reference_validator.indexes == {}
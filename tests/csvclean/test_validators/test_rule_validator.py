@@ -0,0 +1,136 @@
+import pytest
+
+from csvclean.models.config import Configuration, RuleSpec
+from csvclean.models.data_register import ErrorTypes, LineError
+from csvclean.validators.rule_validator import RuleChain, RuleValidator, compile_rules
+from csvclean.validators.rules import RULES, Rule, build_rule, register_rule
+from csvclean.validators.validator_manager import ValidatorManager
+
+
+def rules_config(*rules: RuleSpec) -> Configuration:
+    return Configuration(header_types=[], trate_nullerror=True, rules=list(rules))
+
+
+@pytest.mark.parametrize("name, args, value, expected", [
+    ("range", ["0", "120"], "45", True),
+    ("range", ["0", "120"], "121", False),
+    ("range", ["0", ""], "9999", True),
+    ("range", ["0", "120"], "old", False),
+    ("regex", ["[A-Z]{2}", "3}"], "ES", False),
+    ("regex", ["[A-Z]{2}\\d+"], "ES12", True),
+    ("enum", ["Madrid|Bilbao"], "Bilbao", True),
+    ("enum", ["Madrid|Bilbao"], "Paris", False),
+    ("length", ["1", "3"], "abcd", False),
+    ("length", ["1", ""], "abcd", True),
+], ids = [
+    "range_inside",
+    "range_above_max",
+    "range_without_max",
+    "range_not_number",
+    "regex_with_comma",
+    "regex_match",
+    "enum_allowed",
+    "enum_not_allowed",
+    "length_too_long",
+    "length_without_max",
+])
+def test_cell_rules(name: str, args: list[str], value: str, expected: bool):
+    assert build_rule(name, 0, args).check(value, [value]) == expected
+
+
+def test_compare_rule():
+    rule = build_rule("compare", 0, ["<=", "1"])
+
+    assert rule.check("3", ["3", "10"])
+    assert not rule.check("30", ["30", "10"])
+    assert not rule.check("3", ["3"])
+
+
+def test_unique_rule():
+    rule = build_rule("unique", 0, [])
+
+    assert rule.check("a", ["a"])
+    rule.keep("a", ["a"])
+
+    assert [rule.check(value, [value]) for value in ["a", "b"]] == [False, True]
+
+
+def test_unique_only_records_kept_rows():
+    config = Configuration(
+        header_types=[str, int],
+        trate_nullerror=True,
+        trate_typeerror=True,
+        rules=[RuleSpec(column=0, name="unique")],
+    )
+    rows = [["a", "x"], ["a", "1"], ["b", "2"], ["a", "3"], ["b", "4"]]
+    manager = ValidatorManager(config)
+    errors: dict[int, LineError] = {}
+
+    for index, row in enumerate(rows):
+        if line_errors := manager.validate(row, config):
+            errors[index] = line_errors
+        else:
+            manager.keep(row)
+
+    # The first "a" has a type error and isn't kept, so the second one is the first kept
+    assert errors == {0: {1: ErrorTypes.TYPE}, 3: {0: ErrorTypes.RULE}, 4: {0: ErrorTypes.RULE}}
+
+
+def test_unknown_rule():
+    with pytest.raises(ValueError):
+        build_rule("not_a_rule", 0, [])
+
+
+def test_register_rule():
+    @register_rule("even")
+    class EvenRule(Rule):
+        def check(self, value: str, row: list[str]) -> bool:
+            return int(value) % 2 == 0
+
+    try:
+        validator = RuleValidator()
+        config = rules_config(RuleSpec(column=0, name="even"))
+
+        assert validator.validate_line(["3"], config) == {0: ErrorTypes.RULE}
+    finally:
+        del RULES.rules["even"]
+
+
+def test_compile_rules_fuses_columns():
+    config = rules_config(
+        RuleSpec(column=1, name="range", args=["0", "10"]),
+        RuleSpec(column=0, name="unique"),
+        RuleSpec(column=1, name="regex", args=["\\d"]),
+    )
+
+    compiled = compile_rules(config)
+
+    assert [column for column, _ in compiled] == [0, 1]
+    assert isinstance(compiled[1][1], RuleChain)
+    assert not compiled[1][1]("12", ["a", "12"])
+
+
+@pytest.mark.parametrize("input_text, expected", [
+    (["1", "Madrid", "30"], {}),
+    (["1", "Paris", "30"], {1: ErrorTypes.RULE}),
+    (["1", "Paris", "300"], {1: ErrorTypes.RULE, 2: ErrorTypes.RULE}),
+], ids = [
+    "content_without_rule_errors",
+    "rule_error_in_column_1",
+    "rule_error_in_columns_1_2",
+])
+def test_validate_line(input_text: list[str], expected: LineError):
+    config = rules_config(
+        RuleSpec(column=1, name="enum", args=["Madrid|Bilbao"]),
+        RuleSpec(column=2, name="range", args=["0", "120"]),
+    )
+
+    assert RuleValidator().validate_line(input_text, config) == expected
+
+
+def test_manager_rule_errors_after_null_errors():
+    config = rules_config(RuleSpec(column=0, name="length", args=["1", "3"]))
+
+    errors = ValidatorManager(config).validate(["", "abcd"], config)
+
+    assert errors == {0: ErrorTypes.NULL}
@@ -0,0 +1,48 @@
+import pytest
+
+from csvclean.models import Configuration, ErrorTypes
+from csvclean.validators.structure_validator import StructureValidator
+
+
+@pytest.fixture
+def config() -> Configuration:
+    return Configuration(header_types=[int, str, str], trate_typeerror=True)
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    argvalues=[
+        (["1", "a", "b"], {}),
+        (["1", "a"], {2: ErrorTypes.STRUCTURE}),
+        (["1", "a", "b", "c"], {3: ErrorTypes.STRUCTURE}),
+        ([], {0: ErrorTypes.STRUCTURE}),
+    ],
+    ids=["correct", "missing_value", "extra_value", "empty_line"],
+)
+def test_validate_line(config: Configuration, line: list[str], expected: dict):
+    validator = StructureValidator()
+    validator.check_header(["id", "name", "city"], config)
+
+    assert validator.validate_line(line, config) == expected
+
+
+def test_header_without_the_types_of_the_config(config: Configuration):
+    with pytest.raises(ValueError, match="2 columns"):
+        StructureValidator().check_header(["id", "name"], config)
+
+
+def test_header_mapped_by_name():
+    config = Configuration(header_types=[int, str], columns=["id", "city"], trate_typeerror=True)
+    validator = StructureValidator()
+
+    header = validator.check_header(["city", "name", "id"], config)
+
+    assert header == ["id", "city"]
+    assert validator.remap(["Bilbao", "Ana", "3"]) == ["3", "Bilbao"]
+
+
+def test_header_without_the_columns_of_the_config():
+    config = Configuration(columns=["id", "country"])
+
+    with pytest.raises(ValueError, match="country"):
+        StructureValidator().check_header(["id", "name"], config)
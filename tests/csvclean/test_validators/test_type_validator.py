@@ -1,3 +1,5 @@
+from datetime import date, datetime
+
 import pytest
 
 from csvclean.models.config import Configuration
@@ -9,20 +11,24 @@ from csvclean.validators.type_validator import TypeValidator
     ("23", int, False),
     ("45.23", float, False),
     ("safd", str, False),
+    ("TRUE", bool, False),
 
     ("23.", int, True),
     ("safd", int, True),
     ("true", float, True),
     ("", int, True),
+    ("si", bool, True),
 ], ids = [
     "recognize_int",
     "recognize_float",
     "recognize_str",
+    "recognize_bool",
 
     "confused_float_rather_than_int",
     "confused_str_rather_than_int",
     "confused_bool_rather_than_float",
     "confused_str_rather_than_int",
+    "confused_str_rather_than_bool",
 ])
 def test_is_incorrect_type(input_text: str, expected_type: type, expected: bool):
     assert TypeValidator().is_incorrect_type(input_text, expected_type) == expected
@@ -50,3 +56,33 @@ def test_validate_line(input_text: list[str], expected: LineError):
 
     assert TypeValidator().validate_line(input_text, input_config) == expected
 
+
+
+def test_memoized_type_checks():
+    config = Configuration(header_types=[int, str], trate_typeerror=True)
+    validator = TypeValidator()
+
+    errors = [validator.validate_line([value, "ES"], config) for value in ["1", "x", "1", "x"]]
+
+    assert errors == [{}, {0: ErrorTypes.TYPE}, {}, {0: ErrorTypes.TYPE}]
+    assert validator.hit_rates() == {0: 0.5, 1: 0.75}
+
+
+def test_date_columns():
+    config = Configuration(
+        header_types=[date, datetime],
+        trate_typeerror=True,
+        date_formats={0: "%d/%m/%Y"},
+    )
+    validator = TypeValidator()
+
+    errors = [
+        validator.validate_line(line, config)
+        for line in [
+            ["29/02/2024", "2024-02-29 10:00:00"],
+            ["2024-02-29", "2024-13-45 10:00:00"],
+        ]
+    ]
+
+    assert errors == [{}, {0: ErrorTypes.TYPE, 1: ErrorTypes.TYPE}]
+    assert validator.validate_column(["01/01/2024", "31/04/2024"], 0, config) == [1]
@@ -2,7 +2,7 @@ import datetime
 
 import pytest
 
-from csvclean.models import Configuration
+from csvclean.models import Configuration, RowBatch, RuleSpec
 from csvclean.models.data_register import ErrorTypes, LineError
 from csvclean.validators.validator_manager import ValidatorManager
 
@@ -43,3 +43,24 @@ def test__join_validation_errors(
 ):
     assert ValidatorManager()._join_validation_errors(current_errors, added_errors) == expected
 
+
+
+def test_validate_batch_matches_validate():
+    """The errors of a batch validated by columns are the ones of validate for each row."""
+    config = Configuration(
+        header_types=[int, str, float],
+        rules=[RuleSpec(column=2, name="range", args=["0", "10"])],
+        trate_nullerror=True,
+        trate_typeerror=True
+    )
+    rows = [["1", "a", "2.5"], ["", "b", "x"], ["x", "", "50"], ["3", "c", "1"]]
+    manager = ValidatorManager(config)
+    batch = RowBatch.from_rows(rows)
+
+    manager.validate_batch(batch, config)
+
+    expected = {
+        index: errors for index, row in enumerate(rows)
+        if (errors := manager.validate(row, config))
+    }
+    assert batch.errors == expected